@@ -8,6 +8,7 @@ from .gateway_command import GatewayCommand
 from .help_command import HelpCommand
 from .history_command import HistoryCommand
 from .import_command import ImportCommand
+from .latency_command import LatencyCommand
 from .mqtt_command import MQTTCommand
 from .order_book_command import OrderBookCommand
 from .pmm_script_command import PMMScriptCommand
@@ -18,6 +19,7 @@ from .start_command import StartCommand
 from .status_command import StatusCommand
 from .stop_command import StopCommand
 from .ticker_command import TickerCommand
+from .ticks_command import TicksCommand
 
 __all__ = [
     BalanceCommand,
@@ -30,6 +32,7 @@ __all__ = [
     HelpCommand,
     HistoryCommand,
     ImportCommand,
+    LatencyCommand,
     OrderBookCommand,
     PMMScriptCommand,
     PreviousCommand,
@@ -39,5 +42,6 @@ __all__ = [
     StatusCommand,
     StopCommand,
     TickerCommand,
+    TicksCommand,
     MQTTCommand,
 ]
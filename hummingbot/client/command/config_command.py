@@ -80,7 +80,9 @@ client_configs_to_display = ["autofill_import",
                              "create_command_timeout",
                              "other_commands_timeout",
                              "tables_format",
-                             "tick_size"]
+                             "tick_size",
+                             "min_tick_interval",
+                             "connector_tick_interval"]
 color_settings_to_display = ["top_pane",
                              "bottom_pane",
                              "output_pane",
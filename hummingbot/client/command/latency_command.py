@@ -0,0 +1,67 @@
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import pandas as pd
+
+from hummingbot.client.ui.interface_utils import format_df_for_printout
+from hummingbot.core.utils.latency_histogram import PERCENTILES
+
+if TYPE_CHECKING:
+    from hummingbot.client.hummingbot_application import HummingbotApplication  # noqa: F401
+
+
+class LatencyCommand:
+    def latency(self,  # type: HummingbotApplication
+                option: Optional[str] = None):
+        if threading.current_thread() != threading.main_thread():
+            self.ev_loop.call_soon_threadsafe(self.latency, option)
+            return
+        if len(self.markets) == 0:
+            self.notify("\n There is currently no active market.")
+            return
+        if option == "reset":
+            for order_book_tracker in self._market_data_trackers().values():
+                order_book_tracker.reset_market_data_latencies()
+            self.notify("\n Market data latencies reset.")
+        else:
+            self.notify(self.latency_status())
+
+    def latency_status(self,  # type: HummingbotApplication
+                       ) -> str:
+        rows: List[Dict[str, Any]] = []
+        redundancy_lines: List[str] = []
+        for connector_name, order_book_tracker in self._market_data_trackers().items():
+            for trading_pair, latency in order_book_tracker.market_data_latencies.items():
+                for name, summary in [("Exchange to receive", latency.exchange_to_receive.summary()),
+                                      ("Receive to apply", latency.receive_to_apply.summary())]:
+                    rows.append(dict(connector=connector_name, trading_pair=trading_pair, latency=name, **summary))
+            redundancy_stats = order_book_tracker.redundant_connection_stats
+            if redundancy_stats is not None:
+                redundancy_lines.append(self._redundant_connections_line(connector_name, redundancy_stats))
+        if len(rows) == 0:
+            return "\n No market data latency recorded yet."
+        columns = ["connector", "trading_pair", "latency", "count", "mean"] + [f"p{p}" for p in PERCENTILES] + ["max"]
+        df = pd.DataFrame(data=rows, columns=columns).round(3)
+        df.columns = (["Connector", "Market", "Latency", "Messages", "Mean (ms)"]
+                      + [f"p{p} (ms)" for p in PERCENTILES] + ["Max (ms)"])
+        lines = ["  Market data latency:"]
+        lines.extend(["    " + line for line in
+                      format_df_for_printout(df, self.client_config_map.tables_format).split("\n")])
+        lines.extend(redundancy_lines)
+        return "\n".join(lines)
+
+    @staticmethod
+    def _redundant_connections_line(connector_name: str, redundancy_stats: Dict[str, Any]) -> str:
+        wins = " / ".join(f"{ratio:.1%}" for ratio in redundancy_stats["win_ratios"])
+        lead_time = redundancy_stats["lead_time"]
+        return (f"  {connector_name} redundant connections, messages received first: {wins}, "
+                f"duplicates dropped: {redundancy_stats['duplicates_dropped']}, "
+                f"lead over the duplicates p50: {lead_time['p50']:.3f} ms, p99: {lead_time['p99']:.3f} ms")
+
+    def _market_data_trackers(self,  # type: HummingbotApplication
+                              ) -> Dict[str, Any]:
+        return {
+            connector_name: connector.order_book_tracker
+            for connector_name, connector in self.markets.items()
+            if getattr(connector, "order_book_tracker", None) is not None
+        }
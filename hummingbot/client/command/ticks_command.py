@@ -0,0 +1,43 @@
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from hummingbot.client.ui.interface_utils import format_df_for_printout
+
+if TYPE_CHECKING:
+    from hummingbot.client.hummingbot_application import HummingbotApplication  # noqa: F401
+
+
+class TicksCommand:
+    def ticks(self,  # type: HummingbotApplication
+              option: Optional[str] = None):
+        if threading.current_thread() != threading.main_thread():
+            self.ev_loop.call_soon_threadsafe(self.ticks, option)
+            return
+        if self.clock is None:
+            self.notify("\n This command can only be used while a strategy is running")
+            return
+        if option == "enable":
+            self.clock.enable_tick_stats()
+            self.notify("\n Clock tick timing enabled.")
+        elif option == "disable":
+            self.clock.disable_tick_stats()
+            self.notify("\n Clock tick timing disabled.")
+        elif option == "reset":
+            self.clock.disable_tick_stats()
+            self.clock.enable_tick_stats()
+            self.notify("\n Clock tick timings reset.")
+        else:
+            self.notify(self.ticks_status())
+
+    def ticks_status(self,  # type: HummingbotApplication
+                     ) -> str:
+        tick_stats = self.clock.tick_stats
+        if tick_stats is None:
+            return "\n Clock tick timing is disabled, run `ticks enable` to start collecting it."
+        df = tick_stats.to_dataframe().round(3)
+        df.columns = ["Iterator", "Ticks", "p50 (ms)", "p90 (ms)", "p99 (ms)", "Max (ms)"]
+        lines = [f"  Tick size: {tick_stats.tick_size}s, "
+                 f"ticks longer than the tick size: {tick_stats.overruns} / {tick_stats.ticks}"]
+        lines.extend(["    " + line for line in
+                      format_df_for_printout(df, self.client_config_map.tables_format).split("\n")])
+        return "\n".join(lines)
@@ -988,6 +988,30 @@ class ClientConfigMap(BaseClientModel):
             ),
         ),
     )
+    min_tick_interval: float = Field(
+        default=0.1,
+        ge=0,
+        description="The minimum time in seconds between two out of band ticks, which the time iterators can request"
+                    "\nbetween the regular ticks when the market data they follow changes (e.g. the best bid or ask).",
+        client_data=ClientFieldData(
+            prompt=lambda cm: (
+                "What minimum interval (in seconds) do you want between two market data driven ticks?"
+            ),
+        ),
+    )
+    connector_tick_interval: float = Field(
+        default=0.0,
+        ge=0,
+        description="The interval in seconds at which the clock ticks the connectors, when they can run at a slower"
+                    "\nrate than the strategy. It is meant to be a multiple of the tick size, 0 to tick them on"
+                    " every tick.",
+        client_data=ClientFieldData(
+            prompt=lambda cm: (
+                "At what interval (in seconds) do you want the connectors to be ticked? (Enter 0 to tick them on"
+                " every clock tick)"
+            ),
+        ),
+    )
 
     class Config:
         title = "client_config_map"
@@ -147,6 +147,15 @@ def load_parser(hummingbot: "HummingbotApplication", command_tabs) -> [ThrowingA
     ticker_parser.add_argument("--market", type=str, dest="market", help="The market (trading pair) of the order book")
     ticker_parser.set_defaults(func=hummingbot.ticker)
 
+    ticks_parser = subparsers.add_parser("ticks", help="Show the time spent by the clock in each tick")
+    ticks_parser.add_argument("option", nargs="?", choices=("enable", "disable", "reset"),
+                              help="Enable, disable or reset the tick timing")
+    ticks_parser.set_defaults(func=hummingbot.ticks)
+
+    latency_parser = subparsers.add_parser("latency", help="Show the market data latency per connector and market")
+    latency_parser.add_argument("option", nargs="?", choices=("reset",), help="Reset the latency histograms")
+    latency_parser.set_defaults(func=hummingbot.latency)
+
     pmm_script_parser = subparsers.add_parser("pmm_script", help="Send command to running PMM script instance")
     pmm_script_parser.add_argument("cmd", nargs="?", default=None, help="Command")
     pmm_script_parser.add_argument("args", nargs="*", default=None, help="Arguments")
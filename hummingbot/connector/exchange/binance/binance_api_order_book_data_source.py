@@ -4,9 +4,11 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from hummingbot.connector.exchange.binance import binance_constants as CONSTANTS, binance_web_utils as web_utils
 from hummingbot.connector.exchange.binance.binance_order_book import BinanceOrderBook
+from hummingbot.core.api_throttler.data_types import RequestPriority
 from hummingbot.core.data_type.order_book_message import OrderBookMessage
 from hummingbot.core.data_type.order_book_tracker_data_source import OrderBookTrackerDataSource
 from hummingbot.core.web_assistant.connections.data_types import RESTMethod, WSJSONRequest
+from hummingbot.core.web_assistant.connections.ws_frame_decoders import ChannelRoutingDecoder, json_fields_router
 from hummingbot.core.web_assistant.web_assistants_factory import WebAssistantsFactory
 from hummingbot.core.web_assistant.ws_assistant import WSAssistant
 from hummingbot.logger import HummingbotLogger
@@ -20,6 +22,10 @@ class BinanceAPIOrderBookDataSource(OrderBookTrackerDataSource):
     TRADE_STREAM_ID = 1
     DIFF_STREAM_ID = 2
     ONE_HOUR = 60 * 60
+    MAX_STREAMS_PER_CONNECTION = CONSTANTS.WS_MAX_STREAMS_PER_CONNECTION
+    STREAMS_PER_TRADING_PAIR = 2
+    AUTO_RECONNECT_WEBSOCKETS = True
+    BATCH_WEBSOCKET_MESSAGES = True
 
     _logger: Optional[HummingbotLogger] = None
 
@@ -34,6 +40,9 @@ class BinanceAPIOrderBookDataSource(OrderBookTrackerDataSource):
         self._diff_messages_queue_key = CONSTANTS.DIFF_EVENT_TYPE
         self._domain = domain
         self._api_factory = api_factory
+        # Only the trade and diff frames of the subscribed symbols are decoded, identified by their event type and
+        # symbol. The frames without them (subscription results and errors) are decoded as well
+        self._ws_frame_decoder = ChannelRoutingDecoder(router=json_fields_router("e", "s"))
 
     async def get_last_traded_prices(self,
                                      trading_pairs: List[str],
@@ -59,6 +68,7 @@ class BinanceAPIOrderBookDataSource(OrderBookTrackerDataSource):
             params=params,
             method=RESTMethod.GET,
             throttler_limit_id=CONSTANTS.SNAPSHOT_PATH_URL,
+            throttler_priority=RequestPriority.MARKET_DATA,
         )
 
         return data
@@ -68,29 +78,40 @@ class BinanceAPIOrderBookDataSource(OrderBookTrackerDataSource):
         Subscribes to the trade events and diff orders events through the provided websocket connection.
         :param ws: the websocket assistant used to connect to the exchange
         """
+        await self._subscribe_trading_pairs_channels(ws, self._trading_pairs)
+
+    async def _subscribe_trading_pairs_channels(self, ws: WSAssistant, trading_pairs: List[str]):
+        """
+        Subscribes to the trade events and diff orders events of the trading pairs through the provided websocket
+        connection.
+        :param ws: the websocket assistant used to connect to the exchange
+        :param trading_pairs: the trading pairs to subscribe to
+        """
         try:
             trade_params = []
             depth_params = []
-            for trading_pair in self._trading_pairs:
+            for trading_pair in trading_pairs:
                 symbol = await self._connector.exchange_symbol_associated_to_pair(trading_pair=trading_pair)
                 trade_params.append(f"{symbol.lower()}@trade")
                 depth_params.append(f"{symbol.lower()}@depth@100ms")
+                self._ws_frame_decoder.add_consumed_channels(
+                    [(CONSTANTS.TRADE_EVENT_TYPE, symbol), (CONSTANTS.DIFF_EVENT_TYPE, symbol)])
             payload = {
                 "method": "SUBSCRIBE",
                 "params": trade_params,
-                "id": 1
+                "id": self.TRADE_STREAM_ID
             }
             subscribe_trade_request: WSJSONRequest = WSJSONRequest(payload=payload)
 
             payload = {
                 "method": "SUBSCRIBE",
                 "params": depth_params,
-                "id": 2
+                "id": self.DIFF_STREAM_ID
             }
             subscribe_orderbook_request: WSJSONRequest = WSJSONRequest(payload=payload)
 
-            await ws.send(subscribe_trade_request)
-            await ws.send(subscribe_orderbook_request)
+            await ws.subscribe(subscribe_trade_request)
+            await ws.subscribe(subscribe_orderbook_request)
 
             self.logger().info("Subscribed to public order book and trade channels...")
         except asyncio.CancelledError:
@@ -103,7 +124,7 @@ class BinanceAPIOrderBookDataSource(OrderBookTrackerDataSource):
             raise
 
     async def _connected_websocket_assistant(self) -> WSAssistant:
-        ws: WSAssistant = await self._api_factory.get_ws_assistant()
+        ws: WSAssistant = await self._api_factory.get_ws_assistant(decoder=self._ws_frame_decoder)
         await ws.connect(ws_url=CONSTANTS.WSS_URL.format(self._domain),
                          ping_timeout=CONSTANTS.WS_HEARTBEAT_TIME_INTERVAL)
         return ws
@@ -28,6 +28,8 @@ ORDER_PATH_URL = "/order"
 BINANCE_USER_STREAM_PATH_URL = "/userDataStream"
 
 WS_HEARTBEAT_TIME_INTERVAL = 30
+# Streams a single websocket connection can listen to
+WS_MAX_STREAMS_PER_CONNECTION = 1024
 
 # Binance params
 
@@ -16,6 +16,7 @@ from hummingbot.connector.exchange.binance.binance_auth import BinanceAuth
 from hummingbot.connector.exchange_py_base import ExchangePyBase
 from hummingbot.connector.trading_rule import TradingRule
 from hummingbot.connector.utils import TradeFillOrderDetails, combine_to_hb_trading_pair
+from hummingbot.core.api_throttler.data_types import RequestPriority
 from hummingbot.core.data_type.common import OrderType, TradeType
 from hummingbot.core.data_type.in_flight_order import InFlightOrder, OrderUpdate, TradeUpdate
 from hummingbot.core.data_type.order_book_tracker_data_source import OrderBookTrackerDataSource
@@ -119,7 +120,8 @@ class BinanceExchange(ExchangePyBase):
         return [OrderType.LIMIT, OrderType.LIMIT_MAKER]
 
     async def get_all_pairs_prices(self) -> List[Dict[str, str]]:
-        pairs_prices = await self._api_get(path_url=CONSTANTS.TICKER_BOOK_PATH_URL)
+        pairs_prices = await self._api_get(
+            path_url=CONSTANTS.TICKER_BOOK_PATH_URL, priority=RequestPriority.MARKET_DATA)
         return pairs_prices
 
     def _is_request_exception_related_to_time_synchronizer(self, request_exception: Exception):
@@ -188,7 +190,8 @@ class BinanceExchange(ExchangePyBase):
         order_result = await self._api_post(
             path_url=CONSTANTS.ORDER_PATH_URL,
             data=api_params,
-            is_auth_required=True)
+            is_auth_required=True,
+            priority=RequestPriority.CREATE)
         o_id = str(order_result["orderId"])
         transact_time = order_result["transactTime"] * 1e-3
         return (o_id, transact_time)
@@ -202,7 +205,8 @@ class BinanceExchange(ExchangePyBase):
         cancel_result = await self._api_delete(
             path_url=CONSTANTS.ORDER_PATH_URL,
             params=api_params,
-            is_auth_required=True)
+            is_auth_required=True,
+            priority=RequestPriority.CANCEL)
         if cancel_result.get("status") == "CANCELED":
             return True
         return False
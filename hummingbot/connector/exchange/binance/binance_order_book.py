@@ -45,13 +45,16 @@ class BinanceOrderBook(OrderBook):
         """
         if metadata:
             msg.update(metadata)
-        return OrderBookMessage(OrderBookMessageType.DIFF, {
+        message = OrderBookMessage(OrderBookMessageType.DIFF, {
             "trading_pair": msg["trading_pair"],
             "first_update_id": msg["U"],
             "update_id": msg["u"],
             "bids": msg["b"],
             "asks": msg["a"]
         }, timestamp=timestamp)
+        if "E" in msg:
+            message.exchange_timestamp = msg["E"] * 1e-3
+        return message
 
     @classmethod
     def trade_message_from_exchange(cls, msg: Dict[str, any], metadata: Optional[Dict] = None):
@@ -64,7 +67,7 @@ class BinanceOrderBook(OrderBook):
         if metadata:
             msg.update(metadata)
         ts = msg["E"]
-        return OrderBookMessage(OrderBookMessageType.TRADE, {
+        message = OrderBookMessage(OrderBookMessageType.TRADE, {
             "trading_pair": msg["trading_pair"],
             "trade_type": float(TradeType.SELL.value) if msg["m"] else float(TradeType.BUY.value),
             "trade_id": msg["t"],
@@ -72,3 +75,5 @@ class BinanceOrderBook(OrderBook):
             "price": msg["p"],
             "amount": msg["q"]
         }, timestamp=ts * 1e-3)
+        message.exchange_timestamp = ts * 1e-3
+        return message
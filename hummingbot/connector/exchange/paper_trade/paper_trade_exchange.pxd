@@ -34,6 +34,7 @@ cdef class PaperTradeExchange(ExchangeBase):
         bint _paper_trade_market_initialized
         dict _trading_pairs
         object _queued_orders
+        bint _new_limit_orders
         dict _quantization_params
         object _order_book_trade_listener
         object _market_order_filled_listener
@@ -50,6 +50,7 @@ if TYPE_CHECKING:
 
 ptm_logger = None
 s_decimal_0 = Decimal(0)
+s_float_inf = float("inf")
 
 
 cdef class QuantizationParams:
@@ -168,6 +169,7 @@ cdef class PaperTradeExchange(ExchangeBase):
         self._paper_trade_market_initialized = False
         self._trading_pairs = {}
         self._queued_orders = deque()
+        self._new_limit_orders = False
         self._quantization_params = {}
         self._order_book_trade_listener = OrderBookTradeListener(self)
         self._target_market = target_market
@@ -319,6 +321,19 @@ cdef class PaperTradeExchange(ExchangeBase):
         ExchangeBase.c_tick(self, timestamp)
         self.c_process_market_orders()
         self.c_process_crossed_limit_orders()
+        self._new_limit_orders = False
+
+    cdef double c_next_event_timestamp(self):
+        cdef:
+            QueuedOrder front_order
+        if self._new_limit_orders:
+            # The limit orders crossing the order book are filled on the next tick
+            return self._current_timestamp
+        if len(self._queued_orders) > 0:
+            front_order = self._queued_orders[0]
+            return front_order.create_timestamp + self.TRADE_EXECUTION_DELAY
+        # Otherwise orders are only filled when the order books change
+        return s_float_inf
 
     cdef str c_buy(self,
                    str trading_pair_str,
@@ -356,6 +371,7 @@ cdef class PaperTradeExchange(ExchangeBase):
                                                                               SingleTradingPairLimitOrders()))
                 map_it = insert_result.first
             limit_orders_collection_ptr = address(deref(map_it).second)
+            self._new_limit_orders = True
             limit_orders_collection_ptr.insert(CPPLimitOrder(
                 cpp_order_id,
                 cpp_trading_pair_str,
@@ -414,6 +430,7 @@ cdef class PaperTradeExchange(ExchangeBase):
                                                                               SingleTradingPairLimitOrders()))
                 map_it = insert_result.first
             limit_orders_collection_ptr = address(deref(map_it).second)
+            self._new_limit_orders = True
             limit_orders_collection_ptr.insert(CPPLimitOrder(
                 cpp_order_id,
                 cpp_trading_pair_str,
@@ -14,7 +14,7 @@ from hummingbot.connector.time_synchronizer import TimeSynchronizer
 from hummingbot.connector.trading_rule import TradingRule
 from hummingbot.connector.utils import get_new_client_order_id
 from hummingbot.core.api_throttler.async_throttler import AsyncThrottler
-from hummingbot.core.api_throttler.data_types import RateLimit
+from hummingbot.core.api_throttler.data_types import DEFAULT_REQUEST_PRIORITY, RateLimit, RequestPriority
 from hummingbot.core.data_type.cancellation_result import CancellationResult
 from hummingbot.core.data_type.common import OrderType, TradeType
 from hummingbot.core.data_type.in_flight_order import InFlightOrder, OrderState, OrderUpdate, TradeUpdate
@@ -883,6 +883,7 @@ class ExchangePyBase(ExchangeBase, ABC):
             is_auth_required: bool = False,
             return_err: bool = False,
             limit_id: Optional[str] = None,
+            priority: RequestPriority = DEFAULT_REQUEST_PRIORITY,
             **kwargs,
     ) -> Dict[str, Any]:
 
@@ -901,6 +902,7 @@ class ExchangePyBase(ExchangeBase, ABC):
                     is_auth_required=is_auth_required,
                     return_err=return_err,
                     throttler_limit_id=limit_id if limit_id else path_url,
+                    throttler_priority=priority,
                 )
 
                 return request_result
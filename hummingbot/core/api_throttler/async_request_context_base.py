@@ -2,10 +2,16 @@ import asyncio
 import logging
 import time
 from abc import ABC, abstractmethod
-from decimal import Decimal
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from hummingbot.core.api_throttler.data_types import RateLimit, TaskLog
+from hummingbot.core.api_throttler.data_types import (
+    DEFAULT_REQUEST_PRIORITY,
+    RateLimit,
+    RequestPriority,
+    TaskLog,
+    TaskLogWindow,
+)
+from hummingbot.core.api_throttler.priority_lanes import PriorityLanes
 from hummingbot.logger.logger import HummingbotLogger
 
 arc_logger = None
@@ -16,6 +22,9 @@ class AsyncRequestContextBase(ABC):
     """
     An async context class ('async with' syntax) that checks for rate limit and waits for the capacity to be freed.
     It uses an async lock to prevent multiple instances of this class from accessing the `acquire()` function.
+    When the capacity is reached, it sleeps until the time the task logs preventing the task leave their rate limit
+    periods, instead of checking the capacity again at regular intervals.
+    With priority lanes, the task also waits while tasks of a higher priority wait for one of its rate limits.
     """
 
     _last_max_cap_warning_ts: float = 0.0
@@ -28,64 +37,135 @@ class AsyncRequestContextBase(ABC):
         return arc_logger
 
     def __init__(self,
-                 task_logs: List[TaskLog],
+                 task_logs: Dict[str, TaskLogWindow],
                  rate_limit: RateLimit,
                  related_limits: List[Tuple[RateLimit, int]],
                  lock: asyncio.Lock,
                  safety_margin_pct: float,
                  retry_interval: float = 0.1,
+                 priority: RequestPriority = DEFAULT_REQUEST_PRIORITY,
+                 lanes: Optional[PriorityLanes] = None,
                  ):
         """
         Asynchronous context associated with each API request.
-        :param task_logs: Shared task logs associated with this API request
+        :param task_logs: Shared sliding windows of the task logs of each rate limit (by limit id), usually a
+        defaultdict of TaskLogWindow
         :param rate_limit: The RateLimit associated with this API Request
         :param related_limits: List of linked rate limits with its corresponding weight associated with this API Request
         :param lock: A shared asyncio.Lock used between all instances of APIRequestContextBase
-        :param retry_interval: Time between each limit check
+        :param retry_interval: Time between each limit check, when the capacity cannot be freed by waiting (the weight
+        of the task exceeds the limit)
+        :param priority: The priority lane of this API Request
+        :param lanes: The priority lanes shared between all instances of APIRequestContextBase, None to serve the tasks
+        regardless of their priority
         """
-        self._task_logs: List[TaskLog] = task_logs
+        self._task_logs: Dict[str, TaskLogWindow] = task_logs
         self._rate_limit: RateLimit = rate_limit
         self._related_limits: List[Tuple[RateLimit, int]] = related_limits
         self._lock: asyncio.Lock = lock
         self._safety_margin_pct: float = safety_margin_pct
         self._retry_interval: float = retry_interval
+        self._priority: RequestPriority = priority
+        self._lanes: Optional[PriorityLanes] = lanes
 
     def flush(self):
         """
-        Remove task logs that have passed rate limit periods
+        Remove task logs that have passed rate limit periods from the windows of the limits of the task
         :return:
         """
-        now: Decimal = Decimal(str(time.time()))
-        for task in self._task_logs:
-            task_limit: RateLimit = task.rate_limit
-            elapsed: Decimal = now - Decimal(str(task.timestamp))
-            if elapsed > Decimal(str(task_limit.time_interval * (1 + self._safety_margin_pct))):
-                self._task_logs.remove(task)
+        now: float = self._time()
+        for rate_limit, _ in self._limits():
+            self._task_logs[rate_limit.limit_id].flush(now, self._safety_margin_pct)
 
     @abstractmethod
     def within_capacity(self) -> bool:
         raise NotImplementedError
 
+    @abstractmethod
+    def time_until_capacity(self) -> Optional[float]:
+        """
+        :return: the time to wait until the task is within capacity, None if it cannot be reached by waiting
+        """
+        raise NotImplementedError
+
     async def acquire(self):
-        while True:
-            async with self._lock:
-                self.flush()
-
-                if self.within_capacity():
-                    break
-            await asyncio.sleep(self._retry_interval)
-        async with self._lock:
-            now = time.time()
-            # Each related limit is represented as it own individual TaskLog
-
-            # Log the acquired rate limit into the tasks log
-            self._task_logs.append(TaskLog(timestamp=now,
-                                           rate_limit=self._rate_limit,
-                                           weight=self._rate_limit.weight))
-
-            # Log its related limits into the tasks log as individual tasks
-            for limit, weight in self._related_limits:
-                self._task_logs.append(TaskLog(timestamp=now, rate_limit=limit, weight=weight))
+        waiting_since: Optional[float] = None
+        # Whether the task is counted as waiting in its priority lane, deferring the tasks of lower priority
+        waiting_in_lane: bool = False
+        try:
+            while True:
+                async with self._lock:
+                    self.flush()
+
+                    deferred = self._lanes is not None and self._lanes.defers(self._priority, self._limit_ids())
+                    if not deferred and self.within_capacity():
+                        now = self._time()
+                        # Log the acquired rate limit and its related limits into the windows of the task logs, each
+                        # related limit is represented as it own individual TaskLog
+                        for limit, weight in self._limits():
+                            self._task_logs[limit.limit_id].append(
+                                TaskLog(timestamp=now, rate_limit=limit, weight=weight))
+                        if self._lanes is not None:
+                            self._lanes.record_served(self._priority,
+                                                      0.0 if waiting_since is None else now - waiting_since)
+                        break
+
+                    if waiting_since is None:
+                        waiting_since = self._time()
+                    if self._lanes is not None:
+                        # A task that can never fit (its weight exceeds the part of a limit it can use) keeps polling
+                        # like without lanes, but does not defer the tasks of lower priority forever
+                        fits = self._fits_usable_limits()
+                        if fits and not waiting_in_lane:
+                            self._lanes.add_waiting(self._priority, self._limit_ids())
+                        elif not fits and waiting_in_lane:
+                            self._lanes.remove_waiting(self._priority, self._limit_ids())
+                        waiting_in_lane = fits
+                    wait_time = None if deferred else self.time_until_capacity()
+
+                if deferred:
+                    await self._lanes.wait_for_change()
+                else:
+                    await self._sleep(self._retry_interval if wait_time is None else wait_time)
+        finally:
+            if waiting_in_lane:
+                self._lanes.remove_waiting(self._priority, self._limit_ids())
+
+    def _limits(self) -> List[Tuple[RateLimit, int]]:
+        """
+        :return: the rate limit of the task and its related limits, with the weight of the task in each of them
+        """
+        if self._rate_limit is None:
+            return []
+        return [(self._rate_limit, self._rate_limit.weight)] + self._related_limits
+
+    def _limit_ids(self) -> List[str]:
+        return [rate_limit.limit_id for rate_limit, _ in self._limits()]
+
+    def _usable_limit(self, rate_limit: RateLimit) -> int:
+        """
+        :return: the part of the rate limit usable by the task, excluding the capacity reserved for the priority lanes
+        above its own
+        """
+        if self._lanes is None:
+            return rate_limit.limit
+        return self._lanes.usable_limit(rate_limit.limit, self._priority)
+
+    def _fits_usable_limits(self) -> bool:
+        """
+        :return: False if the weight of the task exceeds the part of one of its limits it can use, so that it can
+        never be within capacity
+        """
+        return all(weight <= self._usable_limit(rate_limit) for rate_limit, weight in self._limits())
+
+    def _time(self):
+        return time.time()
+
+    async def _sleep(self, delay: float):
+        """
+        Function added only to facilitate patching the sleep in unit tests without affecting the asyncio module
+        """
+        await asyncio.sleep(delay)
 
     async def __aenter__(self):
         await self.acquire()
@@ -1,13 +1,12 @@
 import time
-from decimal import Decimal
-from typing import List, Tuple
+from typing import Optional
 
 from hummingbot.core.api_throttler.async_request_context_base import (
     MAX_CAPACITY_REACHED_WARNING_INTERVAL,
     AsyncRequestContextBase,
 )
 from hummingbot.core.api_throttler.async_throttler_base import AsyncThrottlerBase
-from hummingbot.core.api_throttler.data_types import RateLimit
+from hummingbot.core.api_throttler.data_types import DEFAULT_REQUEST_PRIORITY, RequestPriority, TaskLogWindow
 
 
 class AsyncRequestContext(AsyncRequestContextBase):
@@ -22,27 +21,40 @@ class AsyncRequestContext(AsyncRequestContextBase):
         Note: A task can be associated to one or more RateLimit.
         :return: True if it is within capacity to add a new task
         """
-        if self._rate_limit is not None:
-            list_of_limits: List[Tuple[RateLimit, int]] = [(self._rate_limit,
-                                                            self._rate_limit.weight)] + self._related_limits
-            now: float = self._time()
-            for rate_limit, weight in list_of_limits:
-                capacity_used: int = sum([task.weight
-                                          for task in self._task_logs
-                                          if rate_limit.limit_id == task.rate_limit.limit_id and
-                                          Decimal(str(now)) - Decimal(str(task.timestamp)) - Decimal(str(task.rate_limit.time_interval * self._safety_margin_pct)) <= task.rate_limit.time_interval])
+        now: float = self._time()
+        for rate_limit, weight in self._limits():
+            task_logs: TaskLogWindow = self._task_logs[rate_limit.limit_id]
+            task_logs.flush(now, self._safety_margin_pct)
+            capacity_used: int = task_logs.capacity_used
 
-                if capacity_used + weight > rate_limit.limit:
-                    if self._last_max_cap_warning_ts < now - MAX_CAPACITY_REACHED_WARNING_INTERVAL:
-                        msg = f"API rate limit on {rate_limit.limit_id} ({rate_limit.limit} calls per " \
-                              f"{rate_limit.time_interval}s) has almost reached. Limits used " \
-                              f"is {capacity_used} in the last " \
-                              f"{rate_limit.time_interval} seconds"
-                        self.logger().notify(msg)
-                        AsyncRequestContextBase._last_max_cap_warning_ts = now
-                    return False
+            if capacity_used + weight > self._usable_limit(rate_limit):
+                if self._last_max_cap_warning_ts < now - MAX_CAPACITY_REACHED_WARNING_INTERVAL:
+                    msg = f"API rate limit on {rate_limit.limit_id} ({rate_limit.limit} calls per " \
+                          f"{rate_limit.time_interval}s) has almost reached. Limits used " \
+                          f"is {capacity_used} in the last " \
+                          f"{rate_limit.time_interval} seconds"
+                    self.logger().notify(msg)
+                    AsyncRequestContextBase._last_max_cap_warning_ts = now
+                return False
         return True
 
+    def time_until_capacity(self) -> Optional[float]:
+        """
+        :return: the time until enough task logs leave the windows of all the limits of the task to add it, None if
+        the weight of the task exceeds the part of one of the limits it can use
+        """
+        now: float = self._time()
+        capacity_freed_time: float = now
+        for rate_limit, weight in self._limits():
+            usable_limit: int = self._usable_limit(rate_limit)
+            if weight > usable_limit:
+                return None
+            capacity_freed_time = max(
+                capacity_freed_time,
+                self._task_logs[rate_limit.limit_id].capacity_freed_time(usable_limit - weight,
+                                                                         self._safety_margin_pct))
+        return capacity_freed_time - now
+
     def _time(self):
         return time.time()
 
@@ -57,13 +69,16 @@ class AsyncThrottler(AsyncThrottlerBase):
         Pool 1 - rate limit is 10 calls per second
         Task A which consumes capacity from both Pool 0 and Pool 1 can be called at 10 calls per second, any calls after
         this (whether it belongs to Pool 0 or Pool 1) will have to wait for new capacity (some of the Task A flushed out).
+    Within the same limits, the tasks with a higher priority are served first: the tasks waiting for capacity defer the
+    tasks of lower priority (e.g. the order cancels are not delayed by the status polling).
     """
 
-    def execute_task(self, limit_id: str) -> AsyncRequestContext:
+    def execute_task(self, limit_id: str, priority: RequestPriority = DEFAULT_REQUEST_PRIORITY) -> AsyncRequestContext:
         """
         Creates an async context where code within the context (a task) can be run only when all rate
         limits have capacity for the new task.
         :param limit_id: the limit_id associated with the APi request
+        :param priority: the priority lane of the API request
         :return: An async context (used with async with syntax)
         """
         rate_limit, related_rate_limits = self.get_related_limits(limit_id=limit_id)
@@ -74,4 +89,6 @@ class AsyncThrottler(AsyncThrottlerBase):
             lock=self._lock,
             safety_margin_pct=self._safety_margin_pct,
             retry_interval=self._retry_interval,
+            priority=priority,
+            lanes=self._lanes,
         )
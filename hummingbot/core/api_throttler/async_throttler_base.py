@@ -3,11 +3,18 @@ import copy
 import logging
 import math
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from hummingbot.core.api_throttler.async_request_context_base import AsyncRequestContextBase
-from hummingbot.core.api_throttler.data_types import RateLimit, TaskLog
+from hummingbot.core.api_throttler.data_types import (
+    DEFAULT_REQUEST_PRIORITY,
+    RateLimit,
+    RequestPriority,
+    TaskLogWindow,
+)
+from hummingbot.core.api_throttler.priority_lanes import PriorityLanes
 from hummingbot.logger.logger import HummingbotLogger
 
 
@@ -29,7 +36,8 @@ class AsyncThrottlerBase(ABC):
                  rate_limits: List[RateLimit],
                  retry_interval: float = 0.1,
                  safety_margin_pct: Optional[float] = 0.05,  # An extra safety margin, in percentage.
-                 limits_share_percentage: Optional[Decimal] = None
+                 limits_share_percentage: Optional[Decimal] = None,
+                 reserved_capacity_pct: Optional[Dict[RequestPriority, float]] = None,
                  ):
         """
         :param rate_limits: List of RateLimit(s).
@@ -38,6 +46,8 @@ class AsyncThrottlerBase(ABC):
             calls are within the limit.
         :param limits_share_percentage: Percentage of the limits to be used by this instance (important when multiple
             bots operate with the same account)
+        :param reserved_capacity_pct: Percentage of every limit (between 0 and 1) reserved for each priority lane and
+            the lanes of higher priority
         """
         # If configured, users can define the percentage of rate limits to allocate to the throttler.
         share_percentage = limits_share_percentage or self._client_config_map().rate_limits_share_pct
@@ -45,8 +55,9 @@ class AsyncThrottlerBase(ABC):
 
         self.set_rate_limits(rate_limits)
 
-        # List of TaskLog used to determine the API requests within a set time window.
-        self._task_logs: List[TaskLog] = []
+        # Sliding windows of the TaskLogs of each rate limit (by limit id), used to determine the API requests within
+        # their time windows.
+        self._task_logs: Dict[str, TaskLogWindow] = defaultdict(TaskLogWindow)
 
         # Throttler Parameters
         self._retry_interval: float = retry_interval
@@ -55,6 +66,9 @@ class AsyncThrottlerBase(ABC):
         # Shared asyncio.Lock instance to prevent multiple async ContextManager from accessing the _task_logs variable
         self._lock = asyncio.Lock()
 
+        # Requests waiting in each priority lane, shared by the async ContextManagers like the _task_logs
+        self._lanes = PriorityLanes(reserved_capacity_pct)
+
     def set_rate_limits(self, rate_limits: List[RateLimit]):
         # Rate Limit Definitions
         self._rate_limits: List[RateLimit] = copy.deepcopy(rate_limits)
@@ -65,6 +79,24 @@ class AsyncThrottlerBase(ABC):
         # Dictionary of path_url to RateLimit
         self._id_to_limit_map: Dict[str, RateLimit] = {limit.limit_id: limit for limit in self._rate_limits}
 
+    @property
+    def lane_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        For each priority lane, the capacity reserved, the requests served and waiting, and the time the requests
+        served waited for capacity (in milliseconds)
+        """
+        return self._lanes.to_dict()
+
+    def set_reserved_capacity_pct(self, reserved_capacity_pct: Dict[RequestPriority, float]):
+        """
+        :param reserved_capacity_pct: Percentage of every limit (between 0 and 1) reserved for each priority lane and
+            the lanes of higher priority
+        """
+        self._lanes.set_reserved_capacity_pct(reserved_capacity_pct)
+
+    def reset_lane_stats(self):
+        self._lanes.reset_stats()
+
     def _client_config_map(self):
         from hummingbot.client.hummingbot_application import HummingbotApplication  # avoids circular import
 
@@ -85,5 +117,7 @@ class AsyncThrottlerBase(ABC):
         return rate_limit, related_limits
 
     @abstractmethod
-    def execute_task(self, limit_id: str) -> AsyncRequestContextBase:
+    def execute_task(self,
+                     limit_id: str,
+                     priority: RequestPriority = DEFAULT_REQUEST_PRIORITY) -> AsyncRequestContextBase:
         raise NotImplementedError
@@ -1,5 +1,9 @@
+from collections import deque
 from dataclasses import dataclass
+from enum import IntEnum
 from typing import (
+    Deque,
+    Iterator,
     List,
     Optional,
 )
@@ -12,6 +16,23 @@ RequestPath = str       # String representing the request path url
 RequestWeight = int     # Integer representing the request weight of the path url
 Seconds = float
 
+# Precision of the elapsed times compared to the rate limit periods, that absorbs the float rounding errors
+ELAPSED_TIME_PRECISION = 1e-6
+
+
+class RequestPriority(IntEnum):
+    """
+    Priority lanes of the throttled requests, the lower values are served first when the capacity is tight
+    """
+    CANCEL = 0
+    CREATE = 1
+    STATUS = 2
+    MARKET_DATA = 3
+
+
+# Priority of the requests executed without specifying it
+DEFAULT_REQUEST_PRIORITY = RequestPriority.STATUS
+
 
 @dataclass
 class LinkedLimitWeightPair:
@@ -54,3 +75,64 @@ class TaskLog:
     timestamp: float
     rate_limit: RateLimit
     weight: int
+
+
+class TaskLogWindow:
+    """
+    Sliding window of the task logs of a single rate limit, in the order they were logged, with the total weight they
+    use. The logs leave the window once their rate limit period has passed, so that checking the capacity used only
+    costs the removal of the expired logs.
+    """
+
+    def __init__(self):
+        self._task_logs: Deque[TaskLog] = deque()
+        self._capacity_used: int = 0
+
+    def __len__(self) -> int:
+        return len(self._task_logs)
+
+    def __iter__(self) -> Iterator[TaskLog]:
+        return iter(self._task_logs)
+
+    @property
+    def capacity_used(self) -> int:
+        return self._capacity_used
+
+    @staticmethod
+    def expiration_time(task_log: TaskLog, safety_margin_pct: float) -> float:
+        """
+        :return: the time from which the task log is out of its rate limit period, extended by the safety margin
+        """
+        return (task_log.timestamp + task_log.rate_limit.time_interval * (1 + safety_margin_pct)
+                + ELAPSED_TIME_PRECISION)
+
+    def append(self, task_log: TaskLog):
+        self._task_logs.append(task_log)
+        self._capacity_used += task_log.weight
+
+    def flush(self, now: float, safety_margin_pct: float):
+        """
+        Removes the task logs that have passed their rate limit period, extended by the safety margin
+        """
+        task_logs = self._task_logs
+        while len(task_logs) > 0:
+            task_log = task_logs[0]
+            elapsed = round(now - task_log.timestamp, 6)
+            if elapsed <= task_log.rate_limit.time_interval * (1 + safety_margin_pct):
+                break
+            task_logs.popleft()
+            self._capacity_used -= task_log.weight
+
+    def capacity_freed_time(self, capacity: int, safety_margin_pct: float) -> float:
+        """
+        :param capacity: the capacity used the window has to get down to
+        :return: the time from which the capacity used is at most the given capacity, considering only the current logs
+        """
+        capacity_used = self._capacity_used
+        freed_time = 0.0
+        for task_log in self._task_logs:
+            if capacity_used <= capacity:
+                break
+            capacity_used -= task_log.weight
+            freed_time = max(freed_time, self.expiration_time(task_log, safety_margin_pct))
+        return freed_time
@@ -0,0 +1,117 @@
+import asyncio
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from hummingbot.core.api_throttler.data_types import RequestPriority
+from hummingbot.core.utils.latency_histogram import LatencyHistogram
+
+
+class PriorityLanes:
+    """
+    Tracks the requests of a throttler waiting for capacity in each priority lane, by rate limit.
+    A request is deferred while requests of a higher priority wait for capacity on one of its rate limits, and can only
+    use the part of each limit left by the capacity reserved for the higher priority lanes. The requests deferred are
+    woken up as soon as the waiting requests of a higher priority are served.
+    Also measures the time the requests of each lane wait for capacity.
+    """
+
+    def __init__(self, reserved_capacity_pct: Optional[Dict[RequestPriority, float]] = None):
+        """
+        :param reserved_capacity_pct: percentage of every rate limit (between 0 and 1) only available to each lane
+        and the lanes of higher priority
+        """
+        self._reserved_capacity_pct: Dict[RequestPriority, float] = {}
+        self.set_reserved_capacity_pct(reserved_capacity_pct or {})
+        # Number of requests waiting in each lane, by rate limit id
+        self._waiting_by_limit: Dict[str, List[int]] = defaultdict(lambda: [0] * len(RequestPriority))
+        self._waiting: Dict[RequestPriority, int] = {priority: 0 for priority in RequestPriority}
+        self._served: Dict[RequestPriority, int] = {priority: 0 for priority in RequestPriority}
+        self._wait_times: Dict[RequestPriority, LatencyHistogram] = {
+            priority: LatencyHistogram() for priority in RequestPriority}
+        self._waiting_changed: Optional[asyncio.Event] = None
+
+    @property
+    def reserved_capacity_pct(self) -> Dict[RequestPriority, float]:
+        return dict(self._reserved_capacity_pct)
+
+    def set_reserved_capacity_pct(self, reserved_capacity_pct: Dict[RequestPriority, float]):
+        if any(pct < 0 for pct in reserved_capacity_pct.values()) or sum(reserved_capacity_pct.values()) >= 1:
+            raise ValueError(f"Invalid capacity reserved for the priority lanes ({reserved_capacity_pct}). The "
+                             f"percentages have to be positive and their total lower than 1.")
+        self._reserved_capacity_pct = {RequestPriority(priority): pct
+                                       for priority, pct in reserved_capacity_pct.items()
+                                       if pct > 0}
+
+    def usable_limit(self, limit: int, priority: RequestPriority) -> int:
+        """
+        :return: the part of the limit the requests of the lane can use, once deducted the capacity reserved for the
+        lanes of higher priority (rounded down, leaving the whole limit to the limits too small to reserve any)
+        """
+        reserved_pct = sum(pct for lane, pct in self._reserved_capacity_pct.items() if lane < priority)
+        if reserved_pct == 0:
+            return limit
+        return limit - math.floor(int(limit) * reserved_pct)
+
+    def defers(self, priority: RequestPriority, limit_ids: Iterable[str]) -> bool:
+        """
+        :return: True if requests of a higher priority wait for capacity on one of the rate limits
+        """
+        if priority == 0:
+            return False
+        for limit_id in limit_ids:
+            waiting = self._waiting_by_limit.get(limit_id)
+            if waiting is not None and any(waiting[:priority]):
+                return True
+        return False
+
+    def add_waiting(self, priority: RequestPriority, limit_ids: Iterable[str]):
+        self._waiting[priority] += 1
+        for limit_id in limit_ids:
+            self._waiting_by_limit[limit_id][priority] += 1
+
+    def remove_waiting(self, priority: RequestPriority, limit_ids: Iterable[str]):
+        """
+        Stops counting a request as waiting and wakes up the requests deferred
+        """
+        self._waiting[priority] -= 1
+        for limit_id in limit_ids:
+            waiting = self._waiting_by_limit[limit_id]
+            waiting[priority] -= 1
+            if not any(waiting):
+                del self._waiting_by_limit[limit_id]
+        if self._waiting_changed is not None:
+            self._waiting_changed.set()
+            self._waiting_changed = None
+
+    async def wait_for_change(self):
+        """
+        Waits until one of the requests waiting stops waiting (served or cancelled)
+        """
+        if self._waiting_changed is None:
+            self._waiting_changed = asyncio.Event()
+        await self._waiting_changed.wait()
+
+    def record_served(self, priority: RequestPriority, wait_time: float):
+        self._served[priority] += 1
+        self._wait_times[priority].record(wait_time)
+
+    def reset_stats(self):
+        for priority in RequestPriority:
+            self._served[priority] = 0
+            self._wait_times[priority].reset()
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        :return: for each lane, the capacity reserved, the requests served and waiting, and the distribution of the
+        time the requests served waited for capacity (in milliseconds)
+        """
+        return {
+            priority.name: {
+                "reserved_capacity_pct": self._reserved_capacity_pct.get(priority, 0.0),
+                "served": self._served[priority],
+                "waiting": self._waiting[priority],
+                "wait_time": self._wait_times[priority].summary(),
+            }
+            for priority in RequestPriority
+        }
@@ -1,5 +1,7 @@
 # distutils: language=c++
 
+from libc.stdint cimport int64_t
+
 cdef class Clock:
     cdef:
         object _clock_mode
@@ -10,3 +12,23 @@ cdef class Clock:
         list _current_context
         double _current_tick
         bint _started
+        bint _fast_forward
+        int64_t _skipped_ticks
+        double _min_tick_interval
+        double _last_out_of_band_tick_time
+        int64_t _out_of_band_ticks
+        set _tick_requests
+        object _tick_request_event
+        dict _order_book_triggers
+        object _tick_stats
+        dict _tick_intervals
+        dict _next_tick_times
+        list _tick_schedule
+        int64_t _tick_schedule_sequence
+
+    cdef c_fast_forward(self, double timestamp)
+    cdef c_request_tick(self, object iterator)
+    cdef list c_due_iterators(self, list iterators)
+    cdef c_schedule_iterator(self, object iterator, double timestamp)
+    cdef bint c_tick_iterators(self, list iterators)
+    cdef bint c_tick_iterators_with_stats(self, list iterators, double scheduled_time)
@@ -1,16 +1,27 @@
 # distutils: language=c++
 
 import asyncio
+import heapq
 import logging
 import time
-from typing import List
+from typing import Dict, List, Optional
+
+from libc.math cimport isinf, isnan
 
 from hummingbot.core.time_iterator import TimeIterator
 from hummingbot.core.time_iterator cimport TimeIterator
 from hummingbot.core.clock_mode import ClockMode
+from hummingbot.core.clock_tick_stats import ClockTickStats
+from hummingbot.core.event.event_forwarder import EventForwarder
+from hummingbot.core.event.events import OrderBookEvent
 from hummingbot.logger import HummingbotLogger
 
 s_logger = None
+NaN = float("nan")
+s_float_neg_inf = float("-inf")
+# Fraction of the tick size within which a tick is considered at the next tick time of an iterator, for the tick
+# timestamps drifting as the tick size is added to them
+TICK_TIME_TOLERANCE = 0.25
 
 
 cdef class Clock:
@@ -21,12 +32,22 @@ cdef class Clock:
             s_logger = logging.getLogger(__name__)
         return s_logger
 
-    def __init__(self, clock_mode: ClockMode, tick_size: float = 1.0, start_time: float = 0.0, end_time: float = 0.0):
+    def __init__(self,
+                 clock_mode: ClockMode,
+                 tick_size: float = 1.0,
+                 start_time: float = 0.0,
+                 end_time: float = 0.0,
+                 fast_forward: bool = False,
+                 min_tick_interval: float = 0.1):
         """
         :param clock_mode: either real time mode or back testing mode
         :param tick_size: time interval of each tick
         :param start_time: (back testing mode only) start of simulation in UNIX timestamp
         :param end_time: (back testing mode only) end of simulation in UNIX timestamp. NaN to simulate to end of data.
+        :param fast_forward: (back testing mode only) skip the ticks before the next event timestamp of the child
+        iterators instead of ticking them all. The ticks happen at the same timestamps as without skipping.
+        :param min_tick_interval: (real time mode only) minimum time between two out of band ticks requested by the
+        iterators between the regular ticks, for example on market data changes.
         """
         self._clock_mode = clock_mode
         self._tick_size = tick_size
@@ -36,6 +57,19 @@ cdef class Clock:
         self._child_iterators = []
         self._current_context = None
         self._started = False
+        self._fast_forward = fast_forward
+        self._skipped_ticks = 0
+        self._min_tick_interval = min_tick_interval
+        self._last_out_of_band_tick_time = 0.0
+        self._out_of_band_ticks = 0
+        self._tick_requests = set()
+        self._tick_request_event = None
+        self._order_book_triggers = {}
+        self._tick_stats = None
+        self._tick_intervals = {}
+        self._next_tick_times = {}
+        self._tick_schedule = []
+        self._tick_schedule_sequence = 0
 
     @property
     def clock_mode(self) -> ClockMode:
@@ -57,6 +91,37 @@ cdef class Clock:
     def current_timestamp(self) -> float:
         return self._current_tick
 
+    @property
+    def fast_forward(self) -> bool:
+        return self._fast_forward
+
+    @property
+    def skipped_ticks(self) -> int:
+        return self._skipped_ticks
+
+    @property
+    def min_tick_interval(self) -> float:
+        return self._min_tick_interval
+
+    @property
+    def out_of_band_ticks(self) -> int:
+        return self._out_of_band_ticks
+
+    @property
+    def tick_stats(self) -> Optional[ClockTickStats]:
+        return self._tick_stats
+
+    def enable_tick_stats(self, window_size: int = 1000):
+        """
+        Starts timing the real time ticks, see ClockTickStats. Timings are only collected while enabled, so that the
+        clock loop does not pay for them otherwise.
+        """
+        if self._tick_stats is None:
+            self._tick_stats = ClockTickStats(self._tick_size, window_size)
+
+    def disable_tick_stats(self):
+        self._tick_stats = None
+
     def __enter__(self) -> Clock:
         if self._current_context is not None:
             raise EnvironmentError("Clock context is not re-entrant.")
@@ -69,18 +134,90 @@ cdef class Clock:
                 (<TimeIterator>iterator).c_stop(self)
         self._current_context = None
 
-    def add_iterator(self, iterator: TimeIterator):
+    @property
+    def tick_intervals(self) -> Dict[TimeIterator, float]:
+        return self._tick_intervals.copy()
+
+    def add_iterator(self, iterator: TimeIterator, tick_interval: float = 0.0):
+        """
+        :param tick_interval: the iterator is only ticked on the clock ticks at multiples of this interval, instead of
+        on every tick. It is meant to be a multiple of the tick size. 0 to tick the iterator on every tick.
+        """
         if self._current_context is not None:
             self._current_context.append(iterator)
         if self._started:
             (<TimeIterator>iterator).c_start(self, self._current_tick)
         self._child_iterators.append(iterator)
+        if tick_interval > 0:
+            self._tick_intervals[iterator] = tick_interval
+            # Ticked on the first tick, then at the multiples of the interval
+            self.c_schedule_iterator(iterator, s_float_neg_inf)
 
     def remove_iterator(self, iterator: TimeIterator):
         if self._current_context is not None and iterator in self._current_context:
             (<TimeIterator>iterator).c_stop(self)
             self._current_context.remove(iterator)
         self._child_iterators.remove(iterator)
+        # The entries of the iterator left in the schedule heap are skipped once they reach the top
+        self._tick_intervals.pop(iterator, None)
+        self._next_tick_times.pop(iterator, None)
+        for trigger_iterator, order_book in list(self._order_book_triggers.keys()):
+            if trigger_iterator is iterator:
+                self.remove_order_book_trigger(iterator, order_book)
+
+    def request_tick(self, iterator: TimeIterator):
+        """
+        Requests a tick of the iterator as soon as possible instead of waiting for the next regular tick.
+        Out of band ticks only happen in real time mode, and at most once every min_tick_interval seconds, the
+        requests received in between are grouped in the same tick.
+        """
+        self.c_request_tick(iterator)
+
+    def add_order_book_trigger(self, iterator: TimeIterator, order_book):
+        """
+        Requests a tick of the iterator every time the best bid or the best ask of the order book changes
+        """
+        if (iterator, order_book) in self._order_book_triggers:
+            return
+        # The order book keeps weak references to its listeners, the clock keeps the triggers alive
+        trigger = EventForwarder(lambda event: self.c_request_tick(iterator))
+        self._order_book_triggers[(iterator, order_book)] = trigger
+        order_book.add_listener(OrderBookEvent.BBOChangedEvent, trigger)
+
+    def remove_order_book_trigger(self, iterator: TimeIterator, order_book):
+        trigger = self._order_book_triggers.pop((iterator, order_book), None)
+        if trigger is not None:
+            order_book.remove_listener(OrderBookEvent.BBOChangedEvent, trigger)
+
+    cdef c_request_tick(self, object iterator):
+        if self._tick_request_event is None:
+            # The clock is not running in real time mode
+            return
+        self._tick_requests.add(iterator)
+        self._tick_request_event.set()
+
+    async def _wait_for_tick_request(self, next_tick_time: float) -> bool:
+        """
+        Waits until the next regular tick time, unless an out of band tick is requested and min_tick_interval has
+        elapsed since the last one
+
+        :return: True if an out of band tick has to be run
+        """
+        now = time.time()
+        while now < next_tick_time:
+            if len(self._tick_requests) > 0:
+                earliest_tick_time = self._last_out_of_band_tick_time + self._min_tick_interval
+                if now >= earliest_tick_time:
+                    return True
+                await asyncio.sleep(min(earliest_tick_time, next_tick_time) - now)
+            else:
+                self._tick_request_event.clear()
+                try:
+                    await asyncio.wait_for(self._tick_request_event.wait(), timeout=next_tick_time - now)
+                except asyncio.TimeoutError:
+                    pass
+            now = time.time()
+        return False
 
     async def run(self):
         await self.run_til(float("nan"))
@@ -101,32 +238,138 @@ cdef class Clock:
                 child_iterator.c_start(self, self._current_tick)
             self._started = True
 
+        self._tick_request_event = asyncio.Event()
         try:
             while True:
                 now = time.time()
                 if now >= timestamp:
                     return
 
-                # Sleep until the next tick
+                # Sleep until the next tick, or until an out of band tick is requested
                 next_tick_time = ((now // self._tick_size) + 1) * self._tick_size
-                await asyncio.sleep(next_tick_time - now)
-                self._current_tick = next_tick_time
+                if await self._wait_for_tick_request(next_tick_time):
+                    requested_iterators = self._tick_requests
+                    self._tick_requests = set()
+                    self._current_tick = self._last_out_of_band_tick_time = time.time()
+                    self._out_of_band_ticks += 1
+                else:
+                    # The regular tick runs all the iterators, including the ones that requested a tick
+                    requested_iterators = None
+                    self._tick_requests.clear()
+                    self._current_tick = next_tick_time
 
-                # Run through all the child iterators.
-                for ci in self._current_context:
-                    child_iterator = ci
-                    try:
-                        child_iterator.c_tick(self._current_tick)
-                    except StopIteration:
-                        self.logger().error("Stop iteration triggered in real time mode. This is not expected.")
+                # Run through the child iterators which are due, or which requested the out of band tick.
+                if requested_iterators is None:
+                    iterators = self.c_due_iterators(self._current_context)
+                else:
+                    iterators = [ci for ci in self._current_context if ci in requested_iterators]
+                if self._tick_stats is None:
+                    if not self.c_tick_iterators(iterators):
                         return
-                    except Exception:
-                        self.logger().error("Unexpected error running clock tick.", exc_info=True)
+                elif not self.c_tick_iterators_with_stats(iterators,
+                                                          next_tick_time if requested_iterators is None else NaN):
+                    return
         finally:
+            self._tick_request_event = None
+            self._tick_requests.clear()
             for ci in self._current_context:
                 child_iterator = ci
                 child_iterator._clock = None
 
+    cdef c_schedule_iterator(self, object iterator, double timestamp):
+        self._next_tick_times[iterator] = timestamp
+        self._tick_schedule_sequence += 1
+        # The sequence number breaks the ties between iterators, which are not comparable
+        heapq.heappush(self._tick_schedule, (timestamp, self._tick_schedule_sequence, iterator))
+
+    cdef list c_due_iterators(self, list iterators):
+        """
+        Filters out the iterators with a tick interval which are not due on the current tick, keeping the order of
+        the iterators. Only the iterators due are popped from the schedule heap, so that slow iterators cost nothing
+        on the ticks in between.
+        """
+        cdef:
+            double tolerance = self._tick_size * TICK_TIME_TOLERANCE
+            double tick_interval
+            double next_tick_time
+            set due_iterators
+
+        if len(self._tick_intervals) == 0:
+            return iterators
+
+        due_iterators = set()
+        while len(self._tick_schedule) > 0 and self._tick_schedule[0][0] <= self._current_tick + tolerance:
+            next_tick_time, _, iterator = heapq.heappop(self._tick_schedule)
+            if self._next_tick_times.get(iterator) != next_tick_time:
+                # The iterator has been removed from the clock
+                continue
+            due_iterators.add(iterator)
+            tick_interval = self._tick_intervals[iterator]
+            self.c_schedule_iterator(iterator,
+                                     (((self._current_tick + tolerance) // tick_interval) + 1) * tick_interval)
+        return [iterator for iterator in iterators
+                if iterator in due_iterators or iterator not in self._tick_intervals]
+
+    cdef bint c_tick_iterators(self, list iterators):
+        """
+        Ticks the given child iterators
+
+        :return: False if the clock has to stop
+        """
+        cdef:
+            TimeIterator child_iterator
+
+        for ci in iterators:
+            child_iterator = ci
+            try:
+                child_iterator.c_tick(self._current_tick)
+            except StopIteration:
+                self.logger().error("Stop iteration triggered in real time mode. This is not expected.")
+                return False
+            except Exception:
+                self.logger().error("Unexpected error running clock tick.", exc_info=True)
+        return True
+
+    cdef bint c_tick_iterators_with_stats(self, list iterators, double scheduled_time):
+        """
+        Same as c_tick_iterators, recording the time spent in each iterator and the lag of the wake up compared to the
+        scheduled time, NaN for out of band ticks.
+        """
+        cdef:
+            TimeIterator child_iterator
+            double tick_start = time.perf_counter()
+            double iterator_start
+            double iterator_duration
+            double slowest_duration = -1
+            object slowest_iterator = None
+            bint keep_running = True
+
+        if not isnan(scheduled_time):
+            self._tick_stats.record_loop_lag(time.time() - scheduled_time)
+        for ci in iterators:
+            child_iterator = ci
+            iterator_start = time.perf_counter()
+            try:
+                child_iterator.c_tick(self._current_tick)
+            except StopIteration:
+                self.logger().error("Stop iteration triggered in real time mode. This is not expected.")
+                keep_running = False
+                break
+            except Exception:
+                self.logger().error("Unexpected error running clock tick.", exc_info=True)
+            finally:
+                iterator_duration = time.perf_counter() - iterator_start
+                self._tick_stats.record_iterator_tick(child_iterator, iterator_duration)
+                if iterator_duration > slowest_duration:
+                    slowest_duration = iterator_duration
+                    slowest_iterator = child_iterator
+        tick_duration = time.perf_counter() - tick_start
+        if self._tick_stats.record_tick(tick_duration) and slowest_iterator is not None:
+            self.logger().warning(f"Clock tick took {tick_duration:.3f}s, longer than the tick size of "
+                                  f"{self._tick_size}s. Slowest iterator in the tick: "
+                                  f"{ClockTickStats.iterator_name(slowest_iterator)} ({slowest_duration:.3f}s).")
+        return keep_running
+
     def backtest_til(self, timestamp: float):
         cdef TimeIterator child_iterator
 
@@ -138,8 +381,10 @@ cdef class Clock:
 
         try:
             while not (self._current_tick >= timestamp):
+                if self._fast_forward:
+                    self.c_fast_forward(timestamp)
                 self._current_tick += self._tick_size
-                for ci in self._child_iterators:
+                for ci in self.c_due_iterators(self._child_iterators):
                     child_iterator = ci
                     try:
                         child_iterator.c_tick(self._current_tick)
@@ -156,3 +401,30 @@ cdef class Clock:
 
     def backtest(self):
         self.backtest_til(self._end_time)
+
+    cdef c_fast_forward(self, double timestamp):
+        cdef:
+            TimeIterator child_iterator
+            double next_event_timestamp = timestamp
+            double child_event_timestamp
+            double next_tick_time
+
+        for ci in self._child_iterators:
+            child_iterator = ci
+            child_event_timestamp = child_iterator.c_next_event_timestamp()
+            if ci in self._tick_intervals:
+                # The iterators with a tick interval are not ticked before their next tick time
+                next_tick_time = self._next_tick_times[ci] - self._tick_size * TICK_TIME_TOLERANCE
+                if isnan(child_event_timestamp) or child_event_timestamp < next_tick_time:
+                    child_event_timestamp = next_tick_time
+            if isnan(child_event_timestamp) or child_event_timestamp <= self._current_tick:
+                return
+            if isnan(next_event_timestamp) or child_event_timestamp < next_event_timestamp:
+                next_event_timestamp = child_event_timestamp
+        if isnan(next_event_timestamp) or isinf(next_event_timestamp):
+            return
+
+        # The tick size is added one tick at a time, so that the next tick has the same timestamp as in fixed step mode
+        while self._current_tick + self._tick_size < next_event_timestamp:
+            self._current_tick += self._tick_size
+            self._skipped_ticks += 1
@@ -0,0 +1,131 @@
+from collections import deque
+from typing import Any, Deque, Dict, List
+
+import numpy as np
+import pandas as pd
+
+PERCENTILES = (50, 90, 99)
+
+
+class RollingDurations:
+    """
+    Keeps the last durations recorded, in seconds, to compute rolling percentiles on demand, along with counters over
+    the whole life of the instance.
+    """
+
+    def __init__(self, window_size: int):
+        self._durations: Deque[float] = deque(maxlen=window_size)
+        self._count: int = 0
+        self._max: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def max(self) -> float:
+        return self._max
+
+    def record(self, duration: float):
+        self._durations.append(duration)
+        self._count += 1
+        if duration > self._max:
+            self._max = duration
+
+    def percentiles(self) -> Dict[str, float]:
+        """
+        :return: the rolling percentiles of the recorded durations in milliseconds, NaN before the first record
+        """
+        if len(self._durations) == 0:
+            return {f"p{percentile}": float("nan") for percentile in PERCENTILES}
+        values = np.percentile(np.fromiter(self._durations, dtype=float, count=len(self._durations)), PERCENTILES)
+        return {f"p{percentile}": value * 1e3 for percentile, value in zip(PERCENTILES, values)}
+
+    def summary(self) -> Dict[str, Any]:
+        summary = {"count": self._count}
+        summary.update(self.percentiles())
+        summary["max"] = self._max * 1e3
+        return summary
+
+
+class ClockTickStats:
+    """
+    Timings of the real time clock ticks, collected by `Clock.run_til` once enabled with `Clock.enable_tick_stats`:
+    - the time spent in the `c_tick` of each child iterator
+    - the total duration of the ticks, and the ticks that take longer than the tick size (overruns)
+    - the event loop lag, i.e. how late the clock wakes up for the regular ticks compared to the scheduled time
+    All the durations are reported in milliseconds.
+    """
+
+    def __init__(self, tick_size: float, window_size: int = 1000):
+        self._tick_size: float = tick_size
+        self._window_size: int = window_size
+        self._tick_durations: RollingDurations = RollingDurations(window_size)
+        self._loop_lags: RollingDurations = RollingDurations(window_size)
+        self._iterator_durations: Dict[str, RollingDurations] = {}
+        self._overruns: int = 0
+
+    @staticmethod
+    def iterator_name(iterator: Any) -> str:
+        name = getattr(iterator, "display_name", None)
+        if not isinstance(name, str):
+            name = type(iterator).__name__
+        return name
+
+    @property
+    def tick_size(self) -> float:
+        return self._tick_size
+
+    @property
+    def overruns(self) -> int:
+        return self._overruns
+
+    @property
+    def ticks(self) -> int:
+        return self._tick_durations.count
+
+    def record_iterator_tick(self, iterator: Any, duration: float):
+        name = self.iterator_name(iterator)
+        durations = self._iterator_durations.get(name)
+        if durations is None:
+            durations = self._iterator_durations[name] = RollingDurations(self._window_size)
+        durations.record(duration)
+
+    def record_tick(self, duration: float) -> bool:
+        """
+        :return: True if the tick took longer than the tick size
+        """
+        self._tick_durations.record(duration)
+        if duration > self._tick_size:
+            self._overruns += 1
+            return True
+        return False
+
+    def record_loop_lag(self, lag: float):
+        self._loop_lags.record(max(lag, 0.0))
+
+    def slowest_iterator(self) -> str:
+        """
+        :return: the name of the iterator with the highest rolling median tick duration
+        """
+        if len(self._iterator_durations) == 0:
+            return ""
+        return max(self._iterator_durations.items(), key=lambda item: item[1].percentiles()["p50"])[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tick_size": self._tick_size,
+            "ticks": self._tick_durations.summary(),
+            "overruns": self._overruns,
+            "loop_lag": self._loop_lags.summary(),
+            "iterators": {name: durations.summary() for name, durations in self._iterator_durations.items()},
+        }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        rows: List[Dict[str, Any]] = []
+        for name, durations in [("Tick (total)", self._tick_durations), ("Loop lag", self._loop_lags)]:
+            rows.append(dict(name=name, **durations.summary()))
+        for name, durations in self._iterator_durations.items():
+            rows.append(dict(name=name, **durations.summary()))
+        columns = ["name", "count"] + [f"p{percentile}" for percentile in PERCENTILES] + ["max"]
+        return pd.DataFrame(data=rows, columns=columns)
@@ -6,3 +6,5 @@ cdef class CompositeOrderBook(OrderBook):
         OrderBook _traded_order_book
 
     cdef double c_get_price(self, bint is_buy) except? -1
+    cdef c_build_depth_index(self, bint is_buy)
+    cdef size_t c_fill_depth_buffer(self, bint is_buy, double[:, ::1] buffer, size_t max_levels)
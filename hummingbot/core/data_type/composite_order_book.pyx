@@ -20,6 +20,21 @@ cdef class CompositeOrderBook(OrderBook):
     def __init__(self, order_book: OrderBook = None):
         super().__init__()
         self._traded_order_book = OrderBook()
+        # The composite entries only exist as rows, so volume queries always go through the depth index
+        self._depth_index_enabled = True
+
+    @property
+    def depth_index_enabled(self) -> bool:
+        return self._depth_index_enabled
+
+    @depth_index_enabled.setter
+    def depth_index_enabled(self, value: bool):
+        """
+        The native depth walk of OrderBook does not see the recorded fills, so the depth index can not be disabled.
+        """
+        if not value:
+            raise ValueError("The depth index of a CompositeOrderBook can not be disabled, the volume queries would "
+                             "ignore the recorded fills.")
 
     @property
     def traded_order_book(self) -> OrderBook:
@@ -28,6 +43,7 @@ cdef class CompositeOrderBook(OrderBook):
     def clear_traded_order_book(self):
         self._traded_order_book._bid_book.clear()
         self._traded_order_book._ask_book.clear()
+        self.c_invalidate_depth_index()
 
     def record_filled_order(self, order_fill_event):
         cdef:
@@ -71,6 +87,7 @@ cdef class CompositeOrderBook(OrderBook):
             cpp_bids.push_back(OrderBookEntry(price, amount, timestamp))
 
         self._traded_order_book.c_apply_diffs(cpp_bids, cpp_asks, timestamp)
+        self.c_invalidate_depth_index()
 
     def original_bid_entries(self) -> Iterator[OrderBookRow]:
         return super().bid_entries()
@@ -175,6 +192,44 @@ cdef class CompositeOrderBook(OrderBook):
 
         self._traded_order_book.c_apply_diffs(cpp_bids_changes, cpp_asks_changes, self._last_diff_uid)
 
+    cdef c_build_depth_index(self, bint is_buy):
+        cdef:
+            vector[double] *prices = ref(self._ask_depth_prices) if is_buy else ref(self._bid_depth_prices)
+            vector[double] *cumulative_base = (ref(self._ask_depth_cumulative_base) if is_buy
+                                               else ref(self._bid_depth_cumulative_base))
+            vector[double] *cumulative_quote = (ref(self._ask_depth_cumulative_quote) if is_buy
+                                                else ref(self._bid_depth_cumulative_quote))
+            double base_total = 0
+            double quote_total = 0
+
+        deref(prices).clear()
+        deref(cumulative_base).clear()
+        deref(cumulative_quote).clear()
+        for row in (self.ask_entries() if is_buy else self.bid_entries()):
+            base_total += row.amount
+            quote_total += row.amount * row.price
+            deref(prices).push_back(row.price)
+            deref(cumulative_base).push_back(base_total)
+            deref(cumulative_quote).push_back(quote_total)
+
+    cdef size_t c_fill_depth_buffer(self, bint is_buy, double[:, ::1] buffer, size_t max_levels):
+        cdef:
+            double cumulative_amount = 0
+            size_t level = 0
+
+        # A partial export stops before the end of the generator, so it leaves the traded order book entries no longer
+        # matching the book to the next full walk (e.g. the rebuild of the depth index) to clean up.
+        for row in (self.ask_entries() if is_buy else self.bid_entries()):
+            if level >= max_levels:
+                break
+            cumulative_amount += row.amount
+            buffer[level, 0] = row.price
+            buffer[level, 1] = row.amount
+            buffer[level, 2] = row.update_id
+            buffer[level, 3] = cumulative_amount
+            level += 1
+        return level
+
     cdef double c_get_price(self, bint is_buy) except? -1:
         cdef:
             set[OrderBookEntry] *book = ref(self._ask_book) if is_buy else ref(self._bid_book)
@@ -0,0 +1,15 @@
+# distutils: language=c++
+
+from libc.stdint cimport int64_t
+from hummingbot.core.time_iterator cimport TimeIterator
+
+
+cdef class MarketDataReplayer(TimeIterator):
+    cdef:
+        list _order_book_trackers
+        bint _stop_at_end_of_data
+        int64_t _replayed_events
+        double _start_wall_time
+        double _last_tick_wall_time
+
+    cdef c_replay_until(self, double timestamp)
@@ -0,0 +1,87 @@
+# distutils: language=c++
+import logging
+import time
+from typing import Dict, List
+
+from hummingbot.core.clock cimport Clock
+from hummingbot.core.data_type.replay_order_book_tracker import ReplayOrderBookTracker
+from hummingbot.logger import HummingbotLogger
+
+mdr_logger = None
+
+
+cdef class MarketDataReplayer(TimeIterator):
+    """
+    Replays historical market data into ReplayOrderBookTrackers in step with a backtest clock.
+    On every tick the messages up to the tick timestamp are applied, so it has to be added to the clock before the
+    connectors and strategies using those order books. Once all the data has been replayed it ends the backtest.
+    Its next event timestamp is the one of the next message, so a fast forward clock jumps from message to message.
+    """
+
+    @classmethod
+    def logger(cls) -> HummingbotLogger:
+        global mdr_logger
+        if mdr_logger is None:
+            mdr_logger = logging.getLogger(__name__)
+        return mdr_logger
+
+    def __init__(self, order_book_trackers: List[ReplayOrderBookTracker], stop_at_end_of_data: bool = True):
+        super().__init__()
+        self._order_book_trackers = list(order_book_trackers)
+        self._stop_at_end_of_data = stop_at_end_of_data
+        self._replayed_events = 0
+        self._start_wall_time = 0.0
+        self._last_tick_wall_time = 0.0
+
+    @property
+    def replayed_events(self) -> int:
+        return self._replayed_events
+
+    @property
+    def events_per_second(self) -> float:
+        """
+        Events replayed per second of wall clock time since the replay started, including the time spent by the rest
+        of the clock iterators
+        """
+        cdef double elapsed = self._last_tick_wall_time - self._start_wall_time
+        return self._replayed_events / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def finished(self) -> bool:
+        return all(tracker.data_source.exhausted for tracker in self._order_book_trackers)
+
+    @property
+    def replay_stats(self) -> Dict[str, float]:
+        return {
+            "replayed_events": self._replayed_events,
+            "wall_time": self._last_tick_wall_time - self._start_wall_time,
+            "events_per_second": self.events_per_second,
+        }
+
+    cdef c_start(self, Clock clock, double timestamp):
+        TimeIterator.c_start(self, clock, timestamp)
+        self._replayed_events = 0
+        self._start_wall_time = self._last_tick_wall_time = time.perf_counter()
+        self.c_replay_until(timestamp)
+
+    cdef c_tick(self, double timestamp):
+        TimeIterator.c_tick(self, timestamp)
+        self.c_replay_until(timestamp)
+        if self._stop_at_end_of_data and self.finished:
+            self.logger().info(f"Market data replay finished at {timestamp}. Replayed {self._replayed_events} events "
+                               f"({self.events_per_second:.0f} events/s).")
+            raise StopIteration
+
+    cdef double c_next_event_timestamp(self):
+        cdef double next_event_timestamp = float("inf")
+        for order_book_tracker in self._order_book_trackers:
+            next_event_timestamp = min(next_event_timestamp, order_book_tracker.data_source.next_message_timestamp)
+        if self._stop_at_end_of_data and next_event_timestamp == float("inf"):
+            # The backtest is stopped on the next tick
+            return self._current_timestamp
+        return next_event_timestamp
+
+    cdef c_replay_until(self, double timestamp):
+        for order_book_tracker in self._order_book_trackers:
+            self._replayed_events += order_book_tracker.replay_until(timestamp)
+        self._last_tick_wall_time = time.perf_counter()
@@ -4,6 +4,7 @@ from libc.stdint cimport int64_t
 from libcpp.set cimport set
 from libcpp.vector cimport vector
 from hummingbot.core.data_type.OrderBookEntry cimport OrderBookEntry
+from hummingbot.core.event.event_listener cimport EventListener
 from hummingbot.core.pubsub cimport PubSub
 from .order_book_query_result cimport OrderBookQueryResult
 cimport numpy as np
@@ -20,10 +21,41 @@ cdef class OrderBook(PubSub):
     cdef double _last_applied_trade
     cdef double _last_trade_price_rest_updated
     cdef bint _dex
+    cdef bint _depth_index_enabled
+    cdef bint _bid_depth_index_valid
+    cdef bint _ask_depth_index_valid
+    cdef vector[double] _bid_depth_prices
+    cdef vector[double] _bid_depth_cumulative_base
+    cdef vector[double] _bid_depth_cumulative_quote
+    cdef vector[double] _ask_depth_prices
+    cdef vector[double] _ask_depth_cumulative_base
+    cdef vector[double] _ask_depth_cumulative_quote
+    cdef np.ndarray _bid_depth_buffer
+    cdef np.ndarray _ask_depth_buffer
+    cdef size_t _max_depth_levels
+    cdef double _bid_trim_price
+    cdef double _ask_trim_price
+    cdef bint _bbo_events_enabled
+    cdef double _bbo_bid_price
+    cdef double _bbo_bid_amount
+    cdef double _bbo_ask_price
+    cdef double _bbo_ask_amount
 
     cdef c_apply_diffs(self, vector[OrderBookEntry] bids, vector[OrderBookEntry] asks, int64_t update_id)
     cdef c_apply_snapshot(self, vector[OrderBookEntry] bids, vector[OrderBookEntry] asks, int64_t update_id)
     cdef c_apply_trade(self, object trade_event)
+    cdef c_add_listener(self, int64_t event_tag, EventListener listener)
+    cdef c_remove_listener(self, int64_t event_tag, EventListener listener)
+    cdef c_remove_dead_listeners(self, int64_t event_tag)
+    cdef c_update_bbo_events_enabled(self)
+    cdef bint c_record_bbo(self)
+    cdef c_emit_bbo_change(self, int64_t update_id)
+    cdef c_trim_depth(self)
+    cdef c_invalidate_depth_index(self)
+    cdef c_build_depth_index(self, bint is_buy)
+    cdef c_ensure_depth_index(self, bint is_buy)
+    cdef np.ndarray c_depth_buffer(self, bint is_buy, size_t levels)
+    cdef size_t c_fill_depth_buffer(self, bint is_buy, double[:, ::1] buffer, size_t max_levels)
     cdef c_apply_numpy_diffs(self,
                              np.ndarray[np.float64_t, ndim=2] bids_array,
                              np.ndarray[np.float64_t, ndim=2] asks_array)
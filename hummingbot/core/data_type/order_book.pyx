@@ -4,6 +4,7 @@ import bisect
 import logging
 import time
 from typing import (
+    Any,
     Dict,
     Iterator,
     List,
@@ -15,10 +16,14 @@ import numpy as np
 import pandas as pd
 from aiokafka import ConsumerRecord
 
+from cpython.conversion cimport PyOS_string_to_double
+from cpython.unicode cimport PyUnicode_AsUTF8AndSize
+from libcpp.unordered_map cimport unordered_map
 from cython.operator cimport(
     address as ref,
     dereference as deref,
     postincrement as inc,
+    predecrement as dec,
 )
 
 from hummingbot.core.data_type.order_book_message import OrderBookMessage
@@ -27,6 +32,7 @@ from hummingbot.core.data_type.order_book_row import OrderBookRow
 from hummingbot.core.data_type.OrderBookEntry cimport truncateOverlapEntries
 from hummingbot.logger import HummingbotLogger
 from hummingbot.core.event.events import (
+    OrderBookBBOChangedEvent,
     OrderBookEvent,
     OrderBookTradeEvent
 )
@@ -36,9 +42,128 @@ cimport numpy as np
 ob_logger = None
 NaN = float("nan")
 
+cdef int64_t BBO_CHANGED_EVENT_TAG = OrderBookEvent.BBOChangedEvent.value
+# A book limited to max_depth_levels keeps this many times as many levels per side, the ones past the limit are not
+# shown but let ordinary cancels inside the visible depth be absorbed without a new snapshot.
+cdef size_t HIDDEN_DEPTH_LEVELS_FACTOR = 2
+
+
+cdef inline double _parse_level_value(object value) except? -1:
+    """
+    Converts a raw level price or amount to a double. Exchanges usually send them as decimal strings, which are parsed
+    from the string's UTF-8 buffer without creating an intermediate Python float.
+    """
+    cdef:
+        const char *text
+        char *end
+        Py_ssize_t length
+        double result
+    if type(value) is str:
+        text = PyUnicode_AsUTF8AndSize(value, &length)
+        try:
+            result = PyOS_string_to_double(text, &end, NULL)
+            if end == text + length:
+                return result
+        except ValueError:
+            pass
+        # Let Python deal with anything strtod-like parsing rejects (whitespace, underscores, invalid values).
+        return float(value)
+    return value
+
+
+cdef inline _parse_raw_levels(object levels, vector[OrderBookEntry] *entries, int64_t update_id):
+    entries.reserve(len(levels))
+    for level in levels:
+        entries.push_back(OrderBookEntry(_parse_level_value(level[0]), _parse_level_value(level[1]), update_id))
+
+
+cdef inline _array_levels(const double[:, :] levels, vector[OrderBookEntry] *entries, int64_t update_id):
+    cdef Py_ssize_t i
+    entries.reserve(levels.shape[0])
+    for i in range(levels.shape[0]):
+        entries.push_back(OrderBookEntry(levels[i, 0], levels[i, 1], update_id))
+
+
+cdef inline _message_levels(object message, vector[OrderBookEntry] *bids, vector[OrderBookEntry] *asks):
+    if message.has_level_arrays:
+        _array_levels(message.bids_array, bids, message.update_id)
+        _array_levels(message.asks_array, asks, message.update_id)
+    elif message.has_raw_levels:
+        _parse_raw_levels(message.content["bids"], bids, message.update_id)
+        _parse_raw_levels(message.content["asks"], asks, message.update_id)
+    else:
+        for row in message.bids:
+            bids.push_back(OrderBookEntry(row.price, row.amount, row.update_id))
+        for row in message.asks:
+            asks.push_back(OrderBookEntry(row.price, row.amount, row.update_id))
+
+
+cdef inline _merge_levels(vector[OrderBookEntry] *merged,
+                          unordered_map[double, size_t] *positions,
+                          vector[OrderBookEntry] *levels):
+    """
+    Adds the levels to the merged ones, replacing the merged level with the same price when there is one.
+    """
+    cdef unordered_map[double, size_t].iterator position
+    for entry in deref(levels):
+        position = positions.find(entry.getPrice())
+        if position != positions.end():
+            deref(merged)[deref(position).second] = entry
+        else:
+            deref(positions)[entry.getPrice()] = merged.size()
+            merged.push_back(entry)
+
+
+cdef inline bint _same_level_value(double previous, double current):
+    return previous == current or (previous != previous and current != current)
+
+
+cdef inline size_t _shown_levels(size_t book_levels, size_t max_depth_levels):
+    if max_depth_levels > 0:
+        return min(book_levels, max_depth_levels)
+    return book_levels
+
+
+cdef inline size_t _index_reaching_cumulative(vector[double] *cumulative, double target):
+    """
+    Binary search over a non-decreasing cumulative depth vector. Returns the index of the first level at which the
+    cumulative amount reaches the target, or the size of the vector if the target is never reached.
+    """
+    cdef:
+        size_t low = 0
+        size_t high = deref(cumulative).size()
+        size_t mid
+    while low < high:
+        mid = (low + high) >> 1
+        if deref(cumulative)[mid] >= target:
+            high = mid
+        else:
+            low = mid + 1
+    return low
+
+
+cdef inline size_t _levels_within_price(vector[double] *prices, double price, bint is_buy):
+    """
+    Returns the number of levels, counted from the top of the book, that are priced at or better than the given price.
+    Ask prices are ascending and bid prices are descending in the depth index.
+    """
+    cdef:
+        size_t low = 0
+        size_t high = deref(prices).size()
+        size_t mid
+    while low < high:
+        mid = (low + high) >> 1
+        if (deref(prices)[mid] > price) if is_buy else (deref(prices)[mid] < price):
+            high = mid
+        else:
+            low = mid + 1
+    return low
+
 
 cdef class OrderBook(PubSub):
     ORDER_BOOK_TRADE_EVENT_TAG = OrderBookEvent.TradeEvent.value
+    ORDER_BOOK_BBO_CHANGED_EVENT_TAG = OrderBookEvent.BBOChangedEvent.value
+    DEPTH_ARRAY_COLUMNS = ("price", "amount", "update_id", "cumulative_amount")
 
     @classmethod
     def logger(cls) -> HummingbotLogger:
@@ -56,6 +181,15 @@ cdef class OrderBook(PubSub):
         self._last_applied_trade = -1000.0
         self._last_trade_price_rest_updated = -1000
         self._dex = dex
+        self._depth_index_enabled = False
+        self._bid_depth_index_valid = False
+        self._ask_depth_index_valid = False
+        self._bid_depth_buffer = np.empty((0, len(self.DEPTH_ARRAY_COLUMNS)), dtype=np.float64)
+        self._ask_depth_buffer = np.empty((0, len(self.DEPTH_ARRAY_COLUMNS)), dtype=np.float64)
+        self._max_depth_levels = 0
+        self._bid_trim_price = self._ask_trim_price = NaN
+        self._bbo_events_enabled = False
+        self._bbo_bid_price = self._bbo_bid_amount = self._bbo_ask_price = self._bbo_ask_amount = NaN
 
     cdef c_apply_diffs(self, vector[OrderBookEntry] bids, vector[OrderBookEntry] asks, int64_t update_id):
         cdef:
@@ -68,13 +202,19 @@ cdef class OrderBook(PubSub):
             OrderBookEntry top_ask
 
         # Apply the diffs. Diffs with 0 amounts mean deletion.
+        # Levels beyond the trimmed depth are unknown, so the diffs for them are ignored (comparisons are always false
+        # while nothing has been trimmed and the trim prices are NaN).
         for bid in bids:
+            if bid.getPrice() <= self._bid_trim_price:
+                continue
             result = self._bid_book.find(bid)
             if result != bid_book_end:
                 self._bid_book.erase(result)
             if bid.getAmount() > 0:
                 self._bid_book.insert(bid)
         for ask in asks:
+            if ask.getPrice() >= self._ask_trim_price:
+                continue
             result = self._ask_book.find(ask)
             if result != ask_book_end:
                 self._ask_book.erase(result)
@@ -83,6 +223,8 @@ cdef class OrderBook(PubSub):
 
         # If any overlapping entries between the bid and ask books, centralised: newer entries win, dex: see OrderBookEntry.cpp
         truncateOverlapEntries(self._bid_book, self._ask_book, self._dex)
+        if self._max_depth_levels > 0:
+            self.c_trim_depth()
 
         # Record the current best prices, for faster c_get_price() calls.
         bid_iterator = self._bid_book.rbegin()
@@ -96,6 +238,9 @@ cdef class OrderBook(PubSub):
 
         # Remember the last diff update ID.
         self._last_diff_uid = update_id
+        self.c_invalidate_depth_index()
+        if self._bbo_events_enabled:
+            self.c_emit_bbo_change(update_id)
 
     cdef c_apply_snapshot(self, vector[OrderBookEntry] bids, vector[OrderBookEntry] asks, int64_t update_id):
         cdef:
@@ -109,6 +254,7 @@ cdef class OrderBook(PubSub):
         # Start with an empty order book, and then insert all entries.
         self._bid_book.clear()
         self._ask_book.clear()
+        self._bid_trim_price = self._ask_trim_price = NaN
         for bid in bids:
             self._bid_book.insert(bid)
             if not (bid.getPrice() <= best_bid_price):
@@ -130,18 +276,111 @@ cdef class OrderBook(PubSub):
                 top_ask = deref(ask_iterator)
                 best_ask_price = top_ask.getPrice()
 
+        if self._max_depth_levels > 0:
+            self.c_trim_depth()
+
         # Record the current best prices, for faster c_get_price() calls.
         self._best_bid = best_bid_price
         self._best_ask = best_ask_price
 
         # Remember the last snapshot update ID.
         self._snapshot_uid = update_id
+        self.c_invalidate_depth_index()
+        if self._bbo_events_enabled:
+            self.c_emit_bbo_change(update_id)
 
     cdef c_apply_trade(self, object trade_event):
         self._last_trade_price = trade_event.price
         self._last_applied_trade = time.perf_counter()
         self.c_trigger_event(self.ORDER_BOOK_TRADE_EVENT_TAG, trade_event)
 
+    cdef c_trim_depth(self):
+        """
+        Keeps only the max_depth_levels * HIDDEN_DEPTH_LEVELS_FACTOR levels closest to the mid price on each side. The
+        best trimmed price of each side is remembered, since the book is no longer known from there on and later
+        diffs for those levels have to be ignored until the next snapshot.
+        """
+        cdef:
+            set[OrderBookEntry].iterator bid_iterator
+            set[OrderBookEntry].iterator ask_iterator
+            size_t kept_levels = self._max_depth_levels * HIDDEN_DEPTH_LEVELS_FACTOR
+        while self._bid_book.size() > kept_levels:
+            bid_iterator = self._bid_book.begin()
+            if not (deref(bid_iterator).getPrice() <= self._bid_trim_price):
+                self._bid_trim_price = deref(bid_iterator).getPrice()
+            self._bid_book.erase(bid_iterator)
+        while self._ask_book.size() > kept_levels:
+            ask_iterator = self._ask_book.end()
+            dec(ask_iterator)
+            if not (deref(ask_iterator).getPrice() >= self._ask_trim_price):
+                self._ask_trim_price = deref(ask_iterator).getPrice()
+            self._ask_book.erase(ask_iterator)
+
+    cdef c_add_listener(self, int64_t event_tag, EventListener listener):
+        PubSub.c_add_listener(self, event_tag, listener)
+        if event_tag == BBO_CHANGED_EVENT_TAG:
+            self.c_update_bbo_events_enabled()
+
+    cdef c_remove_listener(self, int64_t event_tag, EventListener listener):
+        PubSub.c_remove_listener(self, event_tag, listener)
+        if event_tag == BBO_CHANGED_EVENT_TAG:
+            self.c_update_bbo_events_enabled()
+
+    cdef c_remove_dead_listeners(self, int64_t event_tag):
+        PubSub.c_remove_dead_listeners(self, event_tag)
+        if event_tag == BBO_CHANGED_EVENT_TAG:
+            self.c_update_bbo_events_enabled()
+
+    cdef c_update_bbo_events_enabled(self):
+        """
+        Top of book changes are only tracked while there are BBO changed listeners, so that applying diffs and
+        snapshots costs a single flag check otherwise. The current top of book is recorded when the first listener
+        is added, and events are fired from then on only when it changes.
+        """
+        cdef bint enabled = self._events.count(BBO_CHANGED_EVENT_TAG) > 0
+        if enabled and not self._bbo_events_enabled:
+            self.c_record_bbo()
+        self._bbo_events_enabled = enabled
+
+    cdef bint c_record_bbo(self):
+        """
+        Records the best bid and ask prices and amounts, returning whether any of them changed since the last record.
+        """
+        cdef:
+            set[OrderBookEntry].reverse_iterator bid_iterator = self._bid_book.rbegin()
+            set[OrderBookEntry].iterator ask_iterator = self._ask_book.begin()
+            double bid_price = NaN
+            double bid_amount = NaN
+            double ask_price = NaN
+            double ask_amount = NaN
+            bint changed
+        if bid_iterator != self._bid_book.rend():
+            bid_price = deref(bid_iterator).getPrice()
+            bid_amount = deref(bid_iterator).getAmount()
+        if ask_iterator != self._ask_book.end():
+            ask_price = deref(ask_iterator).getPrice()
+            ask_amount = deref(ask_iterator).getAmount()
+        changed = not (_same_level_value(self._bbo_bid_price, bid_price)
+                       and _same_level_value(self._bbo_bid_amount, bid_amount)
+                       and _same_level_value(self._bbo_ask_price, ask_price)
+                       and _same_level_value(self._bbo_ask_amount, ask_amount))
+        self._bbo_bid_price = bid_price
+        self._bbo_bid_amount = bid_amount
+        self._bbo_ask_price = ask_price
+        self._bbo_ask_amount = ask_amount
+        return changed
+
+    cdef c_emit_bbo_change(self, int64_t update_id):
+        if self.c_record_bbo():
+            self.c_trigger_event(BBO_CHANGED_EVENT_TAG, OrderBookBBOChangedEvent(
+                timestamp=time.time(),
+                update_id=update_id,
+                best_bid_price=self._bbo_bid_price,
+                best_bid_amount=self._bbo_bid_amount,
+                best_ask_price=self._bbo_ask_price,
+                best_ask_amount=self._bbo_ask_amount,
+            ))
+
     @property
     def last_trade_price(self) -> float:
         return self._last_trade_price
@@ -162,6 +401,35 @@ cdef class OrderBook(PubSub):
     def last_trade_price_rest_updated(self, value: float):
         self._last_trade_price_rest_updated = value
 
+    @property
+    def max_depth_levels(self) -> int:
+        return self._max_depth_levels
+
+    @max_depth_levels.setter
+    def max_depth_levels(self, value: Optional[int]):
+        """
+        Maximum number of levels shown on each side of the book, the ones closest to the mid price. None or 0 keep
+        every level. A hidden margin of further levels is kept up to date behind them, so that the levels removed
+        inside the visible depth can be refilled without a new snapshot.
+        """
+        if value is not None and value < 0:
+            raise ValueError(f"The maximum depth levels can't be negative ({value}).")
+        self._max_depth_levels = value or 0
+        if self._max_depth_levels > 0:
+            self.c_trim_depth()
+            self.c_invalidate_depth_index()
+
+    @property
+    def trimmed_depth_exhausted(self) -> bool:
+        """
+        True when a trimmed side has used up its hidden margin and no longer has max_depth_levels levels to show
+        (e.g. the market moved toward it), or the limit was lifted after a trim. The levels beyond the trim price are
+        unknown, so the book needs a new snapshot to show them.
+        """
+        cdef size_t min_levels = self._max_depth_levels if self._max_depth_levels > 0 else <size_t>-1
+        return ((self._bid_trim_price == self._bid_trim_price and self._bid_book.size() < min_levels)
+                or (self._ask_trim_price == self._ask_trim_price and self._ask_book.size() < min_levels))
+
     @property
     def snapshot_uid(self) -> int:
         return self._snapshot_uid
@@ -172,12 +440,79 @@ cdef class OrderBook(PubSub):
 
     @property
     def snapshot(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        bids_rows = list(self.bid_entries())
-        asks_rows = list(self.ask_entries())
-        bids_df = pd.DataFrame(data=bids_rows, columns=OrderBookRow._fields, dtype="float64")
-        asks_df = pd.DataFrame(data=asks_rows, columns=OrderBookRow._fields, dtype="float64")
+        bids_array, asks_array = self.depth_arrays()
+        row_columns = len(OrderBookRow._fields)
+        bids_df = pd.DataFrame(data=bids_array[:, :row_columns], columns=OrderBookRow._fields, copy=True)
+        asks_df = pd.DataFrame(data=asks_array[:, :row_columns], columns=OrderBookRow._fields, copy=True)
         return bids_df, asks_df
 
+    def depth_arrays(self, max_levels: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exports the top of both sides of the book as float64 arrays with the columns in DEPTH_ARRAY_COLUMNS
+        (price, amount, update_id, cumulative_amount), ordered from the best price outwards.
+
+        The returned arrays are views over buffers owned by the order book that are reused by the next call, copy them
+        if they have to outlive it.
+
+        :param max_levels: maximum number of levels to export per side, all the shown levels if None
+        :return: a tuple with the bids and asks arrays
+        """
+        cdef:
+            size_t bid_levels = _shown_levels(self._bid_book.size(), self._max_depth_levels)
+            size_t ask_levels = _shown_levels(self._ask_book.size(), self._max_depth_levels)
+            np.ndarray bids_buffer
+            np.ndarray asks_buffer
+        if max_levels is not None:
+            bid_levels = min(bid_levels, max(max_levels, 0))
+            ask_levels = min(ask_levels, max(max_levels, 0))
+        bids_buffer = self.c_depth_buffer(False, bid_levels)
+        asks_buffer = self.c_depth_buffer(True, ask_levels)
+        bid_levels = self.c_fill_depth_buffer(False, bids_buffer, bid_levels)
+        ask_levels = self.c_fill_depth_buffer(True, asks_buffer, ask_levels)
+        return bids_buffer[:bid_levels], asks_buffer[:ask_levels]
+
+    cdef np.ndarray c_depth_buffer(self, bint is_buy, size_t levels):
+        cdef:
+            np.ndarray buffer = self._ask_depth_buffer if is_buy else self._bid_depth_buffer
+            size_t capacity = buffer.shape[0]
+        if capacity < levels:
+            buffer = np.empty((max(levels, capacity * 2), len(self.DEPTH_ARRAY_COLUMNS)), dtype=np.float64)
+            if is_buy:
+                self._ask_depth_buffer = buffer
+            else:
+                self._bid_depth_buffer = buffer
+        return buffer
+
+    cdef size_t c_fill_depth_buffer(self, bint is_buy, double[:, ::1] buffer, size_t max_levels):
+        cdef:
+            set[OrderBookEntry].iterator ask_it = self._ask_book.begin()
+            set[OrderBookEntry].reverse_iterator bid_it = self._bid_book.rbegin()
+            double cumulative_amount = 0
+            size_t level = 0
+            OrderBookEntry entry
+
+        if is_buy:
+            while level < max_levels and ask_it != self._ask_book.end():
+                entry = deref(ask_it)
+                cumulative_amount += entry.getAmount()
+                buffer[level, 0] = entry.getPrice()
+                buffer[level, 1] = entry.getAmount()
+                buffer[level, 2] = entry.getUpdateId()
+                buffer[level, 3] = cumulative_amount
+                level += 1
+                inc(ask_it)
+        else:
+            while level < max_levels and bid_it != self._bid_book.rend():
+                entry = deref(bid_it)
+                cumulative_amount += entry.getAmount()
+                buffer[level, 0] = entry.getPrice()
+                buffer[level, 1] = entry.getAmount()
+                buffer[level, 2] = entry.getUpdateId()
+                buffer[level, 3] = cumulative_amount
+                level += 1
+                inc(bid_it)
+        return level
+
     def apply_diffs(self, bids: List[OrderBookRow], asks: List[OrderBookRow], update_id: int):
         cdef:
             vector[OrderBookEntry] cpp_bids
@@ -198,6 +533,95 @@ cdef class OrderBook(PubSub):
             cpp_asks.push_back(OrderBookEntry(row.price, row.amount, row.update_id))
         self.c_apply_snapshot(cpp_bids, cpp_asks, update_id)
 
+    def apply_raw_diffs(self, bids: List[List[Any]], asks: List[List[Any]], update_id: int):
+        """
+        Applies diffs expressed as the exchange's raw levels, [[price, amount, ...], ...], where price and amount are
+        strings or numbers. The levels are parsed straight into order book entries, skipping OrderBookRow.
+        """
+        cdef:
+            vector[OrderBookEntry] cpp_bids
+            vector[OrderBookEntry] cpp_asks
+        _parse_raw_levels(bids, &cpp_bids, update_id)
+        _parse_raw_levels(asks, &cpp_asks, update_id)
+        self.c_apply_diffs(cpp_bids, cpp_asks, update_id)
+
+    def apply_raw_snapshot(self, bids: List[List[Any]], asks: List[List[Any]], update_id: int):
+        """
+        Applies a snapshot expressed as the exchange's raw levels, [[price, amount, ...], ...], where price and
+        amount are strings or numbers. The levels are parsed straight into order book entries, skipping OrderBookRow.
+        """
+        cdef:
+            vector[OrderBookEntry] cpp_bids
+            vector[OrderBookEntry] cpp_asks
+        _parse_raw_levels(bids, &cpp_bids, update_id)
+        _parse_raw_levels(asks, &cpp_asks, update_id)
+        self.c_apply_snapshot(cpp_bids, cpp_asks, update_id)
+
+    def apply_level_array_diffs(self, bids_array: np.ndarray, asks_array: np.ndarray, update_id: int):
+        """
+        Applies diffs given as float64 arrays whose first two columns are price and amount, all tagged with update_id.
+        """
+        cdef:
+            vector[OrderBookEntry] cpp_bids
+            vector[OrderBookEntry] cpp_asks
+        _array_levels(bids_array, &cpp_bids, update_id)
+        _array_levels(asks_array, &cpp_asks, update_id)
+        self.c_apply_diffs(cpp_bids, cpp_asks, update_id)
+
+    def apply_level_array_snapshot(self, bids_array: np.ndarray, asks_array: np.ndarray, update_id: int):
+        """
+        Applies a snapshot given as float64 arrays whose first two columns are price and amount, all tagged with
+        update_id.
+        """
+        cdef:
+            vector[OrderBookEntry] cpp_bids
+            vector[OrderBookEntry] cpp_asks
+        _array_levels(bids_array, &cpp_bids, update_id)
+        _array_levels(asks_array, &cpp_asks, update_id)
+        self.c_apply_snapshot(cpp_bids, cpp_asks, update_id)
+
+    def apply_diff_message(self, message: OrderBookMessage):
+        if message.has_level_arrays:
+            self.apply_level_array_diffs(message.bids_array, message.asks_array, message.update_id)
+        elif message.has_raw_levels:
+            self.apply_raw_diffs(message.content["bids"], message.content["asks"], message.update_id)
+        else:
+            self.apply_diffs(message.bids, message.asks, message.update_id)
+
+    def apply_snapshot_message(self, message: OrderBookMessage):
+        if message.has_level_arrays:
+            self.apply_level_array_snapshot(message.bids_array, message.asks_array, message.update_id)
+        elif message.has_raw_levels:
+            self.apply_raw_snapshot(message.content["bids"], message.content["asks"], message.update_id)
+        else:
+            self.apply_snapshot(message.bids, message.asks, message.update_id)
+
+    def apply_diff_messages(self, messages: List[OrderBookMessage]):
+        """
+        Applies several diff messages at once, merged into a single net diff where the last amount received for each
+        price wins, with the largest update id among them.
+        """
+        cdef:
+            vector[OrderBookEntry] merged_bids
+            vector[OrderBookEntry] merged_asks
+            vector[OrderBookEntry] bids
+            vector[OrderBookEntry] asks
+            unordered_map[double, size_t] bid_positions
+            unordered_map[double, size_t] ask_positions
+            int64_t update_id
+        if len(messages) == 0:
+            return
+        update_id = messages[0].update_id
+        for message in messages:
+            bids.clear()
+            asks.clear()
+            _message_levels(message, &bids, &asks)
+            _merge_levels(&merged_bids, &bid_positions, &bids)
+            _merge_levels(&merged_asks, &ask_positions, &asks)
+            if message.update_id > update_id:
+                update_id = message.update_id
+        self.c_apply_diffs(merged_bids, merged_asks, update_id)
+
     def apply_trade(self, trade: OrderBookTradeEvent):
         self.c_apply_trade(trade)
 
@@ -266,20 +690,24 @@ cdef class OrderBook(PubSub):
     def bid_entries(self) -> Iterator[OrderBookRow]:
         cdef:
             set[OrderBookEntry].reverse_iterator it = self._bid_book.rbegin()
+            size_t levels_left = _shown_levels(self._bid_book.size(), self._max_depth_levels)
             OrderBookEntry entry
-        while it != self._bid_book.rend():
+        while levels_left > 0 and it != self._bid_book.rend():
             entry = deref(it)
             yield OrderBookRow(entry.getPrice(), entry.getAmount(), entry.getUpdateId())
             inc(it)
+            levels_left -= 1
 
     def ask_entries(self) -> Iterator[OrderBookRow]:
         cdef:
             set[OrderBookEntry].iterator it = self._ask_book.begin()
+            size_t levels_left = _shown_levels(self._ask_book.size(), self._max_depth_levels)
             OrderBookEntry entry
-        while it != self._ask_book.end():
+        while levels_left > 0 and it != self._ask_book.end():
             entry = deref(it)
             yield OrderBookRow(entry.getPrice(), entry.getAmount(), entry.getUpdateId())
             inc(it)
+            levels_left -= 1
 
     def simulate_buy(self, amount: float) -> List[OrderBookRow]:
         amount_left = amount
@@ -319,23 +747,114 @@ cdef class OrderBook(PubSub):
     def get_price(self, is_buy: bool) -> float:
         return self.c_get_price(is_buy)
 
+    cdef c_invalidate_depth_index(self):
+        self._bid_depth_index_valid = False
+        self._ask_depth_index_valid = False
+
+    cdef c_build_depth_index(self, bint is_buy):
+        """
+        Rebuilds the cumulative depth index for one side of the book, ordered from the top of the book outwards.
+        Entry i of the cumulative vectors holds the base and quote volume of levels 0..i inclusive.
+        """
+        cdef:
+            vector[double] *prices = ref(self._ask_depth_prices) if is_buy else ref(self._bid_depth_prices)
+            vector[double] *cumulative_base = (ref(self._ask_depth_cumulative_base) if is_buy
+                                               else ref(self._bid_depth_cumulative_base))
+            vector[double] *cumulative_quote = (ref(self._ask_depth_cumulative_quote) if is_buy
+                                                else ref(self._bid_depth_cumulative_quote))
+            set[OrderBookEntry].iterator ask_it = self._ask_book.begin()
+            set[OrderBookEntry].reverse_iterator bid_it = self._bid_book.rbegin()
+            size_t book_size = self._ask_book.size() if is_buy else self._bid_book.size()
+            double base_total = 0
+            double quote_total = 0
+            OrderBookEntry entry
+
+        deref(prices).clear()
+        deref(cumulative_base).clear()
+        deref(cumulative_quote).clear()
+        deref(prices).reserve(book_size)
+        deref(cumulative_base).reserve(book_size)
+        deref(cumulative_quote).reserve(book_size)
+
+        if is_buy:
+            while ask_it != self._ask_book.end():
+                entry = deref(ask_it)
+                base_total += entry.getAmount()
+                quote_total += entry.getAmount() * entry.getPrice()
+                deref(prices).push_back(entry.getPrice())
+                deref(cumulative_base).push_back(base_total)
+                deref(cumulative_quote).push_back(quote_total)
+                inc(ask_it)
+        else:
+            while bid_it != self._bid_book.rend():
+                entry = deref(bid_it)
+                base_total += entry.getAmount()
+                quote_total += entry.getAmount() * entry.getPrice()
+                deref(prices).push_back(entry.getPrice())
+                deref(cumulative_base).push_back(base_total)
+                deref(cumulative_quote).push_back(quote_total)
+                inc(bid_it)
+
+    cdef c_ensure_depth_index(self, bint is_buy):
+        if is_buy and not self._ask_depth_index_valid:
+            self.c_build_depth_index(True)
+            self._ask_depth_index_valid = True
+        elif not is_buy and not self._bid_depth_index_valid:
+            self.c_build_depth_index(False)
+            self._bid_depth_index_valid = True
+
+    @property
+    def depth_index_enabled(self) -> bool:
+        return self._depth_index_enabled
+
+    @depth_index_enabled.setter
+    def depth_index_enabled(self, value: bool):
+        """
+        When enabled, volume and price queries are answered with a binary search over a cumulative depth index that
+        is rebuilt lazily after the book changes, instead of walking the book on every query.
+        """
+        self._depth_index_enabled = value
+        self.c_invalidate_depth_index()
+
     cdef OrderBookQueryResult c_get_price_for_volume(self, bint is_buy, double volume):
         cdef:
             double cumulative_volume = 0
             double result_price = NaN
+            vector[double] *prices
+            vector[double] *cumulative_base
+            size_t index
+            set[OrderBookEntry].iterator ask_it
+            set[OrderBookEntry].reverse_iterator bid_it
+            OrderBookEntry entry
 
-        if is_buy:
-            for order_book_row in self.ask_entries():
-                cumulative_volume += order_book_row.amount
+        if self._depth_index_enabled:
+            self.c_ensure_depth_index(is_buy)
+            prices = ref(self._ask_depth_prices) if is_buy else ref(self._bid_depth_prices)
+            cumulative_base = ref(self._ask_depth_cumulative_base) if is_buy else ref(self._bid_depth_cumulative_base)
+            index = _index_reaching_cumulative(cumulative_base, volume)
+            if index < deref(cumulative_base).size():
+                cumulative_volume = deref(cumulative_base)[index]
+                result_price = deref(prices)[index]
+            elif deref(cumulative_base).size() > 0:
+                cumulative_volume = deref(cumulative_base).back()
+        elif is_buy:
+            ask_it = self._ask_book.begin()
+            while ask_it != self._ask_book.end():
+                entry = deref(ask_it)
+                cumulative_volume += entry.getAmount()
                 if cumulative_volume >= volume:
-                    result_price = order_book_row.price
+                    result_price = entry.getPrice()
                     break
+                inc(ask_it)
         else:
-            for order_book_row in self.bid_entries():
-                cumulative_volume += order_book_row.amount
+            bid_it = self._bid_book.rbegin()
+            while bid_it != self._bid_book.rend():
+                entry = deref(bid_it)
+                cumulative_volume += entry.getAmount()
                 if cumulative_volume >= volume:
-                    result_price = order_book_row.price
+                    result_price = entry.getPrice()
                     break
+                inc(bid_it)
 
         return OrderBookQueryResult(NaN, volume, result_price, min(cumulative_volume, volume))
 
@@ -344,30 +863,58 @@ cdef class OrderBook(PubSub):
             double total_cost = 0
             double total_volume = 0
             double result_vwap = NaN
-        if is_buy:
-            for order_book_row in self.ask_entries():
-                total_cost += order_book_row.amount * order_book_row.price
-                total_volume += order_book_row.amount
-                if total_volume >= volume:
-                    total_cost -= order_book_row.amount * order_book_row.price
-                    total_volume -= order_book_row.amount
+            double incremental_amount
+            vector[double] *prices
+            vector[double] *cumulative_base
+            vector[double] *cumulative_quote
+            size_t index
+            set[OrderBookEntry].iterator ask_it
+            set[OrderBookEntry].reverse_iterator bid_it
+            OrderBookEntry entry
+
+        if self._depth_index_enabled:
+            self.c_ensure_depth_index(is_buy)
+            prices = ref(self._ask_depth_prices) if is_buy else ref(self._bid_depth_prices)
+            cumulative_base = ref(self._ask_depth_cumulative_base) if is_buy else ref(self._bid_depth_cumulative_base)
+            cumulative_quote = (ref(self._ask_depth_cumulative_quote) if is_buy
+                                else ref(self._bid_depth_cumulative_quote))
+            index = _index_reaching_cumulative(cumulative_base, volume)
+            if index < deref(cumulative_base).size():
+                if index > 0:
+                    total_cost = deref(cumulative_quote)[index - 1]
+                    total_volume = deref(cumulative_base)[index - 1]
+                incremental_amount = volume - total_volume
+                total_cost += incremental_amount * deref(prices)[index]
+                total_volume += incremental_amount
+                result_vwap = total_cost / total_volume
+            elif deref(cumulative_base).size() > 0:
+                total_volume = deref(cumulative_base).back()
+        elif is_buy:
+            ask_it = self._ask_book.begin()
+            while ask_it != self._ask_book.end():
+                entry = deref(ask_it)
+                if total_volume + entry.getAmount() >= volume:
                     incremental_amount = volume - total_volume
-                    total_cost += incremental_amount * order_book_row.price
+                    total_cost += incremental_amount * entry.getPrice()
                     total_volume += incremental_amount
                     result_vwap = total_cost / total_volume
                     break
+                total_cost += entry.getAmount() * entry.getPrice()
+                total_volume += entry.getAmount()
+                inc(ask_it)
         else:
-            for order_book_row in self.bid_entries():
-                total_cost += order_book_row.amount * order_book_row.price
-                total_volume += order_book_row.amount
-                if total_volume >= volume:
-                    total_cost -= order_book_row.amount * order_book_row.price
-                    total_volume -= order_book_row.amount
+            bid_it = self._bid_book.rbegin()
+            while bid_it != self._bid_book.rend():
+                entry = deref(bid_it)
+                if total_volume + entry.getAmount() >= volume:
                     incremental_amount = volume - total_volume
-                    total_cost += incremental_amount * order_book_row.price
+                    total_cost += incremental_amount * entry.getPrice()
                     total_volume += incremental_amount
                     result_vwap = total_cost / total_volume
                     break
+                total_cost += entry.getAmount() * entry.getPrice()
+                total_volume += entry.getAmount()
+                inc(bid_it)
 
         return OrderBookQueryResult(NaN, volume, result_vwap, min(total_volume, volume))
 
@@ -375,19 +922,42 @@ cdef class OrderBook(PubSub):
         cdef:
             double cumulative_volume = 0
             double result_price = NaN
+            vector[double] *prices
+            vector[double] *cumulative_quote
+            size_t index
+            set[OrderBookEntry].iterator ask_it
+            set[OrderBookEntry].reverse_iterator bid_it
+            OrderBookEntry entry
 
-        if is_buy:
-            for order_book_row in self.ask_entries():
-                cumulative_volume += order_book_row.amount * order_book_row.price
+        if self._depth_index_enabled:
+            self.c_ensure_depth_index(is_buy)
+            prices = ref(self._ask_depth_prices) if is_buy else ref(self._bid_depth_prices)
+            cumulative_quote = (ref(self._ask_depth_cumulative_quote) if is_buy
+                                else ref(self._bid_depth_cumulative_quote))
+            index = _index_reaching_cumulative(cumulative_quote, quote_volume)
+            if index < deref(cumulative_quote).size():
+                cumulative_volume = deref(cumulative_quote)[index]
+                result_price = deref(prices)[index]
+            elif deref(cumulative_quote).size() > 0:
+                cumulative_volume = deref(cumulative_quote).back()
+        elif is_buy:
+            ask_it = self._ask_book.begin()
+            while ask_it != self._ask_book.end():
+                entry = deref(ask_it)
+                cumulative_volume += entry.getAmount() * entry.getPrice()
                 if cumulative_volume >= quote_volume:
-                    result_price = order_book_row.price
+                    result_price = entry.getPrice()
                     break
+                inc(ask_it)
         else:
-            for order_book_row in self.bid_entries():
-                cumulative_volume += order_book_row.amount * order_book_row.price
+            bid_it = self._bid_book.rbegin()
+            while bid_it != self._bid_book.rend():
+                entry = deref(bid_it)
+                cumulative_volume += entry.getAmount() * entry.getPrice()
                 if cumulative_volume >= quote_volume:
-                    result_price = order_book_row.price
+                    result_price = entry.getPrice()
                     break
+                inc(bid_it)
 
         return OrderBookQueryResult(NaN, quote_volume, result_price, min(cumulative_volume, quote_volume))
 
@@ -396,25 +966,52 @@ cdef class OrderBook(PubSub):
             double cumulative_volume = 0
             double cumulative_base_amount = 0
             double row_amount = 0
+            vector[double] *prices
+            vector[double] *cumulative_base
+            vector[double] *cumulative_quote
+            size_t index
+            set[OrderBookEntry].iterator ask_it
+            set[OrderBookEntry].reverse_iterator bid_it
+            OrderBookEntry entry
 
-        if is_buy:
-            for order_book_row in self.ask_entries():
-                row_amount = order_book_row.amount
+        if self._depth_index_enabled:
+            self.c_ensure_depth_index(is_buy)
+            prices = ref(self._ask_depth_prices) if is_buy else ref(self._bid_depth_prices)
+            cumulative_base = ref(self._ask_depth_cumulative_base) if is_buy else ref(self._bid_depth_cumulative_base)
+            cumulative_quote = (ref(self._ask_depth_cumulative_quote) if is_buy
+                                else ref(self._bid_depth_cumulative_quote))
+            index = _index_reaching_cumulative(cumulative_base, base_amount)
+            if index < deref(cumulative_base).size():
+                if index > 0:
+                    cumulative_volume = deref(cumulative_quote)[index - 1]
+                    cumulative_base_amount = deref(cumulative_base)[index - 1]
+                cumulative_volume += (base_amount - cumulative_base_amount) * deref(prices)[index]
+            elif deref(cumulative_quote).size() > 0:
+                cumulative_volume = deref(cumulative_quote).back()
+        elif is_buy:
+            ask_it = self._ask_book.begin()
+            while ask_it != self._ask_book.end():
+                entry = deref(ask_it)
+                row_amount = entry.getAmount()
                 if row_amount + cumulative_base_amount >= base_amount:
                     row_amount = base_amount - cumulative_base_amount
                 cumulative_base_amount += row_amount
-                cumulative_volume += row_amount * order_book_row.price
+                cumulative_volume += row_amount * entry.getPrice()
                 if cumulative_base_amount >= base_amount:
                     break
+                inc(ask_it)
         else:
-            for order_book_row in self.bid_entries():
-                row_amount = order_book_row.amount
+            bid_it = self._bid_book.rbegin()
+            while bid_it != self._bid_book.rend():
+                entry = deref(bid_it)
+                row_amount = entry.getAmount()
                 if row_amount + cumulative_base_amount >= base_amount:
                     row_amount = base_amount - cumulative_base_amount
                 cumulative_base_amount += row_amount
-                cumulative_volume += row_amount * order_book_row.price
+                cumulative_volume += row_amount * entry.getPrice()
                 if cumulative_base_amount >= base_amount:
                     break
+                inc(bid_it)
 
         return OrderBookQueryResult(NaN, base_amount, NaN, cumulative_volume)
 
@@ -422,19 +1019,39 @@ cdef class OrderBook(PubSub):
         cdef:
             double cumulative_volume = 0
             double result_price = NaN
+            vector[double] *prices
+            vector[double] *cumulative_base
+            size_t levels
+            set[OrderBookEntry].iterator ask_it
+            set[OrderBookEntry].reverse_iterator bid_it
+            OrderBookEntry entry
 
-        if is_buy:
-            for order_book_row in self.ask_entries():
-                if order_book_row.price > price:
+        if self._depth_index_enabled:
+            self.c_ensure_depth_index(is_buy)
+            prices = ref(self._ask_depth_prices) if is_buy else ref(self._bid_depth_prices)
+            cumulative_base = ref(self._ask_depth_cumulative_base) if is_buy else ref(self._bid_depth_cumulative_base)
+            levels = _levels_within_price(prices, price, is_buy)
+            if levels > 0:
+                cumulative_volume = deref(cumulative_base)[levels - 1]
+                result_price = deref(prices)[levels - 1]
+        elif is_buy:
+            ask_it = self._ask_book.begin()
+            while ask_it != self._ask_book.end():
+                entry = deref(ask_it)
+                if entry.getPrice() > price:
                     break
-                cumulative_volume += order_book_row.amount
-                result_price = order_book_row.price
+                cumulative_volume += entry.getAmount()
+                result_price = entry.getPrice()
+                inc(ask_it)
         else:
-            for order_book_row in self.bid_entries():
-                if order_book_row.price < price:
+            bid_it = self._bid_book.rbegin()
+            while bid_it != self._bid_book.rend():
+                entry = deref(bid_it)
+                if entry.getPrice() < price:
                     break
-                cumulative_volume += order_book_row.amount
-                result_price = order_book_row.price
+                cumulative_volume += entry.getAmount()
+                result_price = entry.getPrice()
+                inc(bid_it)
 
         return OrderBookQueryResult(price, NaN, result_price, cumulative_volume)
 
@@ -442,19 +1059,40 @@ cdef class OrderBook(PubSub):
         cdef:
             double cumulative_volume = 0
             double result_price = NaN
+            vector[double] *prices
+            vector[double] *cumulative_quote
+            size_t levels
+            set[OrderBookEntry].iterator ask_it
+            set[OrderBookEntry].reverse_iterator bid_it
+            OrderBookEntry entry
 
-        if is_buy:
-            for order_book_row in self.ask_entries():
-                if order_book_row.price > price:
+        if self._depth_index_enabled:
+            self.c_ensure_depth_index(is_buy)
+            prices = ref(self._ask_depth_prices) if is_buy else ref(self._bid_depth_prices)
+            cumulative_quote = (ref(self._ask_depth_cumulative_quote) if is_buy
+                                else ref(self._bid_depth_cumulative_quote))
+            levels = _levels_within_price(prices, price, is_buy)
+            if levels > 0:
+                cumulative_volume = deref(cumulative_quote)[levels - 1]
+                result_price = deref(prices)[levels - 1]
+        elif is_buy:
+            ask_it = self._ask_book.begin()
+            while ask_it != self._ask_book.end():
+                entry = deref(ask_it)
+                if entry.getPrice() > price:
                     break
-                cumulative_volume += order_book_row.amount * order_book_row.price
-                result_price = order_book_row.price
+                cumulative_volume += entry.getAmount() * entry.getPrice()
+                result_price = entry.getPrice()
+                inc(ask_it)
         else:
-            for order_book_row in self.bid_entries():
-                if order_book_row.price < price:
+            bid_it = self._bid_book.rbegin()
+            while bid_it != self._bid_book.rend():
+                entry = deref(bid_it)
+                if entry.getPrice() < price:
                     break
-                cumulative_volume += order_book_row.amount * order_book_row.price
-                result_price = order_book_row.price
+                cumulative_volume += entry.getAmount() * entry.getPrice()
+                result_price = entry.getPrice()
+                inc(bid_it)
 
         return OrderBookQueryResult(price, NaN, result_price, cumulative_volume)
 
@@ -487,6 +1125,6 @@ cdef class OrderBook(PubSub):
     def restore_from_snapshot_and_diffs(self, snapshot: OrderBookMessage, diffs: List[OrderBookMessage]):
         replay_position = bisect.bisect_right(diffs, snapshot)
         replay_diffs = diffs[replay_position:]
-        self.apply_snapshot(snapshot.bids, snapshot.asks, snapshot.update_id)
+        self.apply_snapshot_message(snapshot)
         for diff in replay_diffs:
-            self.apply_diffs(diff.bids, diff.asks, diff.update_id)
+            self.apply_diff_message(diff)
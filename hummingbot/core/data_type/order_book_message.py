@@ -1,7 +1,9 @@
 from collections import namedtuple
 from enum import Enum
 from functools import total_ordering
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 
 from hummingbot.core.data_type.order_book_row import OrderBookRow
 
@@ -17,6 +19,10 @@ class OrderBookMessage(namedtuple("_OrderBookMessage", "type, content, timestamp
     type: OrderBookMessageType
     content: Dict[str, any]
     timestamp: float
+    # Event time reported by the exchange and local reception time of the websocket frame, set on the instances that
+    # have them to measure the market data latency
+    exchange_timestamp: Optional[float] = None
+    receive_timestamp: Optional[float] = None
 
     def __new__(
         cls,
@@ -64,6 +70,23 @@ class OrderBookMessage(namedtuple("_OrderBookMessage", "type, content, timestamp
             OrderBookRow(float(price), float(amount), self.update_id) for price, amount, *trash in self.content["bids"]
         ]
 
+    @property
+    def has_raw_levels(self) -> bool:
+        """
+        Indicates if the bids and asks in the content are raw [price, amount, ...] levels that the order book can
+        parse directly. Subclasses that override how bids and asks are parsed don't provide raw levels.
+        """
+        return (
+            type(self).bids is OrderBookMessage.bids
+            and type(self).asks is OrderBookMessage.asks
+            and "bids" in self.content
+            and "asks" in self.content
+        )
+
+    @property
+    def has_level_arrays(self) -> bool:
+        return False
+
     @property
     def has_update_id(self) -> bool:
         return self.type in {OrderBookMessageType.DIFF, OrderBookMessageType.SNAPSHOT}
@@ -95,3 +118,126 @@ class OrderBookMessage(namedtuple("_OrderBookMessage", "type, content, timestamp
             )
         )
         return eq
+
+
+def _levels_to_array(levels: List[List[Any]]) -> np.ndarray:
+    """
+    Converts raw [price, amount, ...] levels into a (n, 2) float64 array of prices and amounts
+    """
+    if len(levels) == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    try:
+        array = np.array(levels, dtype=np.float64)
+        if array.ndim == 2 and array.shape[1] >= 2:
+            return np.ascontiguousarray(array[:, :2])
+    except (TypeError, ValueError):
+        pass
+    # Levels with a varying number of fields or non numeric extra fields
+    return np.array([[float(level[0]), float(level[1])] for level in levels], dtype=np.float64)
+
+
+@total_ordering
+class CompactOrderBookMessage:
+    """
+    Slotted alternative to OrderBookMessage for messages with raw [price, amount, ...] levels.
+    The update ids and trading pair are read once when the message is created, and the levels are kept aside from the
+    content and parsed into float64 arrays the first time they are needed, releasing the raw lists.
+    """
+    __slots__ = (
+        "type",
+        "content",
+        "timestamp",
+        "update_id",
+        "first_update_id",
+        "trading_pair",
+        "_raw_bids",
+        "_raw_asks",
+        "_bids_array",
+        "_asks_array",
+        "exchange_timestamp",
+        "receive_timestamp",
+    )
+
+    def __init__(
+        self,
+        message_type: OrderBookMessageType,
+        content: Dict[str, any],
+        timestamp: Optional[float] = None,
+    ):
+        self.type: OrderBookMessageType = message_type
+        self.content: Dict[str, any] = {key: value for key, value in content.items() if key not in ("bids", "asks")}
+        self.timestamp: Optional[float] = timestamp
+        self.trading_pair: Optional[str] = content.get("trading_pair")
+        self.update_id: int = -1
+        self.first_update_id: int = -1
+        if message_type in (OrderBookMessageType.DIFF, OrderBookMessageType.SNAPSHOT):
+            self.update_id = content["update_id"]
+        if message_type is OrderBookMessageType.DIFF:
+            self.first_update_id = content.get("first_update_id", self.update_id)
+        self._raw_bids: Optional[List[List[Any]]] = content.get("bids", [])
+        self._raw_asks: Optional[List[List[Any]]] = content.get("asks", [])
+        self._bids_array: Optional[np.ndarray] = None
+        self._asks_array: Optional[np.ndarray] = None
+        self.exchange_timestamp: Optional[float] = None
+        self.receive_timestamp: Optional[float] = None
+
+    @classmethod
+    def from_message(cls, message: OrderBookMessage) -> "CompactOrderBookMessage":
+        compact_message = cls(message.type, message.content, message.timestamp)
+        compact_message.exchange_timestamp = message.exchange_timestamp
+        compact_message.receive_timestamp = message.receive_timestamp
+        return compact_message
+
+    @property
+    def bids_array(self) -> np.ndarray:
+        if self._bids_array is None:
+            self._bids_array = _levels_to_array(self._raw_bids)
+            self._raw_bids = None
+        return self._bids_array
+
+    @property
+    def asks_array(self) -> np.ndarray:
+        if self._asks_array is None:
+            self._asks_array = _levels_to_array(self._raw_asks)
+            self._raw_asks = None
+        return self._asks_array
+
+    @property
+    def bids(self) -> List[OrderBookRow]:
+        return [OrderBookRow(price, amount, self.update_id) for price, amount in self.bids_array.tolist()]
+
+    @property
+    def asks(self) -> List[OrderBookRow]:
+        return [OrderBookRow(price, amount, self.update_id) for price, amount in self.asks_array.tolist()]
+
+    @property
+    def trade_id(self) -> int:
+        if self.type is OrderBookMessageType.TRADE:
+            return self.content["trade_id"]
+        return -1
+
+    @property
+    def has_raw_levels(self) -> bool:
+        return False
+
+    @property
+    def has_level_arrays(self) -> bool:
+        return self.type in (OrderBookMessageType.DIFF, OrderBookMessageType.SNAPSHOT)
+
+    @property
+    def has_update_id(self) -> bool:
+        return self.type in {OrderBookMessageType.DIFF, OrderBookMessageType.SNAPSHOT}
+
+    @property
+    def has_trade_id(self) -> bool:
+        return self.type == OrderBookMessageType.TRADE
+
+    __eq__ = OrderBookMessage.__eq__
+    __lt__ = OrderBookMessage.__lt__
+
+    def __hash__(self):
+        return hash((self.type, self.update_id, self.trade_id))
+
+    def __repr__(self) -> str:
+        return (f"CompactOrderBookMessage(type={self.type}, content={self.content}, timestamp={self.timestamp}, "
+                f"update_id={self.update_id})")
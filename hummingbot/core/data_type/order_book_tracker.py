@@ -3,16 +3,24 @@ import logging
 import time
 from collections import defaultdict, deque
 from enum import Enum
-from typing import Deque, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
 
 import pandas as pd
 
 from hummingbot.core.data_type.common import TradeType
 from hummingbot.core.data_type.order_book import OrderBook
-from hummingbot.core.data_type.order_book_message import OrderBookMessage, OrderBookMessageType
-from hummingbot.core.data_type.order_book_tracker_data_source import OrderBookTrackerDataSource
+from hummingbot.core.data_type.order_book_message import (
+    CompactOrderBookMessage,
+    OrderBookMessage,
+    OrderBookMessageType,
+)
+from hummingbot.core.data_type.order_book_tracker_data_source import (
+    OrderBookMessageDispatcher,
+    OrderBookTrackerDataSource,
+)
 from hummingbot.core.event.events import OrderBookTradeEvent
-from hummingbot.core.utils.async_utils import safe_ensure_future
+from hummingbot.core.utils.async_utils import safe_ensure_future, safe_gather
+from hummingbot.core.utils.latency_histogram import MarketDataLatency
 from hummingbot.logger import HummingbotLogger
 
 
@@ -23,6 +31,17 @@ class OrderBookTrackerDataSourceType(Enum):
 
 class OrderBookTracker:
     PAST_DIFF_WINDOW_SIZE: int = 32
+    COMPACT_MESSAGES: bool = True
+    RESYNC_RETRY_INTERVAL: float = 1.0
+    ORDER_BOOK_INIT_CONCURRENCY: int = 10
+    ORDER_BOOK_INIT_RETRY_INTERVAL: float = 5.0
+    # Levels kept on each side of the order books by default (0 keeps all of them)
+    MAX_DEPTH_LEVELS: int = 0
+    # Diffs queued for a trading pair above which they are merged and applied at once (0 disables the coalescing)
+    COALESCE_DIFFS_THRESHOLD: int = 0
+    RESYNC_LATENCY_WINDOW_SIZE: int = 100
+    # Hands the parsed websocket messages straight to the order books instead of routing them through queues
+    DIRECT_DISPATCH: bool = False
     _obt_logger: Optional[HummingbotLogger] = None
 
     @classmethod
@@ -36,6 +55,20 @@ class OrderBookTracker:
         self._data_source: OrderBookTrackerDataSource = data_source
         self._trading_pairs: List[str] = trading_pairs
         self._order_books_initialized: asyncio.Event = asyncio.Event()
+        self._order_book_ready_events: Dict[str, asyncio.Event] = defaultdict(asyncio.Event)
+        self._default_max_depth_levels: int = self.MAX_DEPTH_LEVELS
+        self._max_depth_levels: Dict[str, int] = {}
+        self._coalesce_diffs_threshold: int = self.COALESCE_DIFFS_THRESHOLD
+        self._direct_dispatch: bool = self.DIRECT_DISPATCH
+        # Messages received in direct dispatch mode while the order book of their trading pair is being resynced
+        self._direct_pending_messages: Dict[str, Deque[OrderBookMessage]] = {}
+        self._resync_tasks: Dict[str, asyncio.Task] = {}
+        # Snapshot requests of the trading pairs whose streams were interrupted by a websocket reconnection
+        self._reconnect_resync_tasks: Dict[str, asyncio.Task] = {}
+        # Diff messages applied, and batches of coalesced diffs they were applied in
+        self._coalesced_diff_count: Dict[str, int] = defaultdict(int)
+        self._diff_batch_count: Dict[str, int] = defaultdict(int)
+        self._max_queue_depths: Dict[str, int] = defaultdict(int)
         self._tracking_tasks: Dict[str, asyncio.Task] = {}
         self._order_books: Dict[str, OrderBook] = {}
         self._tracking_message_queues: Dict[str, asyncio.Queue] = {}
@@ -45,6 +78,10 @@ class OrderBookTracker:
         self._order_book_trade_stream: asyncio.Queue = asyncio.Queue()
         self._ev_loop: asyncio.BaseEventLoop = asyncio.get_event_loop()
         self._saved_message_queues: Dict[str, Deque[OrderBookMessage]] = defaultdict(lambda: deque(maxlen=1000))
+        self._sequence_gaps: Dict[str, int] = defaultdict(int)
+        self._resync_latencies: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=self.RESYNC_LATENCY_WINDOW_SIZE))
+        self._market_data_latencies: Dict[str, MarketDataLatency] = defaultdict(MarketDataLatency)
 
         self._emit_trade_event_task: Optional[asyncio.Task] = None
         self._init_order_books_task: Optional[asyncio.Task] = None
@@ -68,6 +105,108 @@ class OrderBookTracker:
     def ready(self) -> bool:
         return self._order_books_initialized.is_set()
 
+    @property
+    def ready_trading_pairs(self) -> List[str]:
+        """
+        Trading pairs whose order book is already initialized and tracked, available before all order books are ready
+        """
+        return [trading_pair for trading_pair in self._trading_pairs if self.is_order_book_ready(trading_pair)]
+
+    def is_order_book_ready(self, trading_pair: str) -> bool:
+        return trading_pair in self._order_book_ready_events and self._order_book_ready_events[trading_pair].is_set()
+
+    async def wait_for_order_book(self, trading_pair: str) -> OrderBook:
+        """
+        Waits until the order book of the trading pair is initialized and returns it
+        """
+        await self._order_book_ready_events[trading_pair].wait()
+        return self._order_books[trading_pair]
+
+    @property
+    def coalesce_diffs_threshold(self) -> int:
+        return self._coalesce_diffs_threshold
+
+    @coalesce_diffs_threshold.setter
+    def coalesce_diffs_threshold(self, value: int):
+        """
+        When more diffs than this are queued for a trading pair, they are merged into a single net diff (the last
+        amount for each price wins) and applied at once. 0 applies every diff on its own.
+        """
+        self._coalesce_diffs_threshold = value
+
+    @property
+    def direct_dispatch(self) -> bool:
+        return self._direct_dispatch
+
+    @direct_dispatch.setter
+    def direct_dispatch(self, value: bool):
+        """
+        In direct dispatch mode, the data source parses each diff, snapshot and trade frame as soon as it is received
+        and the message is applied to its order book right away, skipping the channel queue, the tracker streams, the
+        routers and the tracking queues. The messages received before an order book is initialized are saved and
+        applied once it is, and the diffs received during a resync are buffered until it completes, as in queued mode.
+        It requires a data source processing its websocket messages with _process_websocket_messages, and takes effect
+        on the next start.
+        """
+        self._direct_dispatch = value
+
+    @property
+    def redundant_connections(self) -> int:
+        return self._data_source.redundant_connections
+
+    @redundant_connections.setter
+    def redundant_connections(self, value: int):
+        """
+        Number of simultaneous websocket connections subscribed to the streams of every trading pair. Only the first
+        copy of each message is applied to the order books, see OrderBookTrackerDataSource.set_redundant_connections.
+        Takes effect on the next start.
+        """
+        self._data_source.set_redundant_connections(value)
+
+    @property
+    def redundant_connection_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        How often each redundant connection delivered a message first, None without redundant connections
+        """
+        return self._data_source.redundant_connection_stats
+
+    @property
+    def diff_queue_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Current and maximum number of messages waiting in the tracking queue of each trading pair, with the number of
+        diffs applied and the average number of diffs merged per order book update (1 when nothing is coalesced)
+        """
+        return {
+            trading_pair: {
+                "queue_depth": message_queue.qsize(),
+                "max_queue_depth": self._max_queue_depths[trading_pair],
+                "diffs_applied": self._coalesced_diff_count[trading_pair],
+                "coalescing_ratio": (self._coalesced_diff_count[trading_pair] / self._diff_batch_count[trading_pair]
+                                     if self._diff_batch_count[trading_pair] > 0 else 1.0),
+            }
+            for trading_pair, message_queue in self._tracking_message_queues.items()
+        }
+
+    def get_max_depth_levels(self, trading_pair: str) -> int:
+        return self._max_depth_levels.get(trading_pair, self._default_max_depth_levels)
+
+    def set_max_depth_levels(self, max_depth_levels: int, trading_pair: Optional[str] = None):
+        """
+        Limits the levels kept on each side of the order books to the max_depth_levels closest to the mid price.
+        Applies to a single trading pair, or when no trading pair is given, to all the ones without their own limit.
+
+        :param max_depth_levels: the maximum number of levels per side, 0 keeps all of them
+        :param trading_pair: the trading pair the limit applies to
+        """
+        if trading_pair is None:
+            self._default_max_depth_levels = max_depth_levels
+            trading_pairs = [pair for pair in self._order_books if pair not in self._max_depth_levels]
+        else:
+            self._max_depth_levels[trading_pair] = max_depth_levels
+            trading_pairs = [trading_pair] if trading_pair in self._order_books else []
+        for pair in trading_pairs:
+            self._order_books[pair].max_depth_levels = max_depth_levels
+
     @property
     def snapshot(self) -> Dict[str, Tuple[pd.DataFrame, pd.DataFrame]]:
         return {
@@ -75,11 +214,42 @@ class OrderBookTracker:
             for trading_pair, order_book in self._order_books.items()
         }
 
+    @property
+    def sequence_gaps(self) -> Dict[str, int]:
+        """
+        Number of gaps detected in the sequence of diffs of each trading pair
+        """
+        return dict(self._sequence_gaps)
+
+    @property
+    def resync_latencies(self) -> Dict[str, List[float]]:
+        """
+        Seconds taken by the most recent resyncs of each trading pair, from the gap detection until the order book
+        was restored
+        """
+        return {trading_pair: list(latencies) for trading_pair, latencies in self._resync_latencies.items()}
+
+    @property
+    def market_data_latencies(self) -> Dict[str, MarketDataLatency]:
+        """
+        Latency histograms of the websocket messages applied to the order book of each trading pair, from the exchange
+        event time to the reception of the frame and from the reception to the application to the order book
+        """
+        return dict(self._market_data_latencies)
+
+    def reset_market_data_latencies(self):
+        for latency in self._market_data_latencies.values():
+            latency.reset()
+
     def start(self):
         self.stop()
         self._init_order_books_task = safe_ensure_future(
             self._init_order_books()
         )
+        self._data_source.set_streams_reconnected_callback(self._on_streams_reconnected)
+        if self._direct_dispatch:
+            self._start_direct_dispatch()
+            return
         self._emit_trade_event_task = safe_ensure_future(
             self._emit_trade_event_loop()
         )
@@ -133,11 +303,21 @@ class OrderBookTracker:
             self._update_last_trade_prices_task = None
         if self._order_book_stream_listener_task is not None:
             self._order_book_stream_listener_task.cancel()
+        if self._direct_dispatch:
+            self._data_source.set_message_dispatchers(None, None, None)
+        self._data_source.set_streams_reconnected_callback(None)
+        for task in list(self._resync_tasks.values()) + list(self._reconnect_resync_tasks.values()):
+            task.cancel()
+        self._resync_tasks.clear()
+        self._reconnect_resync_tasks.clear()
+        self._direct_pending_messages.clear()
         if len(self._tracking_tasks) > 0:
             for _, task in self._tracking_tasks.items():
                 task.cancel()
             self._tracking_tasks.clear()
         self._order_books_initialized.clear()
+        for ready_event in self._order_book_ready_events.values():
+            ready_event.clear()
 
     async def _update_last_trade_prices_loop(self):
         '''
@@ -171,16 +351,53 @@ class OrderBookTracker:
 
     async def _init_order_books(self):
         """
-        Initialize order books
+        Initialize order books, requesting the snapshots of up to ORDER_BOOK_INIT_CONCURRENCY trading pairs at a time.
+        The requests are paced by the data source throttler, the diffs received meanwhile are saved until each order
+        book is ready, and every order book starts being tracked as soon as its own snapshot is applied.
         """
-        for index, trading_pair in enumerate(self._trading_pairs):
-            self._order_books[trading_pair] = await self._initial_order_book_for_trading_pair(trading_pair)
+        initialization_semaphore: asyncio.Semaphore = asyncio.Semaphore(self.ORDER_BOOK_INIT_CONCURRENCY)
+        await safe_gather(*[self._init_order_book(trading_pair, initialization_semaphore)
+                            for trading_pair in self._trading_pairs])
+        self._order_books_initialized.set()
+
+    async def _init_order_book(self, trading_pair: str, initialization_semaphore: asyncio.Semaphore):
+        while True:
+            try:
+                async with initialization_semaphore:
+                    order_book: OrderBook = await self._initial_order_book_for_trading_pair(trading_pair)
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.logger().network(
+                    f"Unexpected error initializing order book for {trading_pair}.",
+                    exc_info=True,
+                    app_warning_msg=f"Unexpected error initializing order book for {trading_pair}. "
+                                    f"Retrying after {self.ORDER_BOOK_INIT_RETRY_INTERVAL} seconds."
+                )
+                await self._sleep(self.ORDER_BOOK_INIT_RETRY_INTERVAL)
+
+        order_book.max_depth_levels = self.get_max_depth_levels(trading_pair)
+        self._order_books[trading_pair] = order_book
+        if self._direct_dispatch:
+            saved_messages: Deque[OrderBookMessage] = self._saved_message_queues[trading_pair]
+            while len(saved_messages) > 0:
+                self._process_direct_message(trading_pair, saved_messages.popleft())
+        else:
             self._tracking_message_queues[trading_pair] = asyncio.Queue()
             self._tracking_tasks[trading_pair] = safe_ensure_future(self._track_single_book(trading_pair))
-            self.logger().info(f"Initialized order book for {trading_pair}. "
-                               f"{index + 1}/{len(self._trading_pairs)} completed.")
-            await asyncio.sleep(1)
-        self._order_books_initialized.set()
+        self._order_book_ready_events[trading_pair].set()
+        self.logger().info(f"Initialized order book for {trading_pair}. "
+                           f"{len(self.ready_trading_pairs)}/{len(self._trading_pairs)} completed.")
+
+    def _compact_message(self, message: OrderBookMessage) -> OrderBookMessage:
+        """
+        Converts diffs and snapshots carrying raw levels to CompactOrderBookMessage, so that the messages kept in the
+        saved messages queues and the past diffs windows are parsed only once and use less memory.
+        """
+        if self.COMPACT_MESSAGES and message.has_raw_levels:
+            return CompactOrderBookMessage.from_message(message)
+        return message
 
     async def _order_book_diff_router(self):
         """
@@ -193,7 +410,7 @@ class OrderBookTracker:
 
         while True:
             try:
-                ob_message: OrderBookMessage = await self._order_book_diff_stream.get()
+                ob_message: OrderBookMessage = self._compact_message(await self._order_book_diff_stream.get())
                 trading_pair: str = ob_message.trading_pair
 
                 if trading_pair not in self._tracking_message_queues:
@@ -238,7 +455,7 @@ class OrderBookTracker:
         await self._order_books_initialized.wait()
         while True:
             try:
-                ob_message: OrderBookMessage = await self._order_book_snapshot_stream.get()
+                ob_message: OrderBookMessage = self._compact_message(await self._order_book_snapshot_stream.get())
                 trading_pair: str = ob_message.trading_pair
                 if trading_pair not in self._tracking_message_queues:
                     continue
@@ -257,31 +474,50 @@ class OrderBookTracker:
         order_book: OrderBook = self._order_books[trading_pair]
         last_message_timestamp: float = time.time()
         diff_messages_accepted: int = 0
+        # Messages taken from the tracking queue that still have to be processed, ahead of the queued ones
+        pending_messages: Deque[OrderBookMessage] = deque()
 
         while True:
             try:
                 saved_messages: Deque[OrderBookMessage] = self._saved_message_queues[trading_pair]
 
                 # Process saved messages first if there are any
-                if len(saved_messages) > 0:
+                if len(pending_messages) > 0:
+                    message = pending_messages.popleft()
+                elif len(saved_messages) > 0:
                     message = saved_messages.popleft()
                 else:
                     message = await message_queue.get()
+                    queue_depth: int = message_queue.qsize()
+                    if queue_depth > self._max_queue_depths[trading_pair]:
+                        self._max_queue_depths[trading_pair] = queue_depth
 
                 if message.type is OrderBookMessageType.DIFF:
-                    order_book.apply_diffs(message.bids, message.asks, message.update_id)
-                    past_diffs_window.append(message)
-                    diff_messages_accepted += 1
+                    diffs: List[OrderBookMessage] = [message]
+                    if (0 < self._coalesce_diffs_threshold < message_queue.qsize()
+                            and len(pending_messages) == 0 and len(saved_messages) == 0):
+                        self._dequeue_diffs(message_queue, diffs, pending_messages)
+                    applicable_diffs, gap_diffs = self._split_at_sequence_gap(order_book, diffs)
+
+                    self._apply_diffs(trading_pair, order_book, applicable_diffs)
+                    diff_messages_accepted += len(applicable_diffs)
+                    if len(gap_diffs) > 0:
+                        await self._resync_order_book(trading_pair, gap_diffs[0])
+                        pending_messages.extendleft(reversed(gap_diffs[1:]))
+                    elif order_book.trimmed_depth_exhausted:
+                        await self._resync_order_book(trading_pair)
 
                     # Output some statistics periodically.
                     now: float = time.time()
                     if int(now / 60.0) > int(last_message_timestamp / 60.0):
-                        self.logger().debug(f"Processed {diff_messages_accepted} order book diffs for {trading_pair}.")
+                        self.logger().debug(f"Processed {diff_messages_accepted} order book diffs for {trading_pair}. "
+                                            f"Queued messages: {message_queue.qsize()}.")
                         diff_messages_accepted = 0
                     last_message_timestamp = now
                 elif message.type is OrderBookMessageType.SNAPSHOT:
                     past_diffs: List[OrderBookMessage] = list(past_diffs_window)
                     order_book.restore_from_snapshot_and_diffs(message, past_diffs)
+                    self._record_latencies(trading_pair, (message,))
                     self.logger().debug(f"Processed order book snapshot for {trading_pair}.")
             except asyncio.CancelledError:
                 raise
@@ -293,6 +529,228 @@ class OrderBookTracker:
                 )
                 await asyncio.sleep(5.0)
 
+    def _apply_diffs(self, trading_pair: str, order_book: OrderBook, diffs: List[OrderBookMessage]):
+        if len(diffs) == 1:
+            order_book.apply_diff_message(diffs[0])
+        elif len(diffs) > 1:
+            order_book.apply_diff_messages(diffs)
+        if len(diffs) > 0:
+            self._past_diffs_windows[trading_pair].extend(diffs)
+            self._coalesced_diff_count[trading_pair] += len(diffs)
+            self._diff_batch_count[trading_pair] += 1
+            self._record_latencies(trading_pair, diffs)
+
+    def _record_latencies(self, trading_pair: str, messages: Iterable[OrderBookMessage]):
+        apply_timestamp: float = time.time()
+        latency: MarketDataLatency = self._market_data_latencies[trading_pair]
+        for message in messages:
+            latency.record(message.receive_timestamp, message.exchange_timestamp, apply_timestamp)
+
+    def _start_direct_dispatch(self):
+        self._data_source.set_message_dispatchers(
+            diff_dispatcher=OrderBookMessageDispatcher(self._dispatch_diff_message),
+            snapshot_dispatcher=OrderBookMessageDispatcher(self._dispatch_snapshot_message),
+            trade_dispatcher=OrderBookMessageDispatcher(self._dispatch_trade_message),
+        )
+        # Still run to request the periodic full order book snapshots, which are dispatched like the websocket ones
+        self._order_book_snapshot_listener_task = safe_ensure_future(
+            self._data_source.listen_for_order_book_snapshots(
+                self._ev_loop, OrderBookMessageDispatcher(self._dispatch_snapshot_message))
+        )
+        self._order_book_stream_listener_task = safe_ensure_future(
+            self._data_source.listen_for_subscriptions()
+        )
+        self._update_last_trade_prices_task = safe_ensure_future(
+            self._update_last_trade_prices_loop()
+        )
+
+    def _dispatch_diff_message(self, message: OrderBookMessage):
+        message = self._compact_message(message)
+        trading_pair: str = message.trading_pair
+        order_book: Optional[OrderBook] = self._order_books.get(trading_pair)
+        if order_book is None:
+            # Save diff messages received before snapshots are ready
+            self._saved_message_queues[trading_pair].append(message)
+        elif order_book.snapshot_uid <= message.update_id:
+            self._process_direct_message(trading_pair, message)
+
+    def _dispatch_snapshot_message(self, message: OrderBookMessage):
+        message = self._compact_message(message)
+        trading_pair: str = message.trading_pair
+        if trading_pair in self._order_books:
+            self._process_direct_message(trading_pair, message)
+        elif trading_pair in self._trading_pairs:
+            # Kept to be applied after the saved diffs received before it, once the order book is initialized
+            self._saved_message_queues[trading_pair].append(message)
+
+    def _dispatch_trade_message(self, message: OrderBookMessage):
+        order_book: Optional[OrderBook] = self._order_books.get(message.trading_pair)
+        if order_book is not None:
+            order_book.apply_trade(self._trade_event_from_message(message))
+            self._record_latencies(message.trading_pair, (message,))
+
+    def _process_direct_message(self, trading_pair: str, message: OrderBookMessage):
+        pending_messages: Optional[Deque[OrderBookMessage]] = self._direct_pending_messages.get(trading_pair)
+        if pending_messages is not None:
+            # The order book is being resynced, the message is applied once the resync completes
+            pending_messages.append(message)
+            return
+        order_book: OrderBook = self._order_books[trading_pair]
+        if message.type is OrderBookMessageType.DIFF:
+            applicable_diffs, gap_diffs = self._split_at_sequence_gap(order_book, [message])
+            self._apply_diffs(trading_pair, order_book, applicable_diffs)
+            if len(gap_diffs) > 0 or order_book.trimmed_depth_exhausted:
+                self._direct_pending_messages[trading_pair] = deque()
+                self._resync_tasks[trading_pair] = safe_ensure_future(
+                    self._resync_direct_order_book(trading_pair, gap_diffs[0] if len(gap_diffs) > 0 else None))
+        elif message.type is OrderBookMessageType.SNAPSHOT:
+            order_book.restore_from_snapshot_and_diffs(message, list(self._past_diffs_windows[trading_pair]))
+            self._record_latencies(trading_pair, (message,))
+
+    async def _resync_direct_order_book(self, trading_pair: str, gap_message: Optional[OrderBookMessage]):
+        try:
+            await self._resync_order_book(trading_pair, gap_message)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.logger().network(
+                f"Unexpected error resyncing the order book for {trading_pair}.",
+                exc_info=True,
+                app_warning_msg=f"Unexpected error resyncing the order book for {trading_pair}."
+            )
+        finally:
+            self._resync_tasks.pop(trading_pair, None)
+        pending_messages: Deque[OrderBookMessage] = self._direct_pending_messages.pop(trading_pair, deque())
+        # A new gap in the pending messages starts another resync, and the remaining messages are pending again
+        while len(pending_messages) > 0:
+            self._process_direct_message(trading_pair, pending_messages.popleft())
+
+    @staticmethod
+    def _dequeue_diffs(message_queue: asyncio.Queue,
+                       diffs: List[OrderBookMessage],
+                       pending_messages: Deque[OrderBookMessage]):
+        """
+        Takes the diffs waiting in the queue, stopping at the first message of another type, which is kept in the
+        pending messages to be processed next
+        """
+        while not message_queue.empty():
+            message: OrderBookMessage = message_queue.get_nowait()
+            if message.type is OrderBookMessageType.DIFF:
+                diffs.append(message)
+            else:
+                pending_messages.append(message)
+                break
+
+    def _split_at_sequence_gap(
+            self,
+            order_book: OrderBook,
+            diffs: List[OrderBookMessage]) -> Tuple[List[OrderBookMessage], List[OrderBookMessage]]:
+        """
+        Discards the diffs already included in the order book, and splits the rest at the first gap in their sequence
+
+        :return: the diffs that can be applied, and the diffs from the gap on
+        """
+        last_update_id: int = max(order_book.snapshot_uid, order_book.last_diff_uid)
+        applicable_diffs: List[OrderBookMessage] = []
+        for index, diff in enumerate(diffs):
+            if 0 < last_update_id and self._is_sequenced_diff(diff):
+                if diff.update_id <= last_update_id:
+                    continue
+                if last_update_id < diff.first_update_id - 1:
+                    return applicable_diffs, diffs[index:]
+            applicable_diffs.append(diff)
+            last_update_id = diff.update_id
+        return applicable_diffs, []
+
+    @staticmethod
+    def _is_sequenced_diff(message: OrderBookMessage) -> bool:
+        """
+        Only the diffs reporting the first update id they include (besides the last one) can be checked for continuity
+        """
+        return "first_update_id" in message.content
+
+    async def _resync_order_book(self, trading_pair: str, gap_message: Optional[OrderBookMessage] = None):
+        """
+        Restores the order book of a trading pair after a gap in its sequence of diffs, requesting a snapshot that
+        covers the diff after the gap. The diffs received meanwhile are buffered in the tracking queue of the pair and
+        the ones already included in the snapshot are discarded once the tracking continues.
+        Without gap message, the order book is restored because the levels kept after trimming it ran out, from a
+        snapshot at least as recent as the order book.
+        """
+        gap_detected_timestamp: float = time.perf_counter()
+        order_book: OrderBook = self._order_books[trading_pair]
+        last_update_id: int = max(order_book.snapshot_uid, order_book.last_diff_uid)
+        if gap_message is None:
+            min_snapshot_update_id: int = last_update_id
+            self.logger().info(f"The trimmed order book of {trading_pair} ran out of levels (last update id "
+                               f"{last_update_id}). Resyncing the order book.")
+        else:
+            min_snapshot_update_id: int = gap_message.first_update_id - 1
+            self._sequence_gaps[trading_pair] += 1
+            self.logger().info(f"Gap detected in the order book diffs for {trading_pair} (last update id "
+                               f"{last_update_id}, next diff first update id {gap_message.first_update_id}). "
+                               f"Resyncing the order book.")
+        while True:
+            snapshot: OrderBookMessage = self._compact_message(
+                await self._data_source.get_order_book_snapshot_message(trading_pair))
+            if snapshot.update_id >= min_snapshot_update_id:
+                break
+            await self._sleep(self.RESYNC_RETRY_INTERVAL)
+
+        past_diffs_window = self._past_diffs_windows[trading_pair]
+        past_diffs_window.clear()
+        order_book.apply_snapshot_message(snapshot)
+        if gap_message is not None and gap_message.update_id > snapshot.update_id:
+            order_book.apply_diff_message(gap_message)
+            past_diffs_window.append(gap_message)
+        self._resync_latencies[trading_pair].append(time.perf_counter() - gap_detected_timestamp)
+        self.logger().info(f"Resynced order book for {trading_pair} with snapshot {snapshot.update_id}.")
+
+    def _on_streams_reconnected(self, trading_pairs: List[str]):
+        """
+        Requests a new snapshot for the order books of the trading pairs whose streams were interrupted by a websocket
+        reconnection, since the diffs sent meanwhile are lost. The other order books are not affected.
+        """
+        for trading_pair in trading_pairs:
+            if trading_pair in self._order_books and trading_pair not in self._reconnect_resync_tasks:
+                self._reconnect_resync_tasks[trading_pair] = safe_ensure_future(
+                    self._resync_after_reconnection(trading_pair))
+
+    async def _resync_after_reconnection(self, trading_pair: str):
+        try:
+            snapshot: OrderBookMessage = await self._data_source.get_order_book_snapshot_message(trading_pair)
+            if self._direct_dispatch:
+                self._dispatch_snapshot_message(snapshot)
+            else:
+                self._order_book_snapshot_stream.put_nowait(snapshot)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.logger().network(
+                f"Unexpected error resyncing the order book for {trading_pair} after a reconnection.",
+                exc_info=True,
+                app_warning_msg=f"Unexpected error resyncing the order book for {trading_pair}."
+            )
+        finally:
+            self._reconnect_resync_tasks.pop(trading_pair, None)
+
+    async def _sleep(self, delay: float):
+        """
+        Function added only to facilitate patching the sleep in unit tests without affecting the asyncio module
+        """
+        await asyncio.sleep(delay)
+
+    @staticmethod
+    def _trade_event_from_message(trade_message: OrderBookMessage) -> OrderBookTradeEvent:
+        return OrderBookTradeEvent(
+            trading_pair=trade_message.trading_pair,
+            timestamp=trade_message.timestamp,
+            price=float(trade_message.content["price"]),
+            amount=float(trade_message.content["amount"]),
+            type=TradeType.SELL if
+            trade_message.content["trade_type"] == float(TradeType.SELL.value) else TradeType.BUY
+        )
+
     async def _emit_trade_event_loop(self):
         last_message_timestamp: float = time.time()
         messages_accepted: int = 0
@@ -308,14 +766,8 @@ class OrderBookTracker:
                     continue
 
                 order_book: OrderBook = self._order_books[trading_pair]
-                order_book.apply_trade(OrderBookTradeEvent(
-                    trading_pair=trade_message.trading_pair,
-                    timestamp=trade_message.timestamp,
-                    price=float(trade_message.content["price"]),
-                    amount=float(trade_message.content["amount"]),
-                    type=TradeType.SELL if
-                    trade_message.content["trade_type"] == float(TradeType.SELL.value) else TradeType.BUY
-                ))
+                order_book.apply_trade(self._trade_event_from_message(trade_message))
+                self._record_latencies(trading_pair, (trade_message,))
 
                 messages_accepted += 1
 
@@ -2,17 +2,78 @@ import asyncio
 import logging
 import time
 from abc import ABCMeta, abstractmethod
-from collections import defaultdict
-from typing import Any, Callable, Dict, List, Optional
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from hummingbot.core.data_type.order_book import OrderBook
 from hummingbot.core.data_type.order_book_message import OrderBookMessage
+from hummingbot.core.data_type.redundant_message_filter import RedundantMessageFilter
+from hummingbot.core.utils.async_utils import safe_gather
+from hummingbot.core.utils.market_data_recorder import MarketDataRecorder
+from hummingbot.core.web_assistant.connections.ws_connection import WSConnection
 from hummingbot.core.web_assistant.ws_assistant import WSAssistant
 from hummingbot.logger import HummingbotLogger
 
 
+class OrderBookMessageDispatcher:
+    """
+    Stands in for the output queue of the message parsers of the data source, handing each message to a callback as
+    soon as it is put instead of queueing it.
+    """
+
+    def __init__(self, callback: Callable[[OrderBookMessage], None]):
+        self._callback = callback
+
+    def put_nowait(self, message: OrderBookMessage):
+        self._callback(message)
+
+    async def put(self, message: OrderBookMessage):
+        self._callback(message)
+
+
+class OrderBookMessageStamper:
+    """
+    Stands in for the output queue of the message parsers of the data source, stamping each message put with the
+    reception time of the websocket frame it was parsed from before forwarding it to the actual queue.
+    With redundant connections, only the first copy of each message is forwarded.
+    """
+
+    def __init__(self, message_queue: Any, message_filter: Optional[RedundantMessageFilter] = None):
+        self._message_queue = message_queue
+        self._message_filter = message_filter
+        self.receive_timestamp: Optional[float] = None
+        self.connection_index: Optional[int] = 0
+
+    def put_nowait(self, message: OrderBookMessage):
+        if self._stamp(message):
+            self._message_queue.put_nowait(message)
+
+    async def put(self, message: OrderBookMessage):
+        if self._stamp(message):
+            await self._message_queue.put(message)
+
+    def _stamp(self, message: OrderBookMessage) -> bool:
+        if self.receive_timestamp is not None and message.receive_timestamp is None:
+            message.receive_timestamp = self.receive_timestamp
+        return self._message_filter is None or self._message_filter.accept(message, self.connection_index)
+
+
 class OrderBookTrackerDataSource(metaclass=ABCMeta):
     FULL_ORDER_BOOK_RESET_DELTA_SECONDS = 60 * 60
+    # Reception times kept for the frames waiting in each channel queue, the older ones are dropped beyond it. Several
+    # full batches of frames, so that a backlog in a channel queue does not evict the receptions of the frames queued
+    RECEIVE_TIMESTAMPS_WINDOW_SIZE = 10 * WSConnection.MAX_BATCH_SIZE
+    # Streams the exchange accepts on a single websocket connection. When the trading pairs need more, their
+    # subscriptions are sharded across several connections (0 keeps all of them on a single connection)
+    MAX_STREAMS_PER_CONNECTION = 0
+    # Streams subscribed for each trading pair (e.g. trades and diffs)
+    STREAMS_PER_TRADING_PAIR = 1
+    # Lets the websocket assistants reconnect and replay their subscriptions (sent with WSAssistant.subscribe) on their
+    # own when the connection is lost, instead of creating a new connection
+    AUTO_RECONNECT_WEBSOCKETS = False
+    # Processes the websocket messages in batches of all the frames already received (WSAssistant.iter_batches), to
+    # amortise the reads and the wake-ups of the listeners over the bursts of messages
+    BATCH_WEBSOCKET_MESSAGES = False
 
     _logger: Optional[HummingbotLogger] = None
 
@@ -24,6 +85,18 @@ class OrderBookTrackerDataSource(metaclass=ABCMeta):
         self._trading_pairs: List[str] = trading_pairs
         self._order_book_create_function = lambda: OrderBook()
         self._message_queue: Dict[str, asyncio.Queue] = defaultdict(asyncio.Queue)
+        self._market_data_recorder: Optional[MarketDataRecorder] = None
+        self._market_data_source: str = ""
+        self._message_dispatchers: Dict[str, OrderBookMessageDispatcher] = {}
+        # Frames waiting in each channel queue with their reception time and the index of the connection they were
+        # received through, in the order they were queued
+        self._frame_receptions: Dict[str, Deque[Tuple[Any, float, int]]] = defaultdict(
+            lambda: deque(maxlen=self.RECEIVE_TIMESTAMPS_WINDOW_SIZE))
+        self._redundant_message_filter: Optional[RedundantMessageFilter] = None
+        self._websocket_connection_indexes: Dict[WSAssistant, int] = {}
+        # Connections subscribed to the streams of each shard of trading pairs (None for all of them), by index
+        self._shard_websockets: Dict[Optional[Tuple[str, ...]], Dict[int, WSAssistant]] = defaultdict(dict)
+        self._streams_reconnected_callback: Optional[Callable[[List[str]], None]] = None
 
     @classmethod
     def logger(cls) -> HummingbotLogger:
@@ -39,6 +112,64 @@ class OrderBookTrackerDataSource(metaclass=ABCMeta):
     def order_book_create_function(self, func: Callable[[], OrderBook]):
         self._order_book_create_function = func
 
+    def set_market_data_recorder(self, recorder: Optional[MarketDataRecorder], source: str):
+        """
+        Records the raw frames received through the websocket connections opened from now on
+
+        :param recorder: the recorder the frames are added to, None stops recording
+        :param source: the name identifying the frames of this data source in the recording
+        """
+        self._market_data_recorder = recorder
+        self._market_data_source = source
+
+    def set_message_dispatchers(self,
+                                diff_dispatcher: Optional[OrderBookMessageDispatcher],
+                                snapshot_dispatcher: Optional[OrderBookMessageDispatcher],
+                                trade_dispatcher: Optional[OrderBookMessageDispatcher]):
+        """
+        Enables the direct dispatch of the websocket messages: the diff, snapshot and trade frames are parsed as soon as
+        they are received and the messages handed to the dispatchers, instead of going through the channel queues read
+        by the listen_for_* methods. Only applies to the data sources processing their websocket messages with
+        _process_websocket_messages. None for all the dispatchers restores the queues.
+        """
+        self._message_dispatchers = {
+            channel: dispatcher
+            for channel, dispatcher in [(self._diff_messages_queue_key, diff_dispatcher),
+                                        (self._snapshot_messages_queue_key, snapshot_dispatcher),
+                                        (self._trade_messages_queue_key, trade_dispatcher)]
+            if dispatcher is not None
+        }
+
+    def set_streams_reconnected_callback(self, callback: Optional[Callable[[List[str]], None]]):
+        """
+        :param callback: called with the trading pairs whose streams were interrupted, each time a websocket assistant
+        reconnects automatically (see AUTO_RECONNECT_WEBSOCKETS), None to stop the notifications
+        """
+        self._streams_reconnected_callback = callback
+
+    @property
+    def redundant_connections(self) -> int:
+        return 1 if self._redundant_message_filter is None else self._redundant_message_filter.connections
+
+    def set_redundant_connections(self, connections: int):
+        """
+        Subscribes to the streams of every trading pair through several simultaneous websocket connections, keeping
+        only the first copy received of each message (identified by its update id or trade id). Subclasses can open
+        the redundant connections to other endpoints by overriding _connected_redundant_websocket_assistant.
+        Takes effect on the next start of the listeners.
+
+        :param connections: number of connections to each stream, 1 disables the redundancy
+        """
+        self._redundant_message_filter = RedundantMessageFilter(connections) if connections > 1 else None
+
+    @property
+    def redundant_connection_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Messages delivered first by each redundant connection and the time by which the first copies preceded the
+        duplicates dropped, None without redundant connections
+        """
+        return None if self._redundant_message_filter is None else self._redundant_message_filter.to_dict()
+
     @abstractmethod
     async def get_last_traded_prices(self, trading_pairs: List[str], domain: Optional[str] = None) -> Dict[str, float]:
         """
@@ -64,19 +195,115 @@ class OrderBookTrackerDataSource(metaclass=ABCMeta):
         """
         snapshot_msg: OrderBookMessage = await self._order_book_snapshot(trading_pair=trading_pair)
         order_book: OrderBook = self.order_book_create_function()
-        order_book.apply_snapshot(snapshot_msg.bids, snapshot_msg.asks, snapshot_msg.update_id)
+        order_book.apply_snapshot_message(snapshot_msg)
         return order_book
 
+    async def get_order_book_snapshot_message(self, trading_pair: str) -> OrderBookMessage:
+        """
+        Requests the full order book content for a particular trading pair. Used by the order book tracker to resync
+        an order book after detecting a gap in the sequence of diffs
+
+        :param trading_pair: the trading pair for which the order book snapshot has to be retrieved
+
+        :return: the snapshot message with the current order book in the exchange
+        """
+        return await self._order_book_snapshot(trading_pair=trading_pair)
+
     async def listen_for_subscriptions(self):
         """
         Connects to the trade events and order diffs websocket endpoints and listens to the messages sent by the
         exchange. Each message is stored in its own queue.
+        When the streams of all the trading pairs don't fit in a single connection, the trading pairs are sharded
+        across several connections, each one with its own receiving task and reconnecting on its own. With redundant
+        connections, each shard is subscribed through as many connections.
+        """
+        shards: List[List[str]] = self._trading_pair_shards()
+        connections: int = self.redundant_connections
+        if len(shards) <= 1 and connections == 1:
+            await self._listen_for_shard_subscriptions()
+        else:
+            self.logger().info(f"Subscribing to the streams of {len(self._trading_pairs)} trading pairs "
+                               f"through {len(shards) * connections} websocket connections.")
+            await safe_gather(*[
+                self._listen_for_shard_subscriptions(trading_pairs=shard if len(shards) > 1 else None,
+                                                     connection_index=connection_index)
+                for shard in shards
+                for connection_index in range(connections)
+            ])
+
+    def _streams_reconnected_listener(self, trading_pairs: Optional[List[str]]) -> Callable[[WSAssistant], Any]:
+        """
+        :param trading_pairs: the trading pairs subscribed through the connection, None for all of them
+        """
+        interrupted_trading_pairs: List[str] = list(self._trading_pairs if trading_pairs is None else trading_pairs)
+        shard_key: Optional[Tuple[str, ...]] = None if trading_pairs is None else tuple(trading_pairs)
+
+        async def listener(ws: WSAssistant):
+            if self._streams_reconnected_callback is None:
+                return
+            if self._streams_covered_by_redundant_connection(shard_key, ws):
+                self.logger().debug("The streams of a reconnected websocket were received through a redundant "
+                                    "connection meanwhile, no resync needed.")
+                return
+            self._streams_reconnected_callback(interrupted_trading_pairs)
+        return listener
+
+    def _streams_covered_by_redundant_connection(self,
+                                                 shard_key: Optional[Tuple[str, ...]],
+                                                 ws: WSAssistant) -> bool:
+        """
+        :return: True if another connection subscribed to the same streams stayed connected during the whole
+        interruption of the reconnected one, so no message was lost
+        """
+        disconnection_time: Optional[float] = ws.disconnection_time
+        if disconnection_time is None:
+            return False
+        for other_ws in self._shard_websockets.get(shard_key, {}).values():
+            connected_since: Optional[float] = other_ws.connected_since
+            if other_ws is not ws and connected_since is not None and connected_since <= disconnection_time:
+                return True
+        return False
+
+    def _trading_pair_shards(self) -> List[List[str]]:
+        """
+        Splits the trading pairs in groups whose streams fit in a single websocket connection
+
+        :return: the trading pairs of each connection
+        """
+        if self.MAX_STREAMS_PER_CONNECTION <= 0:
+            return [list(self._trading_pairs)]
+        pairs_per_connection = max(1, self.MAX_STREAMS_PER_CONNECTION // self.STREAMS_PER_TRADING_PAIR)
+        return [self._trading_pairs[index:index + pairs_per_connection]
+                for index in range(0, len(self._trading_pairs), pairs_per_connection)]
+
+    async def _listen_for_shard_subscriptions(self,
+                                              trading_pairs: Optional[List[str]] = None,
+                                              connection_index: int = 0):
+        """
+        Keeps a websocket connection subscribed to the streams of the trading pairs, reconnecting when it fails
+
+        :param trading_pairs: the trading pairs of the connection, None for all of them
+        :param connection_index: the index of the connection among the redundant ones
         """
         ws: Optional[WSAssistant] = None
+        shard_key: Optional[Tuple[str, ...]] = None if trading_pairs is None else tuple(trading_pairs)
         while True:
             try:
-                ws: WSAssistant = await self._connected_websocket_assistant()
-                await self._subscribe_channels(ws)
+                if connection_index == 0:
+                    ws: WSAssistant = await self._connected_websocket_assistant()
+                else:
+                    ws: WSAssistant = await self._connected_redundant_websocket_assistant(connection_index)
+                self._websocket_connection_indexes[ws] = connection_index
+                self._shard_websockets[shard_key][connection_index] = ws
+                if self.AUTO_RECONNECT_WEBSOCKETS:
+                    ws.enable_auto_reconnect()
+                    ws.add_reconnect_listener(self._streams_reconnected_listener(trading_pairs))
+                if self._market_data_recorder is not None:
+                    ws.set_recorder(self._market_data_recorder, self._market_data_source)
+                if trading_pairs is None:
+                    await self._subscribe_channels(ws)
+                else:
+                    await self._subscribe_trading_pairs_channels(ws, trading_pairs)
                 await self._process_websocket_messages(websocket_assistant=ws)
             except asyncio.CancelledError:
                 raise
@@ -88,6 +315,10 @@ class OrderBookTrackerDataSource(metaclass=ABCMeta):
                 )
                 await self._sleep(1.0)
             finally:
+                if ws is not None:
+                    self._websocket_connection_indexes.pop(ws, None)
+                    if self._shard_websockets[shard_key].get(connection_index) is ws:
+                        del self._shard_websockets[shard_key][connection_index]
                 await self._on_order_stream_interruption(websocket_assistant=ws)
 
     async def listen_for_order_book_diffs(self, ev_loop: asyncio.AbstractEventLoop, output: asyncio.Queue):
@@ -99,10 +330,13 @@ class OrderBookTrackerDataSource(metaclass=ABCMeta):
         :param output: a queue to add the created diff messages
         """
         message_queue = self._message_queue[self._diff_messages_queue_key]
+        stamper = OrderBookMessageStamper(output, self._redundant_message_filter)
         while True:
             try:
                 diff_event = await message_queue.get()
-                await self._parse_order_book_diff_message(raw_message=diff_event, message_queue=output)
+                stamper.receive_timestamp, stamper.connection_index = self._frame_reception(
+                    self._diff_messages_queue_key, diff_event)
+                await self._parse_order_book_diff_message(raw_message=diff_event, message_queue=stamper)
 
             except asyncio.CancelledError:
                 raise
@@ -120,12 +354,15 @@ class OrderBookTrackerDataSource(metaclass=ABCMeta):
         :param output: a queue to add the created snapshot messages
         """
         message_queue = self._message_queue[self._snapshot_messages_queue_key]
+        stamper = OrderBookMessageStamper(output, self._redundant_message_filter)
         while True:
             try:
                 try:
                     snapshot_event = await asyncio.wait_for(message_queue.get(),
                                                             timeout=self.FULL_ORDER_BOOK_RESET_DELTA_SECONDS)
-                    await self._parse_order_book_snapshot_message(raw_message=snapshot_event, message_queue=output)
+                    stamper.receive_timestamp, stamper.connection_index = self._frame_reception(
+                        self._snapshot_messages_queue_key, snapshot_event)
+                    await self._parse_order_book_snapshot_message(raw_message=snapshot_event, message_queue=stamper)
                 except asyncio.TimeoutError:
                     await self._request_order_book_snapshots(output=output)
             except asyncio.CancelledError:
@@ -142,10 +379,13 @@ class OrderBookTrackerDataSource(metaclass=ABCMeta):
         :param output: a queue to add the created trade messages
         """
         message_queue = self._message_queue[self._trade_messages_queue_key]
+        stamper = OrderBookMessageStamper(output, self._redundant_message_filter)
         while True:
             try:
                 trade_event = await message_queue.get()
-                await self._parse_trade_message(raw_message=trade_event, message_queue=output)
+                stamper.receive_timestamp, stamper.connection_index = self._frame_reception(
+                    self._trade_messages_queue_key, trade_event)
+                await self._parse_trade_message(raw_message=trade_event, message_queue=stamper)
 
             except asyncio.CancelledError:
                 raise
@@ -199,6 +439,17 @@ class OrderBookTrackerDataSource(metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    async def _connected_redundant_websocket_assistant(self, connection_index: int) -> WSAssistant:
+        """
+        Creates an instance of WSAssistant connected to the exchange for one of the redundant connections, to the same
+        endpoint as the main connection by default
+
+        :param connection_index: the index of the connection among the redundant ones (from 1)
+
+        :return: an instance of WSAssistant connected to the exchange
+        """
+        return await self._connected_websocket_assistant()
+
     async def _subscribe_channels(self, ws: WSAssistant):
         """
         Subscribes to the trade events and diff orders events through the provided websocket connection.
@@ -207,6 +458,16 @@ class OrderBookTrackerDataSource(metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    async def _subscribe_trading_pairs_channels(self, ws: WSAssistant, trading_pairs: List[str]):
+        """
+        Subscribes to the trade events and diff orders events of some of the trading pairs through the provided
+        websocket connection. Required by the data sources sharding their subscriptions (MAX_STREAMS_PER_CONNECTION)
+
+        :param ws: the websocket assistant used to connect to the exchange
+        :param trading_pairs: the trading pairs to subscribe to
+        """
+        raise NotImplementedError
+
     def _channel_originating_message(self, event_message: Dict[str, Any]) -> str:
         """
         Identifies the channel for a particular event message. Used to find the correct queue to add the message in
@@ -230,18 +491,78 @@ class OrderBookTrackerDataSource(metaclass=ABCMeta):
         pass
 
     async def _process_websocket_messages(self, websocket_assistant: WSAssistant):
+        if self.BATCH_WEBSOCKET_MESSAGES:
+            await self._process_websocket_message_batches(websocket_assistant=websocket_assistant)
+            return
+        connection_index: int = self._websocket_connection_indexes.get(websocket_assistant, 0)
         async for ws_response in websocket_assistant.iter_messages():
             data: Dict[str, Any] = ws_response.data
             if data is not None:  # data will be None when the websocket is disconnected
                 channel: str = self._channel_originating_message(event_message=data)
                 valid_channels = self._get_messages_queue_keys()
-                if channel in valid_channels:
+                if channel in self._message_dispatchers:
+                    await self._dispatch_message(channel, data, websocket_assistant.last_recv_time, connection_index)
+                elif channel in valid_channels:
+                    self._frame_receptions[channel].append((data, websocket_assistant.last_recv_time, connection_index))
                     self._message_queue[channel].put_nowait(data)
                 else:
                     await self._process_message_for_unknown_channel(
                         event_message=data, websocket_assistant=websocket_assistant
                     )
 
+    async def _process_websocket_message_batches(self, websocket_assistant: WSAssistant):
+        connection_index: int = self._websocket_connection_indexes.get(websocket_assistant, 0)
+        valid_channels = self._get_messages_queue_keys()
+        async for ws_responses in websocket_assistant.iter_batches():
+            # All the frames of a batch were already received when its first frame was read
+            receive_timestamp: float = websocket_assistant.last_recv_time
+            for ws_response in ws_responses:
+                data: Dict[str, Any] = ws_response.data
+                if data is None:
+                    continue
+                channel: str = self._channel_originating_message(event_message=data)
+                if channel in self._message_dispatchers:
+                    await self._dispatch_message(channel, data, receive_timestamp, connection_index)
+                elif channel in valid_channels:
+                    self._frame_receptions[channel].append((data, receive_timestamp, connection_index))
+                    self._message_queue[channel].put_nowait(data)
+                else:
+                    await self._process_message_for_unknown_channel(
+                        event_message=data, websocket_assistant=websocket_assistant
+                    )
+
+    async def _dispatch_message(self,
+                                channel: str,
+                                raw_message: Dict[str, Any],
+                                receive_timestamp: Optional[float],
+                                connection_index: int = 0):
+        dispatcher = OrderBookMessageStamper(self._message_dispatchers[channel], self._redundant_message_filter)
+        dispatcher.receive_timestamp = receive_timestamp
+        dispatcher.connection_index = connection_index
+        try:
+            if channel == self._diff_messages_queue_key:
+                await self._parse_order_book_diff_message(raw_message=raw_message, message_queue=dispatcher)
+            elif channel == self._snapshot_messages_queue_key:
+                await self._parse_order_book_snapshot_message(raw_message=raw_message, message_queue=dispatcher)
+            else:
+                await self._parse_trade_message(raw_message=raw_message, message_queue=dispatcher)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.logger().exception(f"Unexpected error when processing public {channel} updates from exchange")
+
+    def _frame_reception(self, channel: str, raw_message: Any) -> Tuple[Optional[float], Optional[int]]:
+        """
+        :return: the reception time of a frame taken from a channel queue and the index of the connection it was
+        received through, both None when unknown (frames queued by other means than _process_websocket_messages, or
+        whose reception was evicted from the window)
+        """
+        frame_receptions: Deque[Tuple[Any, float, int]] = self._frame_receptions[channel]
+        if len(frame_receptions) > 0 and frame_receptions[0][0] is raw_message:
+            _, receive_timestamp, connection_index = frame_receptions.popleft()
+            return receive_timestamp, connection_index
+        return None, None
+
     def _get_messages_queue_keys(self) -> List[str]:
         return [self._snapshot_messages_queue_key, self._diff_messages_queue_key, self._trade_messages_queue_key]
 
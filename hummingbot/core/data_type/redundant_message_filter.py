@@ -0,0 +1,73 @@
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from hummingbot.core.data_type.order_book_message import OrderBookMessage, OrderBookMessageType
+from hummingbot.core.utils.latency_histogram import LatencyHistogram
+
+
+class RedundantMessageFilter:
+    """
+    Keeps only the first copy of the order book messages received through redundant websocket connections subscribed
+    to the same streams. The copies are identified by their trading pair, type and update id (trade id for the trades).
+    Counts the messages each connection delivered first, and measures how long before each dropped copy the first one
+    was received, to compare the connections and the benefit of the redundancy on the tail latency.
+    """
+
+    def __init__(self, connections: int, window_size: int = 10000):
+        """
+        :param connections: number of redundant connections
+        :param window_size: number of message ids remembered for each trading pair and message type
+        """
+        self._connections: int = connections
+        self._window_size: int = window_size
+        self._first_receptions: Dict[Tuple[str, OrderBookMessageType], "OrderedDict[Hashable, Optional[float]]"] = (
+            defaultdict(OrderedDict))
+        self._wins: List[int] = [0] * connections
+        self._duplicates: int = 0
+        self._lead_times: LatencyHistogram = LatencyHistogram()
+
+    @property
+    def connections(self) -> int:
+        return self._connections
+
+    @staticmethod
+    def message_id(message: OrderBookMessage) -> Optional[Hashable]:
+        message_id = message.trade_id if message.type is OrderBookMessageType.TRADE else message.update_id
+        return None if message_id is None or message_id == -1 else message_id
+
+    def accept(self, message: OrderBookMessage, connection_index: Optional[int]) -> bool:
+        """
+        :param connection_index: the connection the message was received through, None when unknown (the message is
+        then not counted as delivered first by any connection)
+        :return: True for the first copy of the message, that has to be processed, False for the duplicates
+        """
+        message_id = self.message_id(message)
+        if message_id is None:
+            return True
+        first_receptions = self._first_receptions[(message.trading_pair, message.type)]
+        if message_id in first_receptions:
+            self._duplicates += 1
+            first_receive_timestamp = first_receptions[message_id]
+            if first_receive_timestamp is not None and message.receive_timestamp is not None:
+                self._lead_times.record(message.receive_timestamp - first_receive_timestamp)
+            return False
+        first_receptions[message_id] = message.receive_timestamp
+        if len(first_receptions) > self._window_size:
+            first_receptions.popitem(last=False)
+        if connection_index is not None and 0 <= connection_index < self._connections:
+            self._wins[connection_index] += 1
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: the messages delivered first by each connection and their share of all the messages, the number of
+        duplicates dropped and the distribution of the time by which the first copy preceded them (in milliseconds)
+        """
+        total_wins = sum(self._wins)
+        return {
+            "connections": self._connections,
+            "wins": list(self._wins),
+            "win_ratios": [wins / total_wins if total_wins > 0 else 0.0 for wins in self._wins],
+            "duplicates_dropped": self._duplicates,
+            "lead_time": self._lead_times.summary(),
+        }
@@ -0,0 +1,69 @@
+from typing import List
+
+from hummingbot.core.data_type.order_book import OrderBook
+from hummingbot.core.data_type.order_book_message import OrderBookMessage, OrderBookMessageType
+from hummingbot.core.data_type.order_book_tracker import OrderBookTracker
+from hummingbot.core.data_type.replay_order_book_tracker_data_source import ReplayOrderBookTrackerDataSource
+
+
+class ReplayOrderBookTracker(OrderBookTracker):
+    """
+    Order book tracker for backtesting. Instead of running asyncio tasks, it applies the messages of its replay data
+    source synchronously when `replay_until` is called, which `MarketDataReplayer` does on every clock tick.
+    Each order book is created with the first snapshot of its trading pair, and the diffs and trades received before
+    it are discarded.
+    """
+
+    def __init__(self, data_source: ReplayOrderBookTrackerDataSource, trading_pairs: List[str]):
+        super().__init__(data_source=data_source, trading_pairs=trading_pairs)
+        self._replayed_messages: int = 0
+
+    @property
+    def data_source(self) -> ReplayOrderBookTrackerDataSource:
+        return self._data_source
+
+    @property
+    def replayed_messages(self) -> int:
+        return self._replayed_messages
+
+    def start(self):
+        # The order books are driven by the clock through replay_until, there are no network tasks to start
+        pass
+
+    def replay_until(self, timestamp: float) -> int:
+        """
+        Applies the messages with a timestamp up to the given one
+
+        :return: the number of messages applied
+        """
+        replayed_messages: int = 0
+        for message in self._data_source.messages_until(timestamp):
+            self._apply_replayed_message(message)
+            replayed_messages += 1
+        self._replayed_messages += replayed_messages
+        return replayed_messages
+
+    def _apply_replayed_message(self, message: OrderBookMessage):
+        trading_pair: str = message.trading_pair
+        order_book: OrderBook = self._order_books.get(trading_pair)
+        if message.type is OrderBookMessageType.SNAPSHOT:
+            if order_book is None:
+                self._add_order_book(trading_pair, message)
+            else:
+                order_book.restore_from_snapshot_and_diffs(message, list(self._past_diffs_windows[trading_pair]))
+        elif order_book is None:
+            return
+        elif message.type is OrderBookMessageType.DIFF:
+            order_book.apply_diff_message(message)
+            self._past_diffs_windows[trading_pair].append(message)
+        elif message.type is OrderBookMessageType.TRADE:
+            order_book.apply_trade(self._trade_event_from_message(message))
+
+    def _add_order_book(self, trading_pair: str, snapshot: OrderBookMessage):
+        order_book: OrderBook = self._data_source.order_book_create_function()
+        order_book.max_depth_levels = self.get_max_depth_levels(trading_pair)
+        order_book.apply_snapshot_message(snapshot)
+        self._order_books[trading_pair] = order_book
+        self._order_book_ready_events[trading_pair].set()
+        if len(self._order_books) == len(self._trading_pairs):
+            self._order_books_initialized.set()
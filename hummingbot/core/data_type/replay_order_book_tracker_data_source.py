@@ -0,0 +1,89 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from hummingbot.core.data_type.order_book_message import OrderBookMessage, OrderBookMessageType
+from hummingbot.core.data_type.order_book_tracker_data_source import OrderBookTrackerDataSource
+from hummingbot.core.utils.market_data_recorder import MarketDataReader, MarketDataRecord
+
+
+class ReplayOrderBookTrackerDataSource(OrderBookTrackerDataSource):
+    """
+    Order book data source providing historical snapshots, diffs and trades instead of connecting to an exchange.
+    The messages have to be sorted by timestamp (in seconds, like the clock), and are handed out in that order with
+    `messages_until`, as the backtest advances.
+    """
+
+    def __init__(self, trading_pairs: List[str], messages: Iterable[OrderBookMessage]):
+        super().__init__(trading_pairs=trading_pairs)
+        self._messages: Iterator[OrderBookMessage] = iter(messages)
+        self._next_message: Optional[OrderBookMessage] = None
+        self._exhausted: bool = False
+        self._last_snapshots: Dict[str, OrderBookMessage] = {}
+        self._last_traded_prices: Dict[str, float] = {}
+
+    @classmethod
+    def from_recording(
+            cls,
+            trading_pairs: List[str],
+            reader: MarketDataReader,
+            parser: Callable[[MarketDataRecord], Iterable[OrderBookMessage]],
+            start_timestamp: Optional[float] = None,
+            end_timestamp: Optional[float] = None) -> "ReplayOrderBookTrackerDataSource":
+        """
+        Creates a data source replaying the frames of a MarketDataRecorder recording
+
+        :param trading_pairs: the trading pairs to replay
+        :param reader: the reader of the recording
+        :param parser: translates each recorded frame into the order book messages it contains, usually timestamped
+        with the frame receive time
+        :param start_timestamp: if given, the frames received before it are skipped
+        :param end_timestamp: if given, the frames received after it are skipped
+        """
+        messages = (message
+                    for record in reader.iter_records(start_timestamp=start_timestamp, end_timestamp=end_timestamp)
+                    for message in parser(record))
+        return cls(trading_pairs=trading_pairs, messages=messages)
+
+    @property
+    def exhausted(self) -> bool:
+        return self._exhausted
+
+    @property
+    def next_message_timestamp(self) -> float:
+        """
+        The timestamp of the next message to replay, infinity once all the messages have been replayed
+        """
+        next_message = self._peek_message()
+        return next_message.timestamp if next_message is not None else float("inf")
+
+    def messages_until(self, timestamp: float) -> Iterator[OrderBookMessage]:
+        """
+        Yields the messages of the tracked trading pairs with a timestamp up to the given one, in their original order
+        """
+        while True:
+            if self._peek_message() is None:
+                return
+            if self._next_message.timestamp > timestamp:
+                return
+            message: OrderBookMessage = self._next_message
+            self._next_message = None
+            if message.trading_pair not in self._trading_pairs:
+                continue
+            if message.type is OrderBookMessageType.SNAPSHOT:
+                self._last_snapshots[message.trading_pair] = message
+            elif message.type is OrderBookMessageType.TRADE:
+                self._last_traded_prices[message.trading_pair] = float(message.content["price"])
+            yield message
+
+    def _peek_message(self) -> Optional[OrderBookMessage]:
+        if self._next_message is None and not self._exhausted:
+            self._next_message = next(self._messages, None)
+            self._exhausted = self._next_message is None
+        return self._next_message
+
+    async def get_last_traded_prices(self, trading_pairs: List[str], domain: Optional[str] = None) -> Dict[str, float]:
+        return {trading_pair: self._last_traded_prices[trading_pair]
+                for trading_pair in trading_pairs
+                if trading_pair in self._last_traded_prices}
+
+    async def _order_book_snapshot(self, trading_pair: str) -> OrderBookMessage:
+        return self._last_snapshots[trading_pair]
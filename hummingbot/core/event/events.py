@@ -34,6 +34,7 @@ class MarketEvent(Enum):
 
 class OrderBookEvent(int, Enum):
     TradeEvent = 901
+    BBOChangedEvent = 902
 
 
 class TokenApprovalEvent(Enum):
@@ -136,6 +137,15 @@ class OrderBookTradeEvent(NamedTuple):
     amount: Decimal
 
 
+class OrderBookBBOChangedEvent(NamedTuple):
+    timestamp: float
+    update_id: int
+    best_bid_price: float
+    best_bid_amount: float
+    best_ask_price: float
+    best_ask_amount: float
+
+
 class OrderFilledEvent(NamedTuple):
     timestamp: float
     order_id: str
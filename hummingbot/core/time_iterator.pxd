@@ -8,7 +8,11 @@ cdef class TimeIterator(PubSub):
     cdef:
         double _current_timestamp
         Clock _clock
+        list _wake_up_timestamps
 
     cdef c_start(self, Clock clock, double timestamp)
     cdef c_stop(self, Clock clock)
     cdef c_tick(self, double timestamp)
+    cdef c_schedule_wake_up(self, double timestamp)
+    cdef double c_next_wake_up_timestamp(self)
+    cdef double c_next_event_timestamp(self)
@@ -1,15 +1,18 @@
 # distutils: language=c++
+import heapq
 from typing import Optional
 
 from hummingbot.core.clock import Clock
 
 NaN = float("nan")
+s_float_inf = float("inf")
 
 
 cdef class TimeIterator(PubSub):
     def __init__(self):
         self._current_timestamp = NaN
         self._clock = None
+        self._wake_up_timestamps = []
 
     cdef c_start(self, Clock clock, double timestamp):
         self._clock = clock
@@ -18,13 +21,55 @@ cdef class TimeIterator(PubSub):
     cdef c_stop(self, Clock clock):
         self._current_timestamp = NaN
         self._clock = None
+        self._wake_up_timestamps.clear()
 
     cdef c_tick(self, double timestamp):
         self._current_timestamp = timestamp
 
+    cdef c_schedule_wake_up(self, double timestamp):
+        heapq.heappush(self._wake_up_timestamps, timestamp)
+
+    cdef double c_next_wake_up_timestamp(self):
+        # The wake up times already reached are dropped
+        while len(self._wake_up_timestamps) > 0 and self._wake_up_timestamps[0] <= self._current_timestamp:
+            heapq.heappop(self._wake_up_timestamps)
+        return self._wake_up_timestamps[0] if len(self._wake_up_timestamps) > 0 else s_float_inf
+
+    cdef double c_next_event_timestamp(self):
+        """
+        Used by fast forward backtest clocks to skip the ticks in which no iterator has anything to do.
+        Iterators that know when they need to be ticked again override it and return that timestamp, infinity if they
+        only react to the other iterators, or any timestamp up to the current one to be ticked on the next tick.
+        NaN, the default, means the iterator has to be ticked on every tick.
+        """
+        return NaN
+
     def tick(self, timestamp: float):
         self.c_tick(timestamp)
 
+    def request_tick(self):
+        """
+        Requests an out of band tick from the real time clock running the iterator, i.e. when the data the iterator
+        reacts to changes between two regular ticks
+        """
+        if self._clock is not None:
+            self._clock.c_request_tick(self)
+
+    def schedule_wake_up(self, timestamp: float):
+        """
+        Registers a time at which the iterator has to be ticked, for iterators whose next event timestamp is their
+        next wake up time
+        """
+        self.c_schedule_wake_up(timestamp)
+
+    @property
+    def next_wake_up_timestamp(self) -> float:
+        return self.c_next_wake_up_timestamp()
+
+    @property
+    def next_event_timestamp(self) -> float:
+        return self.c_next_event_timestamp()
+
     @property
     def current_timestamp(self) -> float:
         return self._current_timestamp
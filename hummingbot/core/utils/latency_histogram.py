@@ -0,0 +1,134 @@
+from typing import Any, Dict, List, Optional
+
+PERCENTILES = (50, 90, 99, 99.9)
+# Every power of two above the exact range is split in 2 ** SUB_BUCKET_BITS buckets, i.e. values are kept with a
+# relative error below 1 / 2 ** SUB_BUCKET_BITS (~3%)
+SUB_BUCKET_BITS = 5
+_SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+_EXACT_RANGE_BITS = SUB_BUCKET_BITS + 1
+_EXACT_RANGE = 1 << _EXACT_RANGE_BITS
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of latencies. The latencies are recorded in microseconds into logarithmic buckets of constant
+    relative precision, so that recording a value is a few integer operations and the memory used does not grow with
+    the number of values, while the percentiles are computed on demand over everything recorded.
+    Negative latencies (e.g. from clock skew with the exchange) are counted in the lowest bucket.
+    """
+
+    def __init__(self):
+        self._counts: List[int] = [0] * _EXACT_RANGE
+        self._count: int = 0
+        self._total: float = 0.0
+        self._min: float = float("inf")
+        self._max: float = float("-inf")
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def min(self) -> float:
+        return self._min
+
+    @property
+    def max(self) -> float:
+        return self._max
+
+    @property
+    def mean(self) -> float:
+        return self._total / self._count if self._count > 0 else float("nan")
+
+    @staticmethod
+    def bucket_index(microseconds: int) -> int:
+        if microseconds < _EXACT_RANGE:
+            return microseconds if microseconds > 0 else 0
+        exponent = microseconds.bit_length() - _EXACT_RANGE_BITS
+        return (exponent << SUB_BUCKET_BITS) + (microseconds >> exponent)
+
+    @staticmethod
+    def bucket_upper_bound(index: int) -> int:
+        """
+        :return: the lowest value, in microseconds, above the values counted in the bucket
+        """
+        if index < _EXACT_RANGE:
+            return index + 1
+        exponent = (index >> SUB_BUCKET_BITS) - 1
+        return ((index - (exponent << SUB_BUCKET_BITS)) + 1) << exponent
+
+    def record(self, latency: float):
+        """
+        :param latency: the latency in seconds
+        """
+        index = self.bucket_index(int(latency * 1e6))
+        counts = self._counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self._count += 1
+        self._total += latency
+        if latency < self._min:
+            self._min = latency
+        if latency > self._max:
+            self._max = latency
+
+    def reset(self):
+        self.__init__()
+
+    def percentile(self, percentile: float) -> float:
+        """
+        :return: the latency in seconds below which the given percentage of the recorded latencies are, NaN before the
+        first record
+        """
+        if self._count == 0:
+            return float("nan")
+        threshold = self._count * percentile / 100.0
+        cumulative_count = 0
+        for index, bucket_count in enumerate(self._counts):
+            cumulative_count += bucket_count
+            if cumulative_count >= threshold and bucket_count > 0:
+                value = self.bucket_upper_bound(index) * 1e-6
+                return min(max(value, self._min), self._max)
+        return self._max
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        :return: the number of latencies recorded, and their mean, percentiles and maximum in milliseconds
+        """
+        summary: Dict[str, Any] = {"count": self._count, "mean": self.mean * 1e3}
+        for percentile in PERCENTILES:
+            summary[f"p{percentile}"] = self.percentile(percentile) * 1e3
+        summary["max"] = self._max * 1e3 if self._count > 0 else float("nan")
+        return summary
+
+
+class MarketDataLatency:
+    """
+    End to end latencies of the market data messages of a trading pair:
+    - exchange to receive: from the event time reported by the exchange to the reception of the websocket frame
+    - receive to apply: from the reception of the websocket frame to the application of the message to the order book
+    The exchange to receive latency includes the clock offset with the exchange, and is only available for the
+    connectors stamping their messages with the exchange event time.
+    """
+
+    def __init__(self):
+        self.exchange_to_receive: LatencyHistogram = LatencyHistogram()
+        self.receive_to_apply: LatencyHistogram = LatencyHistogram()
+
+    def record(self, receive_timestamp: Optional[float], exchange_timestamp: Optional[float], apply_timestamp: float):
+        if receive_timestamp is None:
+            return
+        self.receive_to_apply.record(apply_timestamp - receive_timestamp)
+        if exchange_timestamp is not None:
+            self.exchange_to_receive.record(receive_timestamp - exchange_timestamp)
+
+    def reset(self):
+        self.exchange_to_receive.reset()
+        self.receive_to_apply.reset()
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "exchange_to_receive": self.exchange_to_receive.summary(),
+            "receive_to_apply": self.receive_to_apply.summary(),
+        }
@@ -0,0 +1,340 @@
+import json
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from hummingbot.logger import HummingbotLogger
+
+SEGMENT_MAGIC = b"HBMD"
+SEGMENT_VERSION = 1
+# Segment header: magic, version, reserved
+SEGMENT_HEADER = struct.Struct("<4sHxx")
+# Record header: receive timestamp, source id, frame type, payload length
+RECORD_HEADER = struct.Struct("<dHBxI")
+
+TEXT_FRAME = 1
+BINARY_FRAME = 2
+
+mdr_logger = None
+
+
+class MarketDataRecord(NamedTuple):
+    timestamp: float
+    source: str
+    frame_type: int
+    data: bytes
+
+    @property
+    def text(self) -> str:
+        return self.data.decode("utf-8")
+
+
+class MarketDataSegment(NamedTuple):
+    file_name: str
+    first_timestamp: float
+    last_timestamp: float
+    records: int
+    size: int
+
+
+class _SegmentChunk(NamedTuple):
+    data: bytes
+    records: int
+    first_timestamp: float
+    last_timestamp: float
+
+
+def segment_file_name(name: str, sequence: int) -> str:
+    return f"{name}-{sequence:06d}.seg"
+
+
+def index_file_name(name: str) -> str:
+    return f"{name}.idx"
+
+
+class MarketDataRecorder:
+    """
+    Appends timestamped raw market data frames to rotating, append-only binary segment files.
+
+    Each segment starts with a small header followed by records made of a fixed size header (receive timestamp, source
+    id, frame type and payload length) and the frame payload. Records are packed into an in-memory buffer on the event
+    loop, and the buffer is handed to a writer thread once it is large enough or old enough, so that the disk access
+    never blocks the event loop. When a segment reaches max_segment_size a new one is started, and a line describing
+    the closed segment (time range, records, size and the source names) is appended to the index file.
+    """
+
+    DEFAULT_MAX_SEGMENT_SIZE = 64 * 1024 * 1024
+    DEFAULT_FLUSH_SIZE = 256 * 1024
+    DEFAULT_FLUSH_INTERVAL = 1.0
+
+    @classmethod
+    def logger(cls) -> HummingbotLogger:
+        global mdr_logger
+        if mdr_logger is None:
+            mdr_logger = logging.getLogger(__name__)
+        return mdr_logger
+
+    def __init__(self,
+                 directory: str,
+                 name: str = "market_data",
+                 max_segment_size: int = DEFAULT_MAX_SEGMENT_SIZE,
+                 flush_size: int = DEFAULT_FLUSH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self._directory = directory
+        self._name = name
+        self._max_segment_size = max_segment_size
+        self._flush_size = flush_size
+        self._flush_interval = flush_interval
+        self._source_ids: Dict[str, int] = {}
+        self._buffer = bytearray()
+        self._buffer_records = 0
+        self._buffer_first_timestamp = 0.0
+        self._buffer_last_timestamp = 0.0
+        self._last_flush_time = 0.0
+        self._chunks: queue.Queue = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._recorded_records = 0
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def started(self) -> bool:
+        return self._writer_thread is not None
+
+    @property
+    def recorded_records(self) -> int:
+        return self._recorded_records
+
+    def start(self):
+        if self._writer_thread is not None:
+            return
+        os.makedirs(self._directory, exist_ok=True)
+        self._last_flush_time = time.monotonic()
+        self._writer_thread = threading.Thread(target=self._write_chunks,
+                                               name=f"{self._name}-recorder",
+                                               daemon=True)
+        self._writer_thread.start()
+
+    def stop(self):
+        """
+        Writes the buffered records, closes the current segment and waits for the writer thread to finish
+        """
+        if self._writer_thread is None:
+            return
+        self.flush()
+        self._chunks.put(None)
+        self._writer_thread.join()
+        self._writer_thread = None
+
+    def record(self, source: str, data: Union[str, bytes], timestamp: Optional[float] = None):
+        """
+        Adds a frame to the recording buffer
+
+        :param source: the name of the frame origin (i.e. the connector), stored as a numeric id in each record
+        :param data: the frame as received, text frames are stored UTF-8 encoded
+        :param timestamp: the receive timestamp, now by default
+        """
+        if self._writer_thread is None:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        if type(data) is str:
+            payload = data.encode("utf-8")
+            frame_type = TEXT_FRAME
+        else:
+            payload = data
+            frame_type = BINARY_FRAME
+        source_id = self._source_ids.get(source)
+        if source_id is None:
+            source_id = self._source_ids[source] = len(self._source_ids)
+
+        if self._buffer_records == 0:
+            self._buffer_first_timestamp = timestamp
+        self._buffer_last_timestamp = timestamp
+        self._buffer += RECORD_HEADER.pack(timestamp, source_id, frame_type, len(payload))
+        self._buffer += payload
+        self._buffer_records += 1
+        self._recorded_records += 1
+
+        if (len(self._buffer) >= self._flush_size
+                or time.monotonic() - self._last_flush_time >= self._flush_interval):
+            self.flush()
+
+    def flush(self):
+        """
+        Hands the buffered records to the writer thread
+        """
+        self._last_flush_time = time.monotonic()
+        if self._buffer_records == 0:
+            return
+        self._chunks.put((_SegmentChunk(bytes(self._buffer),
+                                        self._buffer_records,
+                                        self._buffer_first_timestamp,
+                                        self._buffer_last_timestamp),
+                          dict(self._source_ids)))
+        self._buffer.clear()
+        self._buffer_records = 0
+
+    def _write_chunks(self):
+        segment_sequence = self._next_segment_sequence()
+        segment_file = None
+        segment_path = ""
+        segment_size = 0
+        segment_records = 0
+        first_timestamp = last_timestamp = 0.0
+        sources: Dict[str, int] = {}
+        try:
+            while True:
+                item = self._chunks.get()
+                if item is None:
+                    break
+                chunk, sources = item
+                if segment_file is not None and segment_size + len(chunk.data) > self._max_segment_size:
+                    segment_file.close()
+                    self._append_index_entry(segment_path, first_timestamp, last_timestamp, segment_records,
+                                             segment_size, sources)
+                    segment_file = None
+                    segment_sequence += 1
+                if segment_file is None:
+                    segment_path = os.path.join(self._directory, segment_file_name(self._name, segment_sequence))
+                    segment_file = open(segment_path, "wb")
+                    segment_file.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION))
+                    segment_size = SEGMENT_HEADER.size
+                    segment_records = 0
+                    first_timestamp = chunk.first_timestamp
+                segment_file.write(chunk.data)
+                segment_file.flush()
+                segment_size += len(chunk.data)
+                segment_records += chunk.records
+                last_timestamp = chunk.last_timestamp
+        except Exception:
+            self.logger().error("Unexpected error writing market data segments.", exc_info=True)
+        finally:
+            if segment_file is not None:
+                segment_file.close()
+                self._append_index_entry(segment_path, first_timestamp, last_timestamp, segment_records,
+                                         segment_size, sources)
+
+    def _next_segment_sequence(self) -> int:
+        prefix = f"{self._name}-"
+        sequences = [int(file_name[len(prefix):-len(".seg")])
+                     for file_name in os.listdir(self._directory)
+                     if file_name.startswith(prefix) and file_name.endswith(".seg")
+                     and file_name[len(prefix):-len(".seg")].isdigit()]
+        return max(sequences) + 1 if sequences else 0
+
+    def _append_index_entry(self,
+                            segment_path: str,
+                            first_timestamp: float,
+                            last_timestamp: float,
+                            records: int,
+                            size: int,
+                            sources: Dict[str, int]):
+        entry = {
+            "file_name": os.path.basename(segment_path),
+            "first_timestamp": first_timestamp,
+            "last_timestamp": last_timestamp,
+            "records": records,
+            "size": size,
+            "sources": {str(source_id): source for source, source_id in sources.items()},
+        }
+        with open(os.path.join(self._directory, index_file_name(self._name)), "a") as index_file:
+            index_file.write(json.dumps(entry) + "\n")
+
+
+class MarketDataReader:
+    """
+    Reads the segments written by MarketDataRecorder, memory mapping them one at a time.
+    The index is used to skip the segments outside of the requested time range.
+    """
+
+    def __init__(self, directory: str, name: str = "market_data"):
+        self._directory = directory
+        self._name = name
+        self._segments: List[MarketDataSegment] = []
+        self._sources: Dict[int, str] = {}
+        self._load_index()
+
+    @property
+    def segments(self) -> List[MarketDataSegment]:
+        return list(self._segments)
+
+    @property
+    def sources(self) -> List[str]:
+        return [self._sources[source_id] for source_id in sorted(self._sources)]
+
+    def iter_records(self,
+                     start_timestamp: Optional[float] = None,
+                     end_timestamp: Optional[float] = None) -> Iterator[MarketDataRecord]:
+        """
+        Yields the recorded frames in the order they were recorded
+
+        :param start_timestamp: if given, the records received before it are skipped
+        :param end_timestamp: if given, the records received after it are skipped
+        """
+        for segment in self._segments:
+            if start_timestamp is not None and segment.last_timestamp < start_timestamp:
+                continue
+            if end_timestamp is not None and segment.first_timestamp > end_timestamp:
+                continue
+            for timestamp, source_id, frame_type, data in self._iter_segment(segment.file_name):
+                if start_timestamp is not None and timestamp < start_timestamp:
+                    continue
+                if end_timestamp is not None and timestamp > end_timestamp:
+                    break
+                yield MarketDataRecord(timestamp, self._sources.get(source_id, str(source_id)), frame_type, data)
+
+    def _iter_segment(self, file_name: str) -> Iterator[Tuple[float, int, int, bytes]]:
+        with open(os.path.join(self._directory, file_name), "rb") as segment_file:
+            if os.fstat(segment_file.fileno()).st_size < SEGMENT_HEADER.size:
+                return
+            with mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ) as segment:
+                magic, version = SEGMENT_HEADER.unpack_from(segment, 0)
+                if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION:
+                    raise ValueError(f"{file_name} is not a market data segment.")
+                unpack_header = RECORD_HEADER.unpack_from
+                header_size = RECORD_HEADER.size
+                segment_size = len(segment)
+                offset = SEGMENT_HEADER.size
+                while offset + header_size <= segment_size:
+                    timestamp, source_id, frame_type, length = unpack_header(segment, offset)
+                    offset += header_size
+                    if offset + length > segment_size:
+                        # Partially written record at the end of a segment still being recorded
+                        break
+                    yield timestamp, source_id, frame_type, segment[offset:offset + length]
+                    offset += length
+
+    def _load_index(self):
+        indexed_files = set()
+        index_path = os.path.join(self._directory, index_file_name(self._name))
+        if os.path.exists(index_path):
+            with open(index_path) as index_file:
+                for line in index_file:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    self._segments.append(MarketDataSegment(entry["file_name"],
+                                                            entry["first_timestamp"],
+                                                            entry["last_timestamp"],
+                                                            entry["records"],
+                                                            entry["size"]))
+                    self._sources.update({int(source_id): source for source_id, source in entry["sources"].items()})
+                    indexed_files.add(entry["file_name"])
+        # Segments not indexed yet are the ones still being recorded, they are read after the indexed ones
+        prefix = f"{self._name}-"
+        for file_name in sorted(os.listdir(self._directory)):
+            if file_name.startswith(prefix) and file_name.endswith(".seg") and file_name not in indexed_files:
+                self._segments.append(MarketDataSegment(file_name, float("-inf"), float("inf"), -1, -1))
+        self._segments.sort(key=lambda segment: segment.file_name)
@@ -3,6 +3,7 @@ from typing import Optional
 import aiohttp
 from hummingbot.core.web_assistant.connections.rest_connection import RESTConnection
 from hummingbot.core.web_assistant.connections.ws_connection import WSConnection
+from hummingbot.core.web_assistant.connections.ws_frame_decoders import WSFrameDecoder
 
 
 class ConnectionsFactory:
@@ -25,9 +26,12 @@ class ConnectionsFactory:
         connection = RESTConnection(aiohttp_client_session=shared_client)
         return connection
 
-    async def get_ws_connection(self) -> WSConnection:
+    async def get_ws_connection(self, decoder: Optional[WSFrameDecoder] = None) -> WSConnection:
+        """
+        :param decoder: builds the responses of the frames received, JSON decoding all of them by default
+        """
         shared_client = await self._get_shared_client()
-        connection = WSConnection(aiohttp_client_session=shared_client)
+        connection = WSConnection(aiohttp_client_session=shared_client, decoder=decoder)
         return connection
 
     async def _get_shared_client(self) -> aiohttp.ClientSession:
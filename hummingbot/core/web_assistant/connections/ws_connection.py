@@ -1,20 +1,29 @@
 import asyncio
 import time
-from json import JSONDecodeError
-from typing import Any, Dict, Mapping, Optional
+from typing import Any, AsyncGenerator, Dict, List, Mapping, Optional
 
 import aiohttp
 
+from hummingbot.core.utils.market_data_recorder import MarketDataRecorder
 from hummingbot.core.web_assistant.connections.data_types import WSRequest, WSResponse
+from hummingbot.core.web_assistant.connections.ws_frame_decoders import WSFrameDecoder
 
 
 class WSConnection:
-    def __init__(self, aiohttp_client_session: aiohttp.ClientSession):
+    # Frames taken at most by a single call to receive_batch
+    MAX_BATCH_SIZE = 1000
+
+    def __init__(self, aiohttp_client_session: aiohttp.ClientSession, decoder: Optional[WSFrameDecoder] = None):
         self._client_session = aiohttp_client_session
+        self._decoder: WSFrameDecoder = decoder or WSFrameDecoder()
         self._connection: Optional[aiohttp.ClientWebSocketResponse] = None
         self._connected = False
         self._message_timeout: Optional[float] = None
         self._last_recv_time = 0
+        self._recorder: Optional[MarketDataRecorder] = None
+        self._recorder_source: str = ""
+        # Close frame read while draining a batch, handled once the data frames preceding it are returned
+        self._pending_close_message: Optional[aiohttp.WSMessage] = None
 
     @property
     def last_recv_time(self) -> float:
@@ -24,6 +33,21 @@ class WSConnection:
     def connected(self) -> bool:
         return self._connected
 
+    def set_recorder(self, recorder: Optional[MarketDataRecorder], source: str = ""):
+        """
+        Records every data frame received, as it arrives and before it is decoded, with the given source name.
+        Passing None stops the recording.
+        """
+        self._recorder = recorder
+        self._recorder_source = source
+
+    def set_decoder(self, decoder: Optional[WSFrameDecoder]):
+        """
+        Builds the responses of the data frames received from now on with the given decoder, which can drop frames
+        without decoding them. Passing None restores the default JSON decoding.
+        """
+        self._decoder = decoder or WSFrameDecoder()
+
     async def connect(
         self,
         ws_url: str,
@@ -46,6 +70,7 @@ class WSConnection:
             await self._connection.close()
         self._connection = None
         self._connected = False
+        self._pending_close_message = None
 
     async def send(self, request: WSRequest):
         self._ensure_connected()
@@ -61,10 +86,68 @@ class WSConnection:
             msg = await self._read_message()
             msg = await self._process_message(msg)
             if msg is not None:
+                if self._recorder is not None:
+                    self._recorder.record(self._recorder_source, msg.data)
                 response = self._build_resp(msg)
-                break
+                if response is not None:
+                    break
         return response
 
+    async def receive_batch(self) -> List[WSResponse]:
+        """
+        Returns all the data frames already received, at least one unless `disconnect` is called while waiting (the
+        list is then empty). Only the first frame is awaited: the frames buffered behind it in the aiohttp reader are
+        read without suspending, their type is checked inline and the pongs are sent once the batch is complete.
+        """
+        self._ensure_connected()
+        batch: List[WSResponse] = []
+        while self._connected and len(batch) == 0:
+            pings = 0
+            msg = self._pending_close_message or await self._read_message()
+            self._pending_close_message = None
+            # The frames buffered behind the first one were already received when it was returned, so they are all
+            # stamped with that time rather than the time the batch is complete
+            self._update_last_recv_time(msg)
+            while True:
+                msg_type = msg.type
+                if msg_type == aiohttp.WSMsgType.CLOSED or msg_type == aiohttp.WSMsgType.CLOSE:
+                    if len(batch) > 0:
+                        self._pending_close_message = msg
+                    else:
+                        await self._check_msg_closed_type(msg)
+                    break
+                elif msg_type == aiohttp.WSMsgType.PING:
+                    pings += 1
+                elif msg_type != aiohttp.WSMsgType.PONG:
+                    if self._recorder is not None:
+                        self._recorder.record(self._recorder_source, msg.data)
+                    response = self._build_resp(msg)
+                    if response is not None:
+                        batch.append(response)
+                if len(batch) >= self.MAX_BATCH_SIZE or self._buffered_frames_count() == 0:
+                    break
+                msg = await self._read_message()
+            for _ in range(pings):
+                await self._connection.pong()
+        return batch
+
+    async def iter_batches(self) -> AsyncGenerator[List[WSResponse], None]:
+        """Yields the lists of data frames returned by `receive_batch` until `disconnect` is called."""
+        while self._connected:
+            batch = await self.receive_batch()
+            if len(batch) > 0:
+                yield batch
+
+    def _buffered_frames_count(self) -> int:
+        """
+        :return: the number of frames received and waiting in the reader of the aiohttp connection, 0 when the reader
+        is not accessible
+        """
+        try:
+            return len(self._connection._reader)
+        except (AttributeError, TypeError):
+            return 0
+
     def _ensure_not_connected(self):
         if self._connected:
             raise RuntimeError("WS is connected.")
@@ -122,14 +205,5 @@ class WSConnection:
     async def _send_plain_text(self, payload: str):
         await self._connection.send_str(payload)
 
-    @staticmethod
-    def _build_resp(msg: aiohttp.WSMessage) -> WSResponse:
-        if msg.type == aiohttp.WSMsgType.BINARY:
-            data = msg.data
-        else:
-            try:
-                data = msg.json()
-            except JSONDecodeError:
-                data = msg.data
-        response = WSResponse(data)
-        return response
+    def _build_resp(self, msg: aiohttp.WSMessage) -> Optional[WSResponse]:
+        return self._decoder.decode(msg)
@@ -0,0 +1,130 @@
+import json
+import re
+from typing import Any, Callable, Hashable, Iterable, Optional, Set
+
+import aiohttp
+
+from hummingbot.core.web_assistant.connections.data_types import WSResponse
+
+
+class WSFrameDecoder:
+    """
+    Builds the responses of the data frames received by a `WSConnection`. The text frames are decoded as JSON (kept
+    as text when they are not valid JSON) and the binary frames are passed through.
+    Subclasses can drop frames before decoding them by returning None.
+    """
+
+    def __init__(self, loads: Callable[[str], Any] = json.loads):
+        """
+        :param loads: the function decoding the JSON documents, `json.loads` by default
+        """
+        self._loads = loads
+
+    def decode(self, msg: aiohttp.WSMessage) -> Optional[WSResponse]:
+        """
+        :return: the response built from the frame, None if the frame is dropped
+        """
+        if msg.type == aiohttp.WSMsgType.BINARY:
+            data = msg.data
+        else:
+            try:
+                data = self._loads(msg.data)
+            except ValueError:
+                data = msg.data
+        return WSResponse(data)
+
+
+class ChannelRoutingDecoder(WSFrameDecoder):
+    """
+    Classifies each text frame by channel with a cheap router working on the raw text, and only decodes the frames of
+    the channels with a consumer. The frames of the other channels (e.g. the trades of the markets not traded) are
+    dropped without being decoded.
+    """
+
+    def __init__(self,
+                 router: Callable[[str], Optional[Hashable]],
+                 consumed_channels: Iterable[Hashable] = (),
+                 decode_unrouted_frames: bool = True,
+                 loads: Callable[[str], Any] = json.loads):
+        """
+        :param router: returns the channel of a raw text frame, None when the frame does not belong to a channel
+        :param consumed_channels: the channels whose frames are decoded
+        :param decode_unrouted_frames: whether the frames without channel (e.g. subscription acknowledgements and
+        heartbeats) are decoded or dropped
+        :param loads: the function decoding the JSON documents, `json.loads` by default
+        """
+        super().__init__(loads=loads)
+        self._router = router
+        self._consumed_channels: Set[Hashable] = set(consumed_channels)
+        self._decode_unrouted_frames = decode_unrouted_frames
+        self._decoded_frames = 0
+        self._dropped_frames = 0
+
+    @property
+    def consumed_channels(self) -> Set[Hashable]:
+        return set(self._consumed_channels)
+
+    @property
+    def decoded_frames(self) -> int:
+        return self._decoded_frames
+
+    @property
+    def dropped_frames(self) -> int:
+        return self._dropped_frames
+
+    def add_consumed_channels(self, channels: Iterable[Hashable]):
+        self._consumed_channels.update(channels)
+
+    def remove_consumed_channels(self, channels: Iterable[Hashable]):
+        self._consumed_channels.difference_update(channels)
+
+    def decode(self, msg: aiohttp.WSMessage) -> Optional[WSResponse]:
+        if msg.type == aiohttp.WSMsgType.TEXT:
+            channel = self._router(msg.data)
+            if channel is None:
+                dropped = not self._decode_unrouted_frames
+            else:
+                dropped = channel not in self._consumed_channels
+            if dropped:
+                self._dropped_frames += 1
+                return None
+        self._decoded_frames += 1
+        return super().decode(msg)
+
+
+def json_fields_router(*field_names: str) -> Callable[[str], Optional[Hashable]]:
+    """
+    Creates a router identifying the channel of a JSON frame by the values of some of its fields, read from the raw
+    text with a regular expression instead of decoding it. Each field is located by its first occurrence in the text,
+    which is only reliable when the fields precede any nested object using the same keys (e.g. `e` and `s` in the
+    Binance market streams, `topic` in the KuCoin ones). The values are taken as they are written, without unescaping
+    the strings.
+
+    :param field_names: the fields identifying the channel
+    :return: a router returning the value of the field, the tuple of the values for several fields, or None when one
+    of the fields is missing
+    """
+    patterns = [re.compile(r'"%s"\s*:\s*(?:"([^"]*)"|([^\s,}\]]*))' % re.escape(field_name))
+                for field_name in field_names]
+
+    if len(patterns) == 1:
+        search = patterns[0].search
+
+        def single_field_router(raw: str) -> Optional[Hashable]:
+            match = search(raw)
+            if match is None:
+                return None
+            value = match.group(1)
+            return match.group(2) if value is None else value
+        return single_field_router
+
+    def fields_router(raw: str) -> Optional[Hashable]:
+        values = []
+        for pattern in patterns:
+            match = pattern.search(raw)
+            if match is None:
+                return None
+            value = match.group(1)
+            values.append(match.group(2) if value is None else value)
+        return tuple(values)
+    return fields_router
@@ -4,6 +4,7 @@ from copy import deepcopy
 from typing import Any, Dict, List, Optional, Union
 
 from hummingbot.core.api_throttler.async_throttler_base import AsyncThrottlerBase
+from hummingbot.core.api_throttler.data_types import DEFAULT_REQUEST_PRIORITY, RequestPriority
 from hummingbot.core.web_assistant.auth import AuthBase
 from hummingbot.core.web_assistant.connections.data_types import RESTMethod, RESTRequest, RESTResponse
 from hummingbot.core.web_assistant.connections.rest_connection import RESTConnection
@@ -42,7 +43,8 @@ class RESTAssistant:
             is_auth_required: bool = False,
             return_err: bool = False,
             timeout: Optional[float] = None,
-            headers: Optional[Dict[str, Any]] = None) -> Union[str, Dict[str, Any]]:
+            headers: Optional[Dict[str, Any]] = None,
+            throttler_priority: RequestPriority = DEFAULT_REQUEST_PRIORITY) -> Union[str, Dict[str, Any]]:
 
         headers = headers or {}
 
@@ -62,7 +64,7 @@ class RESTAssistant:
             throttler_limit_id=throttler_limit_id
         )
 
-        async with self._throttler.execute_task(limit_id=throttler_limit_id):
+        async with self._throttler.execute_task(limit_id=throttler_limit_id, priority=throttler_priority):
             response = await self.call(request=request, timeout=timeout)
 
             if 400 <= response.status:
@@ -3,6 +3,7 @@ from typing import List, Optional
 from hummingbot.core.api_throttler.async_throttler_base import AsyncThrottlerBase
 from hummingbot.core.web_assistant.auth import AuthBase
 from hummingbot.core.web_assistant.connections.connections_factory import ConnectionsFactory
+from hummingbot.core.web_assistant.connections.ws_frame_decoders import WSFrameDecoder
 from hummingbot.core.web_assistant.rest_assistant import RESTAssistant
 from hummingbot.core.web_assistant.rest_post_processors import RESTPostProcessorBase
 from hummingbot.core.web_assistant.rest_pre_processors import RESTPreProcessorBase
@@ -57,8 +58,8 @@ class WebAssistantsFactory:
         )
         return assistant
 
-    async def get_ws_assistant(self) -> WSAssistant:
-        connection = await self._connections_factory.get_ws_connection()
+    async def get_ws_assistant(self, decoder: Optional[WSFrameDecoder] = None) -> WSAssistant:
+        connection = await self._connections_factory.get_ws_connection(decoder=decoder)
         assistant = WSAssistant(
             connection, self._ws_pre_processors, self._ws_post_processors, self._auth
         )
@@ -1,16 +1,29 @@
+import asyncio
+import logging
+import random
+import time
 from copy import deepcopy
 from typing import (
+    Any,
     AsyncGenerator,
+    Awaitable,
+    Callable,
     Dict,
     List,
     Optional,
 )
 
+import aiohttp
+
+from hummingbot.core.utils.latency_histogram import LatencyHistogram
+from hummingbot.core.utils.market_data_recorder import MarketDataRecorder
 from hummingbot.core.web_assistant.auth import AuthBase
 from hummingbot.core.web_assistant.connections.ws_connection import WSConnection
 from hummingbot.core.web_assistant.connections.data_types import WSRequest, WSResponse
+from hummingbot.core.web_assistant.connections.ws_frame_decoders import WSFrameDecoder
 from hummingbot.core.web_assistant.ws_post_processors import WSPostProcessorBase
 from hummingbot.core.web_assistant.ws_pre_processors import WSPreProcessorBase
+from hummingbot.logger import HummingbotLogger
 
 
 class WSAssistant:
@@ -19,7 +32,21 @@ class WSAssistant:
     The class can be injected with additional functionality by passing a list of objects inheriting from
     the `WSPreProcessorBase` and `WSPostProcessorBase` classes. The pre-processors are applied to a request
     before it is sent out, while the post-processors are applied to a response before it is returned to the caller.
+
+    Once `enable_auto_reconnect` is called, the connection is restored when it is lost while receiving messages: the
+    assistant reconnects with a jittered exponential backoff, replays the requests sent with `subscribe` and notifies
+    the reconnect listeners, without interrupting `iter_messages`.
     """
+    RECONNECT_BASE_DELAY = 0.5
+    RECONNECT_MAX_DELAY = 30.0
+
+    _logger: Optional[HummingbotLogger] = None
+
+    @classmethod
+    def logger(cls) -> HummingbotLogger:
+        if cls._logger is None:
+            cls._logger = logging.getLogger(__name__)
+        return cls._logger
 
     def __init__(
         self,
@@ -32,11 +59,72 @@ class WSAssistant:
         self._ws_pre_processors = ws_pre_processors or []
         self._ws_post_processors = ws_post_processors or []
         self._auth = auth
+        self._connect_kwargs: Optional[Dict[str, Any]] = None
+        self._subscriptions: List[WSRequest] = []
+        self._auto_reconnect: bool = False
+        self._max_reconnect_attempts: int = 0
+        self._reconnect_listeners: List[Callable[["WSAssistant"], Awaitable[None]]] = []
+        self._reconnects: int = 0
+        # Time the connection was lost, until the first message is received after reconnecting
+        self._disconnection_time: Optional[float] = None
+        # Time the current connection was established, None while disconnected
+        self._connected_since: Optional[float] = None
+        self._reconnect_durations: LatencyHistogram = LatencyHistogram()
 
     @property
     def last_recv_time(self) -> float:
         return self._connection.last_recv_time
 
+    @property
+    def disconnection_time(self) -> Optional[float]:
+        """
+        Time the connection was lost, until the first message is received after reconnecting automatically
+        """
+        return self._disconnection_time
+
+    @property
+    def connected_since(self) -> Optional[float]:
+        """
+        Time the current connection was established (or reestablished), None while disconnected
+        """
+        return self._connected_since
+
+    @property
+    def subscriptions(self) -> List[WSRequest]:
+        return list(self._subscriptions)
+
+    @property
+    def reconnect_stats(self) -> Dict[str, Any]:
+        """
+        Number of automatic reconnections, and the time from the loss of the connection to the first message received
+        after reconnecting (in milliseconds)
+        """
+        return {"reconnects": self._reconnects, "time_to_first_message": self._reconnect_durations.summary()}
+
+    def enable_auto_reconnect(self, max_attempts: int = 0):
+        """
+        Reconnects automatically when the connection is lost while receiving messages, until `disconnect` is called
+
+        :param max_attempts: consecutive failed attempts to reconnect after which the error is raised (0 never stops)
+        """
+        self._auto_reconnect = True
+        self._max_reconnect_attempts = max_attempts
+
+    def add_reconnect_listener(self, listener: Callable[["WSAssistant"], Awaitable[None]]):
+        """
+        :param listener: coroutine function called with the assistant each time it reconnects, once the subscriptions
+        are replayed
+        """
+        self._reconnect_listeners.append(listener)
+
+    def set_recorder(self, recorder: Optional[MarketDataRecorder], source: str = ""):
+        """Records the raw frames received through the connection, see `WSConnection.set_recorder`."""
+        self._connection.set_recorder(recorder, source)
+
+    def set_decoder(self, decoder: Optional[WSFrameDecoder]):
+        """Decodes the frames received through the connection with the given decoder, see `WSConnection.set_decoder`."""
+        self._connection.set_decoder(decoder)
+
     async def connect(
         self,
         ws_url: str,
@@ -45,13 +133,19 @@ class WSAssistant:
         message_timeout: Optional[float] = None,
         ws_headers: Optional[Dict] = {},
     ):
-        await self._connection.connect(ws_url=ws_url, ws_headers=ws_headers, ping_timeout=ping_timeout, message_timeout=message_timeout)
+        self._connect_kwargs = dict(
+            ws_url=ws_url, ws_headers=ws_headers, ping_timeout=ping_timeout, message_timeout=message_timeout)
+        await self._connection.connect(**self._connect_kwargs)
+        self._connected_since = time.time()
 
     async def disconnect(self):
+        self._auto_reconnect = False
+        self._connected_since = None
         await self._connection.disconnect()
 
     async def subscribe(self, request: WSRequest):
-        """Will eventually be used to handle automatic re-connection."""
+        """Sends the request and remembers it, to send it again after an automatic reconnection."""
+        self._subscriptions.append(request)
         await self.send(request)
 
     async def send(self, request: WSRequest):
@@ -66,18 +160,96 @@ class WSAssistant:
     async def iter_messages(self) -> AsyncGenerator[Optional[WSResponse], None]:
         """Will yield None and stop if `WSDelegate.disconnect()` is called while waiting for a response."""
         while self._connection.connected:
-            response = await self._connection.receive()
+            response = await self.receive()
             if response is not None:
-                response = await self._post_process_response(response)
                 yield response
 
+    async def iter_batches(self) -> AsyncGenerator[List[WSResponse], None]:
+        """
+        Yields the responses in batches of all the frames already received, see `WSConnection.receive_batch`.
+        Stops if `WSDelegate.disconnect()` is called while waiting for a response.
+        """
+        while self._connection.connected:
+            responses = await self.receive_batch()
+            if len(responses) > 0:
+                yield responses
+
     async def receive(self) -> Optional[WSResponse]:
         """This method will return `None` if `WSDelegate.disconnect()` is called while waiting for a response."""
-        response = await self._connection.receive()
+        response = await self._receive_reconnecting(self._connection.receive)
         if response is not None:
+            if self._disconnection_time is not None:
+                self._record_reconnect_duration()
             response = await self._post_process_response(response)
         return response
 
+    async def receive_batch(self) -> List[WSResponse]:
+        """This method will return an empty list if `WSDelegate.disconnect()` is called while waiting for a response."""
+        responses = await self._receive_reconnecting(self._connection.receive_batch)
+        if len(responses) > 0:
+            if self._disconnection_time is not None:
+                self._record_reconnect_duration()
+            if len(self._ws_post_processors) > 0:
+                responses = [await self._post_process_response(response) for response in responses]
+        return responses
+
+    async def _receive_reconnecting(self, receive_function: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            try:
+                return await receive_function()
+            except (ConnectionError, asyncio.TimeoutError, aiohttp.ClientError) as exception:
+                self._connected_since = None
+                if not self._auto_reconnect:
+                    raise
+                await self._reconnect(exception)
+
+    async def _reconnect(self, exception: Exception):
+        if self._disconnection_time is None:
+            self._disconnection_time = time.time()
+        url = self._connect_kwargs["ws_url"]
+        self.logger().warning(f"The websocket connection to {url} was lost ({exception}). Reconnecting...")
+        attempt = 0
+        while True:
+            # Full jitter, to spread the reconnections of the connections lost at the same time
+            max_delay = min(self.RECONNECT_MAX_DELAY, self.RECONNECT_BASE_DELAY * 2 ** attempt)
+            await self._sleep(random.uniform(0, max_delay))
+            try:
+                await self._connection.disconnect()
+                await self._connection.connect(**self._connect_kwargs)
+                for request in self._subscriptions:
+                    await self.send(request)
+                self._connected_since = time.time()
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as reconnect_exception:
+                attempt += 1
+                if 0 < self._max_reconnect_attempts <= attempt:
+                    raise
+                self.logger().warning(f"Failed to reconnect to {url} ({reconnect_exception}). Retrying...")
+        self._reconnects += 1
+        self.logger().info(f"Reconnected to {url}, {len(self._subscriptions)} subscriptions replayed.")
+        for listener in self._reconnect_listeners:
+            try:
+                await listener(self)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.logger().exception("Unexpected error notifying the websocket reconnection.")
+
+    def _record_reconnect_duration(self):
+        duration = time.time() - self._disconnection_time
+        self._disconnection_time = None
+        self._reconnect_durations.record(duration)
+        self.logger().info(f"First message received {duration:.3f}s after the loss of the websocket connection to "
+                           f"{self._connect_kwargs['ws_url']}.")
+
+    async def _sleep(self, delay: float):
+        """
+        Function added only to facilitate patching the sleep in unit tests without affecting the asyncio module
+        """
+        await asyncio.sleep(delay)
+
     async def _pre_process_request(self, request: WSRequest) -> WSRequest:
         for pre_processor in self._ws_pre_processors:
             request = await pre_processor.pre_process(request)
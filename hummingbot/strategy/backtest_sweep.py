@@ -0,0 +1,289 @@
+import copy
+import itertools
+import logging
+import math
+from concurrent.futures import Future, ProcessPoolExecutor
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import pandas as pd
+
+from hummingbot.client.config.client_config_map import ClientConfigMap
+from hummingbot.client.config.config_helpers import ClientConfigAdapter
+from hummingbot.connector.exchange.paper_trade.paper_trade_exchange import PaperTradeExchange
+from hummingbot.core.clock import Clock
+from hummingbot.core.clock_mode import ClockMode
+from hummingbot.core.data_type.common import TradeType
+from hummingbot.core.data_type.market_data_replayer import MarketDataReplayer
+from hummingbot.core.data_type.order_book_message import OrderBookMessage
+from hummingbot.core.data_type.replay_order_book_tracker import ReplayOrderBookTracker
+from hummingbot.core.data_type.replay_order_book_tracker_data_source import ReplayOrderBookTrackerDataSource
+from hummingbot.core.event.event_logger import EventLogger
+from hummingbot.core.event.events import MarketEvent, OrderFilledEvent
+from hummingbot.core.utils.market_data_recorder import MarketDataReader, MarketDataRecord
+from hummingbot.logger import HummingbotLogger
+from hummingbot.strategy.avellaneda_market_making import AvellanedaMarketMakingStrategy
+from hummingbot.strategy.avellaneda_market_making.avellaneda_market_making_config_map_pydantic import (
+    AvellanedaMarketMakingConfigMap,
+)
+from hummingbot.strategy.market_trading_pair_tuple import MarketTradingPairTuple
+from hummingbot.strategy.pure_market_making import PureMarketMakingStrategy
+from hummingbot.strategy.strategy_base import StrategyBase
+
+s_decimal_zero = Decimal(0)
+bs_logger = None
+
+StrategyFactory = Callable[[MarketTradingPairTuple, Dict[str, Any]], StrategyBase]
+
+
+class SweepMarketData(NamedTuple):
+    """
+    Location of a MarketDataRecorder recording to replay in every backtest of a sweep.
+    The parser has to be picklable (i.e. a module level function) since it is sent to the worker processes.
+    """
+    directory: str
+    trading_pair: str
+    parser: Callable[[MarketDataRecord], Iterable[OrderBookMessage]]
+    name: str = "market_data"
+    start_timestamp: Optional[float] = None
+    end_timestamp: Optional[float] = None
+
+
+class _BacktestTask(NamedTuple):
+    market_data: SweepMarketData
+    strategy_factory: StrategyFactory
+    config: Dict[str, Any]
+    initial_balances: Dict[str, Decimal]
+    exchange_name: str
+    start_time: float
+    tick_size: float
+    fast_forward: bool
+    inventory_sample_interval: float
+
+
+class _SweepTargetMarket:
+
+    @staticmethod
+    def split_trading_pair(trading_pair: str):
+        return tuple(trading_pair.split("-"))
+
+    @staticmethod
+    def convert_from_exchange_trading_pair(trading_pair: str) -> str:
+        return trading_pair
+
+    @staticmethod
+    def convert_to_exchange_trading_pair(trading_pair: str) -> str:
+        return trading_pair
+
+
+def pure_market_making_strategy(market_info: MarketTradingPairTuple, config: Dict[str, Any]) -> StrategyBase:
+    """
+    Strategy factory for pure market making, the config entries are the init_params keyword arguments
+    (i.e. bid_spread, ask_spread, order_amount, order_levels)
+    """
+    strategy = PureMarketMakingStrategy()
+    strategy.init_params(market_info=market_info, **config)
+    return strategy
+
+
+def avellaneda_market_making_strategy(market_info: MarketTradingPairTuple, config: Dict[str, Any]) -> StrategyBase:
+    """
+    Strategy factory for Avellaneda market making, the config entries are the fields of
+    AvellanedaMarketMakingConfigMap (i.e. risk_factor for gamma, order_amount_shape_factor for eta, and
+    order_levels_mode.order_levels for the order levels)
+    """
+    strategy = AvellanedaMarketMakingStrategy()
+    strategy.init_params(config_map=ClientConfigAdapter(AvellanedaMarketMakingConfigMap(**config)),
+                         market_info=market_info)
+    return strategy
+
+
+def _set_parameter(config: Dict[str, Any], key: str, value: Any):
+    # Dotted keys address nested sections, which can be dictionaries or config models
+    *path, name = key.split(".")
+    section = config
+    for section_name in path:
+        section = section[section_name] if isinstance(section, dict) else getattr(section, section_name)
+    if isinstance(section, dict):
+        section[name] = value
+    else:
+        setattr(section, name, value)
+
+
+def _run_backtest(task: _BacktestTask) -> Dict[str, Any]:
+    """
+    Runs one backtest of the sweep in a worker process, with its own clock, paper trade exchange and strategy
+    """
+    market_data = task.market_data
+    trading_pair = market_data.trading_pair
+    base_asset, quote_asset = _SweepTargetMarket.split_trading_pair(trading_pair)
+    # The segments are memory mapped, so all the workers share the same pages of the recording
+    reader = MarketDataReader(market_data.directory, market_data.name)
+    data_source = ReplayOrderBookTrackerDataSource.from_recording(trading_pairs=[trading_pair],
+                                                                  reader=reader,
+                                                                  parser=market_data.parser,
+                                                                  start_timestamp=market_data.start_timestamp,
+                                                                  end_timestamp=market_data.end_timestamp)
+    tracker = ReplayOrderBookTracker(data_source=data_source, trading_pairs=[trading_pair])
+    exchange = PaperTradeExchange(client_config_map=ClientConfigAdapter(ClientConfigMap()),
+                                  order_book_tracker=tracker,
+                                  target_market=_SweepTargetMarket,
+                                  exchange_name=task.exchange_name)
+    for asset, balance in task.initial_balances.items():
+        exchange.set_balance(asset, balance)
+    fill_logger = EventLogger()
+    exchange.add_listener(MarketEvent.OrderFilled, fill_logger)
+    market_info = MarketTradingPairTuple(exchange, trading_pair, base_asset, quote_asset)
+    strategy = task.strategy_factory(market_info, task.config)
+
+    replayer = MarketDataReplayer([tracker])
+    end_time = market_data.end_timestamp if market_data.end_timestamp is not None else float("inf")
+    clock = Clock(ClockMode.BACKTEST,
+                  tick_size=task.tick_size,
+                  start_time=task.start_time,
+                  end_time=end_time,
+                  fast_forward=task.fast_forward)
+    clock.add_iterator(replayer)
+    clock.add_iterator(exchange)
+    clock.add_iterator(strategy)
+
+    inventory_timestamps: List[float] = []
+    inventory: List[float] = []
+    while not replayer.finished and clock.current_timestamp < end_time:
+        clock.backtest_til(min(clock.current_timestamp + task.inventory_sample_interval, end_time))
+        inventory_timestamps.append(clock.current_timestamp)
+        inventory.append(float(exchange.get_balance(base_asset)))
+
+    initial_base = task.initial_balances.get(base_asset, s_decimal_zero)
+    initial_quote = task.initial_balances.get(quote_asset, s_decimal_zero)
+    final_base = exchange.get_balance(base_asset)
+    final_quote = exchange.get_balance(quote_asset)
+    mid_price = market_info.get_mid_price() if tracker.ready else Decimal("nan")
+    fills: List[OrderFilledEvent] = fill_logger.event_log
+    return {
+        "pnl": float((final_quote - initial_quote) + (final_base - initial_base) * mid_price),
+        "fills": len(fills),
+        "buy_fills": sum(1 for fill in fills if fill.trade_type is TradeType.BUY),
+        "sell_fills": sum(1 for fill in fills if fill.trade_type is TradeType.SELL),
+        "traded_volume": float(sum((fill.amount for fill in fills), s_decimal_zero)),
+        "final_base_balance": float(final_base),
+        "final_quote_balance": float(final_quote),
+        "inventory_path": pd.Series(inventory, index=inventory_timestamps, dtype=float),
+        "replayed_events": replayer.replayed_events,
+        "events_per_second": replayer.events_per_second,
+    }
+
+
+class BacktestSweepRunner:
+    """
+    Runs the same replay backtest for every combination of a parameter grid, fanning the backtests out to a process
+    pool. Each worker builds its own clock, paper trade exchange and strategy (through a picklable strategy factory
+    such as pure_market_making_strategy), and reads the market data from the memory mapped segments of a
+    MarketDataRecorder recording instead of receiving a copy of it.
+
+    The results are collected into one table with a row per parameter combination: a column per swept parameter,
+    followed by the PnL (in quote, marked to the last mid price), fill counts, traded volume, final balances and the
+    base asset inventory path sampled every inventory_sample_interval seconds.
+    """
+
+    @classmethod
+    def logger(cls) -> HummingbotLogger:
+        global bs_logger
+        if bs_logger is None:
+            bs_logger = logging.getLogger(__name__)
+        return bs_logger
+
+    def __init__(self,
+                 market_data: SweepMarketData,
+                 strategy_factory: StrategyFactory,
+                 config_template: Dict[str, Any],
+                 parameter_grid: Dict[str, Sequence[Any]],
+                 initial_balances: Dict[str, Decimal],
+                 exchange_name: str = "binance",
+                 tick_size: float = 1.0,
+                 fast_forward: bool = False,
+                 inventory_sample_interval: float = 60.0,
+                 max_workers: Optional[int] = None):
+        """
+        :param market_data: the recording replayed in every backtest
+        :param strategy_factory: module level function creating the strategy from the market and its config
+        :param config_template: the strategy config shared by all the backtests
+        :param parameter_grid: the values to sweep for each parameter, dotted names set nested config entries
+        :param initial_balances: the paper trade balances at the start of each backtest
+        :param exchange_name: the exchange the paper trade exchange simulates (for its trading fees)
+        :param tick_size: the backtest clock tick size in seconds
+        :param fast_forward: skip the clock ticks in which nothing happens
+        :param inventory_sample_interval: the time between inventory path samples in seconds
+        :param max_workers: the size of the process pool, the number of CPUs by default
+        """
+        if len(parameter_grid) == 0:
+            raise ValueError("The parameter grid is empty.")
+        self._market_data = market_data
+        self._strategy_factory = strategy_factory
+        self._config_template = config_template
+        self._parameter_grid = dict(parameter_grid)
+        self._initial_balances = dict(initial_balances)
+        self._exchange_name = exchange_name
+        self._tick_size = tick_size
+        self._fast_forward = fast_forward
+        self._inventory_sample_interval = max(inventory_sample_interval, tick_size)
+        self._max_workers = max_workers
+
+    @property
+    def parameter_sets(self) -> List[Dict[str, Any]]:
+        names = list(self._parameter_grid.keys())
+        return [dict(zip(names, values)) for values in itertools.product(*self._parameter_grid.values())]
+
+    def run(self) -> pd.DataFrame:
+        """
+        Runs all the backtests and returns the results table, in the parameter grid order. A backtest failing doesn't
+        stop the sweep, its row has the error message and no results.
+        """
+        parameter_sets = self.parameter_sets
+        start_time = self._start_time()
+        tasks = [_BacktestTask(market_data=self._market_data,
+                               strategy_factory=self._strategy_factory,
+                               config=self._strategy_config(parameters),
+                               initial_balances=self._initial_balances,
+                               exchange_name=self._exchange_name,
+                               start_time=start_time,
+                               tick_size=self._tick_size,
+                               fast_forward=self._fast_forward,
+                               inventory_sample_interval=self._inventory_sample_interval)
+                 for parameters in parameter_sets]
+
+        results: List[Dict[str, Any]] = []
+        with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+            futures: List[Future] = [executor.submit(_run_backtest, task) for task in tasks]
+            for parameters, future in zip(parameter_sets, futures):
+                try:
+                    result = future.result()
+                    result["error"] = None
+                except Exception as e:
+                    self.logger().error(f"Backtest with parameters {parameters} failed.", exc_info=True)
+                    result = {"error": str(e)}
+                results.append(result)
+
+        columns: Dict[str, List[Any]] = {name: [parameters[name] for parameters in parameter_sets]
+                                         for name in self._parameter_grid}
+        for result_column in ("pnl", "fills", "buy_fills", "sell_fills", "traded_volume", "final_base_balance",
+                              "final_quote_balance", "inventory_path", "replayed_events", "events_per_second",
+                              "error"):
+            columns[result_column] = [result.get(result_column) for result in results]
+        return pd.DataFrame(columns)
+
+    def _strategy_config(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        config = copy.deepcopy(self._config_template)
+        for name, value in parameters.items():
+            _set_parameter(config, name, value)
+        return config
+
+    def _start_time(self) -> float:
+        # All the backtests start at the first tick including the first recorded frame
+        if self._market_data.start_timestamp is not None:
+            return self._market_data.start_timestamp
+        reader = MarketDataReader(self._market_data.directory, self._market_data.name)
+        first_record: Optional[MarketDataRecord] = next(reader.iter_records(), None)
+        if first_record is None:
+            raise ValueError(f"There is no market data recorded in {self._market_data.directory}.")
+        return math.floor(first_record.timestamp / self._tick_size) * self._tick_size
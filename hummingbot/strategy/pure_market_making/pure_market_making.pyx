@@ -1107,6 +1107,7 @@ cdef class PureMarketMakingStrategy(StrategyBase):
         # delay order creation by filled_order_dalay (in seconds)
         self._create_timestamp = self._current_timestamp + self._filled_order_delay
         self._cancel_timestamp = min(self._cancel_timestamp, self._create_timestamp)
+        self.c_schedule_wake_up(self._create_timestamp)
 
         self._filled_buys_balance += 1
         self._last_own_trade_price = limit_order_record.price
@@ -1147,6 +1148,7 @@ cdef class PureMarketMakingStrategy(StrategyBase):
         # delay order creation by filled_order_dalay (in seconds)
         self._create_timestamp = self._current_timestamp + self._filled_order_delay
         self._cancel_timestamp = min(self._cancel_timestamp, self._create_timestamp)
+        self.c_schedule_wake_up(self._create_timestamp)
 
         self._filled_sells_balance += 1
         self._last_own_trade_price = limit_order_record.price
@@ -1305,6 +1307,32 @@ cdef class PureMarketMakingStrategy(StrategyBase):
             self._create_timestamp = next_cycle
         if self._cancel_timestamp <= self._current_timestamp:
             self._cancel_timestamp = min(self._create_timestamp, next_cycle)
+        self.c_schedule_wake_up(self._create_timestamp)
+        self.c_schedule_wake_up(self._cancel_timestamp)
+
+    cdef double c_next_event_timestamp(self):
+        cdef:
+            list active_orders
+            double expiry_timestamp
+        if (self._hanging_orders_enabled
+                or self._asset_price_delegate is not None
+                or self._inventory_cost_price_delegate is not None
+                or self._moving_price_band.enabled):
+            # These features have their own timers and price sources, the strategy is ticked every tick
+            return NaN
+        if not self._all_markets_ready or self._create_timestamp <= self._current_timestamp:
+            # Waiting for the markets or for the orders to be created
+            return self._current_timestamp
+        active_orders = self.active_non_hanging_orders
+        if len(active_orders) == 0:
+            return self.c_next_wake_up_timestamp()
+        if self._cancel_timestamp <= self._current_timestamp or len(self._sb_order_tracker.in_flight_cancels) > 0:
+            return self._current_timestamp
+        # Orders are cancelled once their age (in whole seconds) is over max_order_age
+        expiry_timestamp = min(o.creation_timestamp for o in active_orders) / 1e6 + self._max_order_age
+        if expiry_timestamp <= self._current_timestamp:
+            return self._current_timestamp
+        return min(expiry_timestamp, self.c_next_wake_up_timestamp())
 
     def notify_hb_app(self, msg: str):
         if self._hb_app_notification:
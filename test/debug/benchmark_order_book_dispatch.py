@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Measures the latency between the reception of an order book diff frame from the websocket and its application to the
+order book, with the queued message routing of OrderBookTracker and with its direct dispatch mode.
+
+    python test/debug/benchmark_order_book_dispatch.py [number of messages]
+"""
+import asyncio
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from hummingbot.core.data_type.common import TradeType
+from hummingbot.core.data_type.order_book_message import OrderBookMessage, OrderBookMessageType
+from hummingbot.core.data_type.order_book_tracker import OrderBookTracker
+from hummingbot.core.data_type.order_book_tracker_data_source import OrderBookTrackerDataSource
+from hummingbot.core.event.event_forwarder import EventForwarder
+from hummingbot.core.event.events import OrderBookBBOChangedEvent, OrderBookEvent
+from hummingbot.core.web_assistant.connections.data_types import WSResponse
+
+TRADING_PAIR = "COINALPHA-HBOT"
+
+
+class BenchmarkWebsocket:
+    def __init__(self, number_of_messages: int):
+        self._number_of_messages = number_of_messages
+        self.sent_timestamps: Dict[int, float] = {}
+        self.last_recv_time: float = 0.
+        self.ready_to_send = asyncio.Event()
+        self.done = asyncio.Event()
+
+    async def iter_messages(self):
+        await self.ready_to_send.wait()
+        for update_id in range(11, 11 + self._number_of_messages):
+            self.sent_timestamps[update_id] = time.perf_counter()
+            self.last_recv_time = time.time()
+            # Every diff moves the best bid, so that its application can be timed with the BBO events
+            yield WSResponse(data={"channel": "diff", "update_id": update_id, "price": str(update_id), "amount": "1"})
+            if update_id % 10 == 0:
+                yield WSResponse(data={"channel": "trade", "update_id": update_id, "price": "10", "amount": "1"})
+            # Frames arrive one at a time from the network, the receiving task yields between them
+            await asyncio.sleep(0)
+        self.done.set()
+        await asyncio.Event().wait()
+
+    async def disconnect(self):
+        pass
+
+
+class BenchmarkDataSource(OrderBookTrackerDataSource):
+    def __init__(self, websocket: BenchmarkWebsocket):
+        super().__init__(trading_pairs=[TRADING_PAIR])
+        self._websocket = websocket
+
+    async def get_last_traded_prices(self, trading_pairs: List[str], domain: Optional[str] = None):
+        return {TRADING_PAIR: 10.}
+
+    async def _order_book_snapshot(self, trading_pair: str) -> OrderBookMessage:
+        return OrderBookMessage(OrderBookMessageType.SNAPSHOT,
+                                {"trading_pair": trading_pair, "update_id": 10, "bids": [["9", "1"]], "asks": []},
+                                timestamp=time.time())
+
+    async def _connected_websocket_assistant(self):
+        return self._websocket
+
+    async def _subscribe_channels(self, ws):
+        pass
+
+    def _channel_originating_message(self, event_message: Dict[str, Any]) -> str:
+        return {"diff": self._diff_messages_queue_key,
+                "trade": self._trade_messages_queue_key}[event_message["channel"]]
+
+    async def _parse_order_book_diff_message(self, raw_message: Dict[str, Any], message_queue: asyncio.Queue):
+        message_queue.put_nowait(OrderBookMessage(
+            OrderBookMessageType.DIFF,
+            {"trading_pair": TRADING_PAIR,
+             "update_id": raw_message["update_id"],
+             "bids": [[raw_message["price"], raw_message["amount"]]],
+             "asks": []},
+            timestamp=time.time()))
+
+    async def _parse_trade_message(self, raw_message: Dict[str, Any], message_queue: asyncio.Queue):
+        message_queue.put_nowait(OrderBookMessage(
+            OrderBookMessageType.TRADE,
+            {"trading_pair": TRADING_PAIR,
+             "trade_id": raw_message["update_id"],
+             "price": raw_message["price"],
+             "amount": raw_message["amount"],
+             "trade_type": float(TradeType.BUY.value)},
+            timestamp=time.time()))
+
+
+async def measure_latencies(direct_dispatch: bool, number_of_messages: int) -> np.ndarray:
+    websocket = BenchmarkWebsocket(number_of_messages)
+    tracker = OrderBookTracker(data_source=BenchmarkDataSource(websocket), trading_pairs=[TRADING_PAIR])
+    tracker.direct_dispatch = direct_dispatch
+    latencies: Dict[int, float] = {}
+
+    def on_bbo_changed(event: OrderBookBBOChangedEvent):
+        if event.update_id in websocket.sent_timestamps:
+            latencies[event.update_id] = time.perf_counter() - websocket.sent_timestamps[event.update_id]
+
+    bbo_forwarder = EventForwarder(on_bbo_changed)
+    tracker.start()
+    try:
+        order_book = await tracker.wait_for_order_book(TRADING_PAIR)
+        order_book.add_listener(OrderBookEvent.BBOChangedEvent, bbo_forwarder)
+        websocket.ready_to_send.set()
+        await websocket.done.wait()
+        while len(latencies) < number_of_messages:
+            await asyncio.sleep(0.01)
+    finally:
+        tracker.stop()
+    return np.array(list(latencies.values())) * 1e6
+
+
+async def main(number_of_messages: int):
+    print(f"Latency from websocket frame to order book update over {number_of_messages} diffs (microseconds)")
+    for name, direct_dispatch in [("queued", False), ("direct dispatch", True)]:
+        latencies = await measure_latencies(direct_dispatch, number_of_messages)
+        print(f"{name:>16}: mean {latencies.mean():8.1f}  p50 {np.percentile(latencies, 50):8.1f}  "
+              f"p99 {np.percentile(latencies, 99):8.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.get_event_loop().run_until_complete(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Compares the decoding of websocket frames with the full JSON decoding of every frame (WSFrameDecoder) and with the
+channel pre-routing of ChannelRoutingDecoder, which only decodes the frames of the channels consumed.
+
+By default the frames are generated to look like the Binance and KuCoin market streams: diffs and trades of the
+markets traded and of other markets, and heartbeats. Frames recorded with MarketDataRecorder can be used instead,
+their source names telling the exchange they come from (binance or kucoin):
+
+    python test/debug/benchmark_ws_frame_decoding.py [--recording DIRECTORY [--name NAME]] [--drop TEXT ...]
+
+With a recording, the channels containing one of the --drop texts are considered without consumer.
+"""
+import argparse
+import json
+import random
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import aiohttp
+
+from hummingbot.core.utils.market_data_recorder import TEXT_FRAME, MarketDataReader
+from hummingbot.core.web_assistant.connections.ws_frame_decoders import (
+    ChannelRoutingDecoder,
+    WSFrameDecoder,
+    json_fields_router,
+)
+
+ROUTERS: Dict[str, Callable[[str], Optional[Hashable]]] = {
+    "binance": json_fields_router("e", "s"),
+    "kucoin": json_fields_router("topic"),
+}
+TRADED_SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+OTHER_SYMBOLS = [f"ALT{index}USDT" for index in range(20)]
+
+
+def _levels(price: float) -> List[List[str]]:
+    return [[f"{price + index * 0.01:.2f}", f"{random.random():.8f}"] for index in range(20)]
+
+
+def _frame_kind(index: int) -> Tuple[bool, bool]:
+    """
+    :return: whether the frame is a diff rather than a trade, and whether it belongs to a market traded. Out of 10
+    frames, 4 are diffs and 1 a trade of the markets traded, 2 diffs and 2 trades of other markets (e.g. subscribed
+    by another strategy sharing the connection), the last one is a heartbeat for KuCoin and a trade for Binance
+    """
+    kind = index % 10
+    return kind < 6, kind < 4 or kind == 6
+
+
+def _compact(document: Dict) -> str:
+    return json.dumps(document, separators=(",", ":"))
+
+
+def binance_frames(number_of_frames: int) -> Tuple[List[str], List[Hashable]]:
+    frames = []
+    for index in range(number_of_frames):
+        is_diff, is_traded = _frame_kind(index)
+        symbol = random.choice(TRADED_SYMBOLS if is_traded else OTHER_SYMBOLS)
+        if is_diff:
+            frames.append(_compact({"e": "depthUpdate", "E": index, "s": symbol, "U": index, "u": index,
+                                    "b": _levels(100), "a": _levels(101)}))
+        else:
+            frames.append(_compact({"e": "trade", "E": index, "s": symbol, "t": index, "p": "100.01", "q": "0.5",
+                                    "b": index, "a": index, "T": index, "m": True, "M": True}))
+    consumed_channels = [(event_type, symbol) for event_type in ("depthUpdate", "trade") for symbol in TRADED_SYMBOLS]
+    return frames, consumed_channels
+
+
+def kucoin_frames(number_of_frames: int) -> Tuple[List[str], List[Hashable]]:
+    frames = []
+    for index in range(number_of_frames):
+        is_diff, is_traded = _frame_kind(index)
+        symbol = random.choice(TRADED_SYMBOLS if is_traded else OTHER_SYMBOLS)
+        if index % 10 == 9:
+            frames.append(_compact({"id": str(index), "type": "pong"}))
+        elif is_diff:
+            frames.append(_compact({"type": "message", "topic": f"/market/level2:{symbol}", "subject": "trade.l2update",
+                                    "data": {"sequenceStart": index, "sequenceEnd": index, "symbol": symbol,
+                                             "changes": {"asks": _levels(101), "bids": _levels(100)}}}))
+        else:
+            frames.append(_compact({"type": "message", "topic": f"/market/match:{symbol}", "subject": "trade.l3match",
+                                    "data": {"sequence": index, "symbol": symbol, "side": "buy", "size": "0.5",
+                                             "price": "100.01", "tradeId": str(index), "time": str(index)}}))
+    consumed_channels = [f"/market/{channel}:{symbol}" for channel in ("level2", "match") for symbol in TRADED_SYMBOLS]
+    return frames, consumed_channels
+
+
+def recorded_frames(directory: str, name: str, dropped_texts: List[str]) -> Dict[str, Tuple[List[str], List[Hashable]]]:
+    frames: Dict[str, List[str]] = defaultdict(list)
+    for record in MarketDataReader(directory, name).iter_records():
+        exchange = next((exchange for exchange in ROUTERS if record.source.startswith(exchange)), None)
+        if exchange is not None and record.frame_type == TEXT_FRAME:
+            frames[exchange].append(record.text)
+    traffic = {}
+    for exchange, exchange_frames in frames.items():
+        channels = {ROUTERS[exchange](frame) for frame in exchange_frames} - {None}
+        consumed_channels = [channel for channel in channels
+                             if not any(text in str(channel) for text in dropped_texts)]
+        traffic[exchange] = (exchange_frames, consumed_channels)
+    return traffic
+
+
+def measure(decoder: WSFrameDecoder, messages: List[aiohttp.WSMessage], repetitions: int) -> float:
+    """
+    :return: the shortest decoding time per frame over the repetitions, in nanoseconds
+    """
+    durations = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        for message in messages:
+            decoder.decode(message)
+        durations.append(time.perf_counter() - start)
+    return min(durations) / len(messages) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the decoding of websocket frames")
+    parser.add_argument("--recording", help="directory of the recording to replay")
+    parser.add_argument("--name", default="market_data", help="name of the recording")
+    parser.add_argument("--drop", action="append", default=[], help="text of the channels without consumer")
+    parser.add_argument("--frames", type=int, default=20000, help="number of frames generated for each exchange")
+    parser.add_argument("--repetitions", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.recording is not None:
+        traffic = recorded_frames(args.recording, args.name, args.drop)
+    else:
+        traffic = {"binance": binance_frames(args.frames), "kucoin": kucoin_frames(args.frames)}
+
+    print("Decoding time per frame (nanoseconds)")
+    for exchange, (frames, consumed_channels) in traffic.items():
+        messages = [aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, frame, extra=None) for frame in frames]
+        full_decoding = measure(WSFrameDecoder(), messages, args.repetitions)
+        routing_decoder = ChannelRoutingDecoder(
+            router=ROUTERS[exchange], consumed_channels=consumed_channels, decode_unrouted_frames=False)
+        routed_decoding = measure(routing_decoder, messages, args.repetitions)
+        dropped_ratio = routing_decoder.dropped_frames / (len(messages) * args.repetitions)
+        print(f"{exchange:>8}: {len(frames)} frames, full decoding {full_decoding:6.0f}, "
+              f"pre-routed {routed_decoding:6.0f} ({dropped_ratio:.0%} of the frames dropped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -95,6 +95,8 @@ class ConfigCommandTest(unittest.TestCase):
                            "    | ∟ other_commands_timeout | 30                   |\n"
                            "    | tables_format            | psql                 |\n"
                            "    | tick_size                | 1.0                  |\n"
+                           "    | min_tick_interval        | 0.1                  |\n"
+                           "    | connector_tick_interval  | 0.0                  |\n"
                            "    +--------------------------+----------------------+")
 
         self.assertEqual(df_str_expected, captures[1])
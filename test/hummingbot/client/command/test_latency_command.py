@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+from typing import Awaitable
+from unittest.mock import MagicMock, patch
+
+from hummingbot.client.config.client_config_map import ClientConfigMap
+from hummingbot.client.config.config_helpers import ClientConfigAdapter, read_system_configs_from_yml
+from hummingbot.client.hummingbot_application import HummingbotApplication
+from hummingbot.core.data_type.order_book_tracker import OrderBookTracker
+from hummingbot.core.data_type.redundant_message_filter import RedundantMessageFilter
+
+
+class LatencyCommandTest(unittest.TestCase):
+    @patch("hummingbot.core.utils.trading_pair_fetcher.TradingPairFetcher")
+    def setUp(self, _: MagicMock) -> None:
+        super().setUp()
+        self.ev_loop = asyncio.get_event_loop()
+
+        self.async_run_with_timeout(read_system_configs_from_yml())
+        self.client_config_map = ClientConfigAdapter(ClientConfigMap())
+
+        self.app = HummingbotApplication(client_config_map=self.client_config_map)
+
+    def async_run_with_timeout(self, coroutine: Awaitable, timeout: float = 1):
+        ret = self.ev_loop.run_until_complete(asyncio.wait_for(coroutine, timeout))
+        return ret
+
+    @patch("hummingbot.client.hummingbot_application.HummingbotApplication.notify")
+    def test_latency_without_markets(self, notify_mock):
+        captures = []
+        notify_mock.side_effect = lambda s: captures.append(s)
+
+        self.app.latency()
+
+        self.assertEqual(["\n There is currently no active market."], captures)
+
+    @patch("hummingbot.client.hummingbot_application.HummingbotApplication.notify")
+    def test_show_and_reset_latencies(self, notify_mock):
+        captures = []
+        notify_mock.side_effect = lambda s: captures.append(s)
+        data_source = MagicMock()
+        data_source.redundant_connection_stats = None
+        tracker = OrderBookTracker(data_source=data_source, trading_pairs=["COINALPHA-HBOT"])
+        connector = MagicMock()
+        connector.order_book_tracker = tracker
+        self.app.markets = {"binance": connector}
+
+        self.app.latency()
+        tracker._market_data_latencies["COINALPHA-HBOT"].record(
+            receive_timestamp=1000.0, exchange_timestamp=999.99, apply_timestamp=1000.001)
+        self.app.latency()
+        data_source.redundant_connection_stats = RedundantMessageFilter(connections=2).to_dict()
+        self.app.latency()
+        self.app.latency("reset")
+
+        self.assertEqual(4, len(captures))
+        self.assertEqual("\n No market data latency recorded yet.", captures[0])
+        self.assertIn("| binance ", captures[1])
+        self.assertIn("| COINALPHA-HBOT ", captures[1])
+        self.assertIn("| Exchange to receive ", captures[1])
+        self.assertIn("| Receive to apply ", captures[1])
+        self.assertNotIn("redundant connections", captures[1])
+        self.assertIn("binance redundant connections, messages received first: 0.0% / 0.0%, duplicates dropped: 0",
+                      captures[2])
+        self.assertEqual("\n Market data latencies reset.", captures[3])
+        self.assertEqual(0, tracker.market_data_latencies["COINALPHA-HBOT"].receive_to_apply.count)
@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+from typing import Awaitable
+from unittest.mock import MagicMock, patch
+
+from hummingbot.client.config.client_config_map import ClientConfigMap
+from hummingbot.client.config.config_helpers import ClientConfigAdapter, read_system_configs_from_yml
+from hummingbot.client.hummingbot_application import HummingbotApplication
+from hummingbot.core.clock import Clock, ClockMode
+from hummingbot.core.time_iterator import TimeIterator
+
+
+class TicksCommandTest(unittest.TestCase):
+    @patch("hummingbot.core.utils.trading_pair_fetcher.TradingPairFetcher")
+    def setUp(self, _: MagicMock) -> None:
+        super().setUp()
+        self.ev_loop = asyncio.get_event_loop()
+
+        self.async_run_with_timeout(read_system_configs_from_yml())
+        self.client_config_map = ClientConfigAdapter(ClientConfigMap())
+
+        self.app = HummingbotApplication(client_config_map=self.client_config_map)
+
+    def async_run_with_timeout(self, coroutine: Awaitable, timeout: float = 1):
+        ret = self.ev_loop.run_until_complete(asyncio.wait_for(coroutine, timeout))
+        return ret
+
+    @patch("hummingbot.client.hummingbot_application.HummingbotApplication.notify")
+    def test_ticks_without_running_strategy(self, notify_mock):
+        captures = []
+        notify_mock.side_effect = lambda s: captures.append(s)
+
+        self.app.ticks()
+
+        self.assertEqual(["\n This command can only be used while a strategy is running"], captures)
+
+    @patch("hummingbot.client.hummingbot_application.HummingbotApplication.notify")
+    def test_enable_and_show_tick_stats(self, notify_mock):
+        captures = []
+        notify_mock.side_effect = lambda s: captures.append(s)
+        self.app.clock = Clock(ClockMode.REALTIME, tick_size=1.0)
+        self.app.clock.add_iterator(TimeIterator())
+
+        self.app.ticks()
+        self.app.ticks("enable")
+        self.app.clock.tick_stats.record_tick(0.002)
+        self.app.clock.tick_stats.record_tick(1.5)
+        self.app.clock.tick_stats.record_iterator_tick(TimeIterator(), 0.001)
+        self.app.ticks()
+        self.app.ticks("disable")
+
+        self.assertEqual(4, len(captures))
+        self.assertIn("Clock tick timing is disabled", captures[0])
+        self.assertEqual("\n Clock tick timing enabled.", captures[1])
+        self.assertIn("ticks longer than the tick size: 1 / 2", captures[2])
+        self.assertIn("| TimeIterator ", captures[2])
+        self.assertIn("| Loop lag ", captures[2])
+        self.assertEqual("\n Clock tick timing disabled.", captures[3])
+        self.assertIsNone(self.app.clock.tick_stats)
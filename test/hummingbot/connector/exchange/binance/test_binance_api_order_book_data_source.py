@@ -239,9 +239,23 @@ class BinanceAPIOrderBookDataSourceUnitTests(unittest.TestCase):
                 "ERROR",
                 "Unexpected error occurred when listening to order book streams. Retrying in 5 seconds..."))
 
+    def test_trading_pairs_sharded_by_streams_limit(self):
+        trading_pairs = [f"TOKEN{index}-HBOT" for index in range(513)]
+        data_source = BinanceAPIOrderBookDataSource(trading_pairs=trading_pairs,
+                                                    connector=self.connector,
+                                                    api_factory=self.connector._web_assistants_factory,
+                                                    domain=self.domain)
+
+        shards = data_source._trading_pair_shards()
+
+        # Each trading pair subscribes to two streams, trades and diffs
+        self.assertEqual([512, 1], [len(shard) for shard in shards])
+        self.assertEqual(trading_pairs, shards[0] + shards[1])
+        self.assertEqual([[self.trading_pair]], self.data_source._trading_pair_shards())
+
     def test_subscribe_channels_raises_cancel_exception(self):
         mock_ws = MagicMock()
-        mock_ws.send.side_effect = asyncio.CancelledError
+        mock_ws.subscribe.side_effect = asyncio.CancelledError
 
         with self.assertRaises(asyncio.CancelledError):
             self.listening_task = self.ev_loop.create_task(self.data_source._subscribe_channels(mock_ws))
@@ -249,7 +263,7 @@ class BinanceAPIOrderBookDataSourceUnitTests(unittest.TestCase):
 
     def test_subscribe_channels_raises_exception_and_logs_error(self):
         mock_ws = MagicMock()
-        mock_ws.send.side_effect = Exception("Test Error")
+        mock_ws.subscribe.side_effect = Exception("Test Error")
 
         with self.assertRaises(Exception):
             self.listening_task = self.ev_loop.create_task(self.data_source._subscribe_channels(mock_ws))
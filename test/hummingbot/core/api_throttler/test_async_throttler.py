@@ -4,6 +4,7 @@ import math
 import sys
 import time
 import unittest
+from collections import defaultdict
 from decimal import Decimal
 from typing import Dict, List
 from unittest.mock import patch
@@ -11,7 +12,14 @@ from unittest.mock import patch
 from hummingbot.client.config.client_config_map import ClientConfigMap
 from hummingbot.client.config.config_helpers import ClientConfigAdapter
 from hummingbot.core.api_throttler.async_throttler import AsyncRequestContext, AsyncThrottler
-from hummingbot.core.api_throttler.data_types import LinkedLimitWeightPair, RateLimit, TaskLog
+from hummingbot.core.api_throttler.data_types import (
+    LinkedLimitWeightPair,
+    RateLimit,
+    RequestPriority,
+    TaskLog,
+    TaskLogWindow,
+)
+from hummingbot.core.api_throttler.priority_lanes import PriorityLanes
 from hummingbot.logger.struct_logger import METRICS_LOG_LEVEL
 
 TEST_PATH_URL = "/hummingbot"
@@ -50,6 +58,9 @@ class AsyncThrottlerUnitTests(unittest.TestCase):
         self._req_counters: Dict[str, int] = {limit.limit_id: 0 for limit in self.rate_limits}
         self.client_config_map = ClientConfigAdapter(ClientConfigMap())
 
+    def task_logs_count(self) -> int:
+        return sum(len(task_logs) for task_logs in self.throttler._task_logs.values())
+
     async def execute_requests(self, no_request: int, limit_id: str, throttler: AsyncThrottler):
         for _ in range(no_request):
             async with throttler.execute_task(limit_id=limit_id):
@@ -96,35 +107,35 @@ class AsyncThrottlerUnitTests(unittest.TestCase):
         lock = asyncio.Lock()
 
         rate_limit = self.rate_limits[0]
-        self.assertEqual(0, len(self.throttler._task_logs))
+        self.assertEqual(0, self.task_logs_count())
         context = AsyncRequestContext(task_logs=self.throttler._task_logs,
                                       rate_limit=rate_limit,
                                       related_limits=[(rate_limit, rate_limit.weight)],
                                       lock=lock,
                                       safety_margin_pct=self.throttler._safety_margin_pct)
         context.flush()
-        self.assertEqual(0, len(self.throttler._task_logs))
+        self.assertEqual(0, self.task_logs_count())
 
     def test_flush_only_elapsed_tasks_are_flushed(self):
         lock = asyncio.Lock()
         rate_limit = self.rate_limits[0]
-        self.throttler._task_logs = [
-            TaskLog(timestamp=1.0, rate_limit=rate_limit, weight=rate_limit.weight),
-            TaskLog(timestamp=time.time(), rate_limit=rate_limit, weight=rate_limit.weight)
-        ]
+        self.throttler._task_logs[rate_limit.limit_id].append(
+            TaskLog(timestamp=1.0, rate_limit=rate_limit, weight=rate_limit.weight))
+        self.throttler._task_logs[rate_limit.limit_id].append(
+            TaskLog(timestamp=time.time(), rate_limit=rate_limit, weight=rate_limit.weight))
 
-        self.assertEqual(2, len(self.throttler._task_logs))
+        self.assertEqual(2, self.task_logs_count())
         context = AsyncRequestContext(task_logs=self.throttler._task_logs,
                                       rate_limit=rate_limit,
                                       related_limits=[(rate_limit, rate_limit.weight)],
                                       lock=lock,
                                       safety_margin_pct=self.throttler._safety_margin_pct)
         context.flush()
-        self.assertEqual(1, len(self.throttler._task_logs))
+        self.assertEqual(1, self.task_logs_count())
 
     def test_within_capacity_singular_non_weighted_task_returns_false(self):
         rate_limit, _ = self.throttler.get_related_limits(limit_id=TEST_POOL_ID)
-        self.throttler._task_logs.append(
+        self.throttler._task_logs[rate_limit.limit_id].append(
             TaskLog(timestamp=time.time(), rate_limit=rate_limit, weight=rate_limit.weight))
 
         context = AsyncRequestContext(task_logs=self.throttler._task_logs,
@@ -147,7 +158,8 @@ class AsyncThrottlerUnitTests(unittest.TestCase):
         rate_limit, related_limits = self.throttler.get_related_limits(limit_id=TEST_PATH_URL)
 
         for linked_limit, weight in related_limits:
-            self.throttler._task_logs.append(TaskLog(timestamp=time.time(), rate_limit=linked_limit, weight=weight))
+            self.throttler._task_logs[linked_limit.limit_id].append(
+                TaskLog(timestamp=time.time(), rate_limit=linked_limit, weight=weight))
 
         context = AsyncRequestContext(task_logs=self.throttler._task_logs,
                                       rate_limit=rate_limit,
@@ -171,10 +183,12 @@ class AsyncThrottlerUnitTests(unittest.TestCase):
 
         # Simulate Weighted Task 1 and Task 2 already in task logs, resulting in a used capacity of 6/10
         for linked_limit, weight in task_1_related_limits:
-            self.throttler._task_logs.append(TaskLog(timestamp=time.time(), rate_limit=linked_limit, weight=weight))
+            self.throttler._task_logs[linked_limit.limit_id].append(
+                TaskLog(timestamp=time.time(), rate_limit=linked_limit, weight=weight))
         task_2, task_2_related_limits = self.throttler.get_related_limits(limit_id=TEST_WEIGHTED_TASK_2_ID)
         for linked_limit, weight in task_2_related_limits:
-            self.throttler._task_logs.append(TaskLog(timestamp=time.time(), rate_limit=linked_limit, weight=weight))
+            self.throttler._task_logs[linked_limit.limit_id].append(
+                TaskLog(timestamp=time.time(), rate_limit=linked_limit, weight=weight))
 
         # Another Task 1(weight=5) will exceed the capacity(11/10)
         context = AsyncRequestContext(task_logs=self.throttler._task_logs,
@@ -212,11 +226,11 @@ class AsyncThrottlerUnitTests(unittest.TestCase):
         self.ev_loop.run_until_complete(context.acquire())
 
         # We acquire()'d just one rate_limit, task log should have only one entry
-        self.assertEqual(1, len(self.throttler._task_logs))
+        self.assertEqual(1, self.task_logs_count())
 
     def test_acquire_awaits_when_exceed_capacity(self):
         rate_limit = self.rate_limits[0]
-        self.throttler._task_logs.append(
+        self.throttler._task_logs[rate_limit.limit_id].append(
             TaskLog(timestamp=time.time(), rate_limit=rate_limit, weight=rate_limit.weight))
         context = AsyncRequestContext(task_logs=self.throttler._task_logs,
                                       rate_limit=rate_limit,
@@ -243,9 +257,11 @@ class AsyncThrottlerUnitTests(unittest.TestCase):
         ])
 
         # Scenario where one specific task was executed at 0 milliseconds
-        tasks_log = []
-        tasks_log.append(TaskLog(timestamp=1640000000.0000, rate_limit=per_millisecond_limit, weight=1))
-        tasks_log.append(TaskLog(timestamp=1640000000.0000, rate_limit=per_second_limit, weight=1))
+        tasks_log = defaultdict(TaskLogWindow)
+        tasks_log[per_millisecond_limit.limit_id].append(
+            TaskLog(timestamp=1640000000.0000, rate_limit=per_millisecond_limit, weight=1))
+        tasks_log[per_second_limit.limit_id].append(
+            TaskLog(timestamp=1640000000.0000, rate_limit=per_second_limit, weight=1))
 
         context = AsyncRequestContext(
             task_logs=tasks_log,
@@ -260,8 +276,10 @@ class AsyncThrottlerUnitTests(unittest.TestCase):
         self.assertTrue(result)
 
         # Add one more occurrence of the same task but at millisecond 1
-        tasks_log.append(TaskLog(timestamp=1640000000.1000, rate_limit=per_millisecond_limit, weight=1))
-        tasks_log.append(TaskLog(timestamp=1640000000.1000, rate_limit=per_second_limit, weight=1))
+        tasks_log[per_millisecond_limit.limit_id].append(
+            TaskLog(timestamp=1640000000.1000, rate_limit=per_millisecond_limit, weight=1))
+        tasks_log[per_second_limit.limit_id].append(
+            TaskLog(timestamp=1640000000.1000, rate_limit=per_second_limit, weight=1))
 
         time_mock.return_value = 1640000000.1000
         result = context.within_capacity()
@@ -278,3 +296,160 @@ class AsyncThrottlerUnitTests(unittest.TestCase):
         time_mock.return_value = 1640000000.2100
         result = context.within_capacity()
         self.assertTrue(result)
+
+    def test_task_log_window_keeps_capacity_used_within_period(self):
+        rate_limit = RateLimit(limit_id="window_limit", limit=10, time_interval=1.0)
+        window = TaskLogWindow()
+        for timestamp, weight in [(100.0, 2), (100.5, 3), (101.0, 4)]:
+            window.append(TaskLog(timestamp=timestamp, rate_limit=rate_limit, weight=weight))
+
+        self.assertEqual(9, window.capacity_used)
+        # The second log has to leave the window as well to get the capacity used down to 4
+        self.assertAlmostEqual(101.5, window.capacity_freed_time(4, safety_margin_pct=0), places=5)
+        self.assertEqual(0, window.capacity_freed_time(9, safety_margin_pct=0))
+
+        window.flush(now=101.0, safety_margin_pct=0)
+        self.assertEqual(9, window.capacity_used)
+        window.flush(now=101.01, safety_margin_pct=0)
+        self.assertEqual(7, window.capacity_used)
+        self.assertEqual(2, len(window))
+
+    @patch("hummingbot.core.api_throttler.async_request_context_base.AsyncRequestContextBase._sleep")
+    @patch("hummingbot.core.api_throttler.async_throttler.AsyncRequestContext._time")
+    def test_acquire_sleeps_until_capacity_is_freed(self, time_mock, sleep_mock):
+        now = [100.0]
+        time_mock.side_effect = lambda: now[0]
+        sleep_delays = []
+
+        async def sleep(delay: float):
+            sleep_delays.append(delay)
+            now[0] += delay
+
+        sleep_mock.side_effect = sleep
+        rate_limit, _ = self.throttler.get_related_limits(limit_id=TEST_POOL_ID)
+        self.throttler._task_logs[rate_limit.limit_id].append(
+            TaskLog(timestamp=99.0, rate_limit=rate_limit, weight=rate_limit.weight))
+
+        self.ev_loop.run_until_complete(
+            asyncio.wait_for(self.throttler.execute_task(limit_id=TEST_POOL_ID).acquire(), 1.0))
+
+        # The task waits once, until the previous one leaves the 5s period extended by the 5% safety margin
+        self.assertEqual(1, len(sleep_delays))
+        self.assertAlmostEqual(4.25, sleep_delays[0], places=5)
+        self.assertEqual(1, len(self.throttler._task_logs[rate_limit.limit_id]))
+
+    def test_time_until_capacity_for_task_exceeding_limit(self):
+        throttler = AsyncThrottler(rate_limits=[RateLimit(limit_id="heavy", limit=1, time_interval=1, weight=2)])
+
+        self.assertIsNone(throttler.execute_task(limit_id="heavy").time_until_capacity())
+        self.assertEqual(0, self.throttler.execute_task(limit_id=TEST_POOL_ID).time_until_capacity())
+
+    @staticmethod
+    async def _yield_to_event_loop(delay: float):
+        # The tasks waiting for capacity only yield to the event loop, the time is advanced by the test
+        await asyncio.sleep(0)
+
+    @patch("hummingbot.core.api_throttler.async_request_context_base.AsyncRequestContextBase._sleep")
+    @patch("hummingbot.core.api_throttler.async_throttler.AsyncRequestContext._time")
+    def test_higher_priority_tasks_served_first_when_capacity_is_reached(self, time_mock, sleep_mock):
+        now = [100.0]
+        time_mock.side_effect = lambda: now[0]
+        sleep_mock.side_effect = self._yield_to_event_loop
+        throttler = AsyncThrottler(rate_limits=[RateLimit(limit_id="orders", limit=1, time_interval=1),
+                                                RateLimit(limit_id="other", limit=1, time_interval=1)],
+                                   safety_margin_pct=0)
+        rate_limit, _ = throttler.get_related_limits(limit_id="orders")
+        throttler._task_logs["orders"].append(TaskLog(timestamp=100.0, rate_limit=rate_limit, weight=1))
+        served = []
+
+        async def execute(limit_id: str, priority: RequestPriority):
+            async with throttler.execute_task(limit_id=limit_id, priority=priority):
+                served.append((limit_id, priority))
+
+        def run_pending_tasks():
+            for _ in range(10):
+                self.ev_loop.run_until_complete(asyncio.sleep(0))
+
+        status_task = self.ev_loop.create_task(execute("orders", RequestPriority.STATUS))
+        run_pending_tasks()
+        cancel_task = self.ev_loop.create_task(execute("orders", RequestPriority.CANCEL))
+        run_pending_tasks()
+        # The market data request uses another limit, it is not deferred by the cancel
+        self.ev_loop.run_until_complete(asyncio.wait_for(execute("other", RequestPriority.MARKET_DATA), 1))
+
+        self.assertEqual([("other", RequestPriority.MARKET_DATA)], served)
+        self.assertEqual(1, throttler.lane_stats["CANCEL"]["waiting"])
+
+        # The status request waiting first is deferred by the cancel once capacity is freed
+        now[0] = 101.5
+        self.ev_loop.run_until_complete(asyncio.wait_for(cancel_task, 1))
+        run_pending_tasks()
+        self.assertFalse(status_task.done())
+        now[0] = 103.0
+        self.ev_loop.run_until_complete(asyncio.wait_for(status_task, 1))
+
+        self.assertEqual([RequestPriority.MARKET_DATA, RequestPriority.CANCEL, RequestPriority.STATUS],
+                         [priority for _, priority in served])
+        stats = throttler.lane_stats
+        self.assertEqual(1, stats["CANCEL"]["served"])
+        self.assertEqual(0, stats["CANCEL"]["waiting"])
+        self.assertEqual(0, stats["STATUS"]["waiting"])
+        self.assertAlmostEqual(1500., stats["CANCEL"]["wait_time"]["max"], delta=1)
+        self.assertAlmostEqual(3000., stats["STATUS"]["wait_time"]["max"], delta=1)
+        self.assertEqual(0., stats["MARKET_DATA"]["wait_time"]["max"])
+
+        throttler.reset_lane_stats()
+        self.assertEqual(0, throttler.lane_stats["CANCEL"]["served"])
+
+    @patch("hummingbot.core.api_throttler.async_request_context_base.AsyncRequestContextBase._sleep")
+    def test_task_that_can_never_fit_does_not_defer_lower_priorities(self, sleep_mock):
+        sleep_mock.side_effect = self._yield_to_event_loop
+        throttler = AsyncThrottler(
+            rate_limits=[RateLimit(limit_id="REQUEST_WEIGHT", limit=10, time_interval=60),
+                         RateLimit(limit_id="heavy", limit=100, time_interval=60,
+                                   linked_limits=[LinkedLimitWeightPair("REQUEST_WEIGHT", 6)]),
+                         RateLimit(limit_id="light", limit=100, time_interval=60,
+                                   linked_limits=[LinkedLimitWeightPair("REQUEST_WEIGHT", 1)])],
+            reserved_capacity_pct={RequestPriority.CANCEL: 0.5})
+
+        # Only 5 of the 10 request weight can be used below the cancels, the heavy request never fits
+        heavy_task = self.ev_loop.create_task(
+            throttler.execute_task(limit_id="heavy", priority=RequestPriority.CREATE).acquire())
+        for _ in range(10):
+            self.ev_loop.run_until_complete(asyncio.sleep(0))
+        self.ev_loop.run_until_complete(asyncio.wait_for(
+            throttler.execute_task(limit_id="light", priority=RequestPriority.STATUS).acquire(), 1))
+
+        self.assertFalse(heavy_task.done())
+        self.assertEqual(0, throttler.lane_stats["CREATE"]["waiting"])
+        self.assertEqual(1, throttler.lane_stats["STATUS"]["served"])
+        heavy_task.cancel()
+
+    def test_reserved_capacity_only_usable_by_higher_priorities(self):
+        throttler = AsyncThrottler(rate_limits=[RateLimit(limit_id="orders", limit=4, time_interval=5)],
+                                   reserved_capacity_pct={RequestPriority.CANCEL: 0.25, RequestPriority.CREATE: 0.25})
+        rate_limit, _ = throttler.get_related_limits(limit_id="orders")
+        throttler._task_logs["orders"].append(TaskLog(timestamp=time.time(), rate_limit=rate_limit, weight=2))
+
+        self.assertFalse(throttler.execute_task(limit_id="orders", priority=RequestPriority.STATUS).within_capacity())
+        self.assertTrue(throttler.execute_task(limit_id="orders", priority=RequestPriority.CREATE).within_capacity())
+        self.assertTrue(throttler.execute_task(limit_id="orders", priority=RequestPriority.CANCEL).within_capacity())
+        self.assertEqual(0.25, throttler.lane_stats["CREATE"]["reserved_capacity_pct"])
+
+        throttler._task_logs["orders"].append(TaskLog(timestamp=time.time(), rate_limit=rate_limit, weight=1))
+
+        self.assertFalse(throttler.execute_task(limit_id="orders", priority=RequestPriority.CREATE).within_capacity())
+        self.assertTrue(throttler.execute_task(limit_id="orders", priority=RequestPriority.CANCEL).within_capacity())
+
+    def test_priority_lanes_usable_limits(self):
+        lanes = PriorityLanes({RequestPriority.CANCEL: 0.1, RequestPriority.STATUS: 0.2})
+
+        self.assertEqual(10, lanes.usable_limit(10, RequestPriority.CANCEL))
+        self.assertEqual(9, lanes.usable_limit(10, RequestPriority.CREATE))
+        self.assertEqual(9, lanes.usable_limit(10, RequestPriority.STATUS))
+        self.assertEqual(7, lanes.usable_limit(10, RequestPriority.MARKET_DATA))
+        # Too small limits to reserve a part of them
+        self.assertEqual(1, lanes.usable_limit(1, RequestPriority.MARKET_DATA))
+
+        with self.assertRaises(ValueError):
+            lanes.set_reserved_capacity_pct({RequestPriority.CANCEL: 0.5, RequestPriority.CREATE: 0.5})
@@ -2,7 +2,17 @@
 
 import logging
 import unittest
+from types import SimpleNamespace
+from hummingbot.core.data_type.common import TradeType
+from hummingbot.core.data_type.composite_order_book import CompositeOrderBook
 from hummingbot.core.data_type.order_book import OrderBook
+from hummingbot.core.data_type.order_book_message import (
+    CompactOrderBookMessage,
+    OrderBookMessage,
+    OrderBookMessageType,
+)
+from hummingbot.core.event.event_logger import EventLogger
+from hummingbot.core.event.events import OrderBookBBOChangedEvent, OrderBookEvent
 import numpy as np
 
 
@@ -50,6 +60,225 @@ class OrderBookUnitTest(unittest.TestCase):
         self.assertEqual(best_bid, [50., 0.01, 6.])
         self.assertEqual(best_ask, 0)
 
+    def _build_depth_order_book(self, depth_index_enabled: bool) -> OrderBook:
+        order_book = OrderBook()
+        order_book.depth_index_enabled = depth_index_enabled
+        bids_array = np.array([[10, 1, 1], [9, 2, 1], [8, 3, 1]], dtype=np.float64)
+        asks_array = np.array([[11, 1, 1], [12, 2, 1], [13, 3, 1]], dtype=np.float64)
+        order_book.apply_numpy_snapshot(bids_array, asks_array)
+        return order_book
+
+    def test_volume_queries(self):
+        for depth_index_enabled in (False, True):
+            order_book = self._build_depth_order_book(depth_index_enabled)
+
+            result = order_book.get_price_for_volume(True, 2)
+            self.assertEqual(12, result.result_price)
+            self.assertEqual(2, result.result_volume)
+            result = order_book.get_price_for_volume(False, 10)
+            self.assertTrue(np.isnan(result.result_price))
+            self.assertEqual(6, result.result_volume)
+
+            result = order_book.get_vwap_for_volume(True, 2)
+            self.assertAlmostEqual(11.5, result.result_price)
+            result = order_book.get_vwap_for_volume(False, 4)
+            self.assertAlmostEqual(36 / 4, result.result_price)
+            self.assertTrue(np.isnan(order_book.get_vwap_for_volume(True, 7).result_price))
+
+            result = order_book.get_price_for_quote_volume(True, 35)
+            self.assertEqual(12, result.result_price)
+            result = order_book.get_quote_volume_for_base_amount(False, 2)
+            self.assertEqual(19, result.result_volume)
+            result = order_book.get_quote_volume_for_base_amount(True, 10)
+            self.assertEqual(74, result.result_volume)
+
+            result = order_book.get_volume_for_price(True, 12.5)
+            self.assertEqual(12, result.result_price)
+            self.assertEqual(3, result.result_volume)
+            result = order_book.get_volume_for_price(False, 10.5)
+            self.assertTrue(np.isnan(result.result_price))
+            self.assertEqual(0, result.result_volume)
+            result = order_book.get_quote_volume_for_price(False, 9)
+            self.assertEqual(9, result.result_price)
+            self.assertEqual(28, result.result_volume)
+
+    def test_depth_index_invalidated_by_diffs(self):
+        order_book = self._build_depth_order_book(depth_index_enabled=True)
+        self.assertEqual(12, order_book.get_price_for_volume(True, 2).result_price)
+
+        order_book.apply_numpy_diffs(np.array([[9, 0, 2]], dtype=np.float64),
+                                     np.array([[11, 5, 2]], dtype=np.float64))
+
+        self.assertEqual(11, order_book.get_price_for_volume(True, 2).result_price)
+        self.assertEqual(8, order_book.get_price_for_volume(False, 2).result_price)
+
+    def test_composite_order_book_depth_index_always_enabled(self):
+        order_book = CompositeOrderBook()
+        order_book.apply_numpy_snapshot(np.array([[100, 10, 1]], dtype=np.float64),
+                                        np.array([[101, 10, 1], [102, 10, 1]], dtype=np.float64))
+        order_book.record_filled_order(SimpleNamespace(trade_type=TradeType.BUY, price=101., amount=8, timestamp=2.))
+
+        self.assertEqual(102, order_book.get_price_for_volume(True, 5).result_price)
+        with self.assertRaises(ValueError):
+            order_book.depth_index_enabled = False
+        self.assertTrue(order_book.depth_index_enabled)
+        self.assertEqual(102, order_book.get_price_for_volume(True, 5).result_price)
+
+    def test_depth_arrays(self):
+        order_book = self._build_depth_order_book(depth_index_enabled=False)
+
+        bids, asks = order_book.depth_arrays(2)
+        self.assertEqual((2, len(OrderBook.DEPTH_ARRAY_COLUMNS)), bids.shape)
+        self.assertEqual([[10., 1., 1., 1.], [9., 2., 1., 3.]], bids.tolist())
+        self.assertEqual([[11., 1., 1., 1.], [12., 2., 1., 3.]], asks.tolist())
+
+        bids, asks = order_book.depth_arrays()
+        self.assertEqual(3, len(bids))
+        self.assertEqual([13., 3., 1., 6.], asks[-1].tolist())
+
+        bids_df, asks_df = order_book.snapshot
+        order_book.depth_arrays(1)
+        self.assertEqual([10., 9., 8.], bids_df["price"].tolist())
+        self.assertEqual([11., 12., 13.], asks_df["price"].tolist())
+
+    def test_apply_raw_snapshot_and_diffs(self):
+        order_book = OrderBook()
+        order_book.apply_raw_snapshot(
+            bids=[["10.5", "1.25"], ["10.0", "2", "ignored"]],
+            asks=[[11, 1.5], ["11.5", " 3 "]],
+            update_id=1)
+        self.assertEqual([[10.5, 1.25, 1.], [10., 2., 1.]], order_book.snapshot[0].values.tolist())
+        self.assertEqual([[11., 1.5, 1.], [11.5, 3., 1.]], order_book.snapshot[1].values.tolist())
+
+        order_book.apply_raw_diffs(bids=[["10.5", "0"]], asks=[["10.75", "0.1"]], update_id=2)
+        self.assertEqual(10., order_book.get_price(False))
+        self.assertEqual(10.75, order_book.get_price(True))
+        self.assertEqual(2, order_book.last_diff_uid)
+
+        with self.assertRaises(ValueError):
+            order_book.apply_raw_diffs(bids=[["invalid", "1"]], asks=[], update_id=3)
+
+    def test_apply_compact_messages(self):
+        order_book = OrderBook()
+        order_book.apply_snapshot_message(CompactOrderBookMessage(
+            OrderBookMessageType.SNAPSHOT,
+            {"update_id": 1, "bids": [["10.5", "1.25"], ["10", "2"]], "asks": [["11", "1.5"]]},
+            timestamp=1.0))
+        order_book.apply_diff_message(CompactOrderBookMessage(
+            OrderBookMessageType.DIFF,
+            {"update_id": 2, "bids": [["10.5", "0"]], "asks": [["10.75", "0.1"]]},
+            timestamp=2.0))
+
+        self.assertEqual([[10., 2., 1.]], order_book.snapshot[0].values.tolist())
+        self.assertEqual([[10.75, 0.1, 2.], [11., 1.5, 1.]], order_book.snapshot[1].values.tolist())
+        self.assertEqual(2, order_book.last_diff_uid)
+
+
+    def test_bbo_changed_events(self):
+        order_book = OrderBook()
+        order_book.apply_raw_snapshot(bids=[["10", "1"], ["9", "1"]], asks=[["11", "1"]], update_id=1)
+        event_logger = EventLogger()
+        order_book.add_listener(OrderBookEvent.BBOChangedEvent, event_logger)
+
+        # Changes below the top of the book do not fire events
+        order_book.apply_raw_diffs(bids=[["9", "2"]], asks=[["12", "1"]], update_id=2)
+        self.assertEqual(0, len(event_logger.event_log))
+
+        order_book.apply_raw_diffs(bids=[["10", "3"]], asks=[], update_id=3)
+        order_book.apply_raw_snapshot(bids=[["10", "3"]], asks=[["10.5", "2"]], update_id=4)
+        order_book.apply_raw_diffs(bids=[["10", "0"]], asks=[], update_id=5)
+
+        self.assertEqual(3, len(event_logger.event_log))
+        first_event, second_event, third_event = event_logger.event_log
+        self.assertIsInstance(first_event, OrderBookBBOChangedEvent)
+        self.assertEqual((3, 10., 3., 11., 1.), first_event[1:])
+        self.assertEqual((4, 10., 3., 10.5, 2.), second_event[1:])
+        self.assertEqual(5, third_event.update_id)
+        self.assertTrue(np.isnan(third_event.best_bid_price))
+        self.assertTrue(np.isnan(third_event.best_bid_amount))
+
+        order_book.remove_listener(OrderBookEvent.BBOChangedEvent, event_logger)
+        order_book.apply_raw_diffs(bids=[["10", "1"]], asks=[], update_id=6)
+        self.assertEqual(3, len(event_logger.event_log))
+
+
+    def test_max_depth_levels(self):
+        order_book = OrderBook()
+        order_book.max_depth_levels = 2
+        order_book.apply_raw_snapshot(bids=[["10", "1"], ["9", "1"], ["8", "1"], ["7", "1"], ["6", "1"]],
+                                      asks=[["11", "1"], ["12", "1"], ["13", "1"], ["14", "1"], ["15", "1"]],
+                                      update_id=1)
+        self.assertEqual([10., 9.], order_book.snapshot[0]["price"].tolist())
+        self.assertEqual([11., 12.], order_book.snapshot[1]["price"].tolist())
+        self.assertEqual([10., 9.], [row.price for row in order_book.bid_entries()])
+        self.assertEqual([11., 12.], [row.price for row in order_book.ask_entries()])
+
+        # Diffs for trimmed levels are ignored, the rest of the book is kept trimmed around the mid
+        order_book.apply_raw_diffs(bids=[["10", "0"], ["6", "5"], ["9.5", "2"]],
+                                   asks=[["13", "0"], ["11.5", "3"], ["15", "1"]],
+                                   update_id=2)
+        self.assertEqual([[9.5, 2., 2.], [9., 1., 1.]], order_book.snapshot[0].values.tolist())
+        self.assertEqual([[11., 1., 1.], [11.5, 3., 2.]], order_book.snapshot[1].values.tolist())
+
+        # Levels removed inside the shown depth are refilled from the hidden margin
+        order_book.apply_raw_diffs(bids=[["9.5", "0"], ["9", "0"]], asks=[["11", "0"]], update_id=3)
+        self.assertEqual([8., 7.], order_book.snapshot[0]["price"].tolist())
+        self.assertEqual([11.5, 12.], order_book.snapshot[1]["price"].tolist())
+        self.assertFalse(order_book.trimmed_depth_exhausted)
+
+        # A new snapshot makes every level known again
+        order_book.apply_raw_snapshot(bids=[["8", "1"], ["7", "1"]], asks=[["13", "1"]], update_id=4)
+        order_book.apply_raw_diffs(bids=[["6", "1"]], asks=[["14", "1"]], update_id=5)
+        self.assertEqual([8., 7.], order_book.snapshot[0]["price"].tolist())
+        self.assertEqual([13., 14.], order_book.snapshot[1]["price"].tolist())
+
+        order_book.max_depth_levels = 1
+        self.assertEqual([8.], order_book.snapshot[0]["price"].tolist())
+        self.assertEqual([13.], order_book.snapshot[1]["price"].tolist())
+
+        with self.assertRaises(ValueError):
+            order_book.max_depth_levels = -1
+
+    def test_trimmed_depth_exhausted(self):
+        order_book = OrderBook()
+        order_book.max_depth_levels = 2
+        order_book.apply_raw_snapshot(bids=[["100", "1"], ["99", "1"]],
+                                      asks=[["101", "1"], ["102", "1"], ["103", "1"], ["104", "1"], ["105", "1"]],
+                                      update_id=1)
+        self.assertFalse(order_book.trimmed_depth_exhausted)
+
+        # The hidden margin still has enough levels to show
+        order_book.apply_raw_diffs(bids=[], asks=[["101", "0"], ["102", "0"]], update_id=2)
+        self.assertEqual([103., 104.], order_book.snapshot[1]["price"].tolist())
+        self.assertFalse(order_book.trimmed_depth_exhausted)
+
+        # The new level is beyond the trim price, so the asks run out
+        order_book.apply_raw_diffs(bids=[], asks=[["103", "0"], ["105.5", "2"]], update_id=3)
+        self.assertEqual([104.], order_book.snapshot[1]["price"].tolist())
+        self.assertTrue(order_book.trimmed_depth_exhausted)
+
+        order_book.apply_raw_snapshot(bids=[["100", "1"]], asks=[["103", "1"]], update_id=3)
+        self.assertFalse(order_book.trimmed_depth_exhausted)
+
+    def test_apply_diff_messages(self):
+        order_book = OrderBook()
+        order_book.apply_raw_snapshot(bids=[["10", "1"], ["9", "1"]], asks=[["11", "1"]], update_id=1)
+        order_book.apply_diff_messages([
+            OrderBookMessage(OrderBookMessageType.DIFF,
+                             {"update_id": 3, "bids": [["10", "0"], ["9.5", "2"]], "asks": [["11", "4"]]},
+                             timestamp=3.),
+            CompactOrderBookMessage(OrderBookMessageType.DIFF,
+                                    {"update_id": 2, "bids": [["10", "3"]], "asks": []},
+                                    timestamp=2.),
+            OrderBookMessage(OrderBookMessageType.DIFF,
+                             {"update_id": 4, "bids": [["9.5", "0"]], "asks": [["11", "5"], ["12", "1"]]},
+                             timestamp=4.),
+        ])
+
+        self.assertEqual([[10., 3., 2.], [9., 1., 1.]], order_book.snapshot[0].values.tolist())
+        self.assertEqual([[11., 5., 4.], [12., 1., 4.]], order_book.snapshot[1].values.tolist())
+        self.assertEqual(4, order_book.last_diff_uid)
+
 
 def main():
     logging.basicConfig(level=logging.INFO)
@@ -1,8 +1,11 @@
 import time
 import unittest
 
-from hummingbot.core.data_type.order_book_message import OrderBookMessage, \
-    OrderBookMessageType
+from hummingbot.core.data_type.order_book_message import (
+    CompactOrderBookMessage,
+    OrderBookMessage,
+    OrderBookMessageType,
+)
 from hummingbot.core.data_type.order_book_row import OrderBookRow
 
 
@@ -248,3 +251,64 @@ class OrderBookMessageTest(unittest.TestCase):
         self.assertTrue(diff1 < snapshot2)  # based on id
         self.assertTrue(trade1 < snapshot1)  # based on timestamp
         self.assertTrue(diff2 < trade1)  # if same ts, ob messages < trade messages
+
+    def test_has_raw_levels(self):
+        msg = OrderBookMessage(
+            message_type=OrderBookMessageType.DIFF,
+            content={"update_id": 1, "bids": [["1", "2"]], "asks": []},
+            timestamp=time.time(),
+        )
+        self.assertTrue(msg.has_raw_levels)
+
+        msg = OrderBookMessage(
+            message_type=OrderBookMessageType.TRADE,
+            content={"trade_id": 1},
+            timestamp=time.time(),
+        )
+        self.assertFalse(msg.has_raw_levels)
+
+        class CustomLevelsMessage(OrderBookMessage):
+            @property
+            def bids(self):
+                return []
+
+        msg = CustomLevelsMessage(
+            message_type=OrderBookMessageType.DIFF,
+            content={"update_id": 1, "bids": [["1", "2"]], "asks": []},
+            timestamp=time.time(),
+        )
+        self.assertFalse(msg.has_raw_levels)
+
+    def test_compact_message(self):
+        msg = OrderBookMessage(
+            message_type=OrderBookMessageType.DIFF,
+            content={"trading_pair": "COINALPHA-HBOT",
+                     "update_id": 5,
+                     "first_update_id": 3,
+                     "bids": [["10.5", "1"], ["10", "0"]],
+                     "asks": [["11", "2.5"]]},
+            timestamp=1640001112.223,
+        )
+        compact = CompactOrderBookMessage.from_message(msg)
+
+        self.assertEqual("COINALPHA-HBOT", compact.trading_pair)
+        self.assertEqual(5, compact.update_id)
+        self.assertEqual(3, compact.first_update_id)
+        self.assertEqual(-1, compact.trade_id)
+        self.assertTrue(compact.has_update_id)
+        self.assertTrue(compact.has_level_arrays)
+        self.assertFalse(compact.has_raw_levels)
+        self.assertNotIn("bids", compact.content)
+        self.assertEqual([[10.5, 1.], [10., 0.]], compact.bids_array.tolist())
+        self.assertEqual([[11., 2.5]], compact.asks_array.tolist())
+        self.assertEqual(msg.bids, compact.bids)
+        self.assertEqual(msg.asks, compact.asks)
+        self.assertEqual(msg, compact)
+        self.assertFalse(hasattr(compact, "__dict__"))
+
+        snapshot = CompactOrderBookMessage(OrderBookMessageType.SNAPSHOT,
+                                           {"update_id": 6, "bids": [], "asks": []},
+                                           timestamp=1640001112.223)
+        self.assertEqual(-1, snapshot.first_update_id)
+        self.assertEqual((0, 2), snapshot.bids_array.shape)
+        self.assertTrue(compact < snapshot)
@@ -0,0 +1,506 @@
+import asyncio
+import time
+import unittest
+from typing import Any, Awaitable, Dict, List, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+
+from hummingbot.connector.test_support.network_mocking_assistant import NetworkMockingAssistant
+from hummingbot.core.data_type.common import TradeType
+from hummingbot.core.data_type.order_book import OrderBook
+from hummingbot.core.data_type.order_book_message import OrderBookMessage, OrderBookMessageType
+from hummingbot.core.data_type.order_book_tracker import OrderBookTracker
+from hummingbot.core.data_type.order_book_tracker_data_source import OrderBookTrackerDataSource
+from hummingbot.core.web_assistant.connections.data_types import WSJSONRequest, WSResponse
+from hummingbot.core.web_assistant.connections.ws_connection import WSConnection
+from hummingbot.core.web_assistant.ws_assistant import WSAssistant
+
+
+class OrderBookTrackerTests(unittest.TestCase):
+    level = 0
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.ev_loop = asyncio.get_event_loop()
+        cls.trading_pair = "COINALPHA-HBOT"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.data_source = MagicMock()
+        self.data_source.get_order_book_snapshot_message = AsyncMock()
+        self.tracker = OrderBookTracker(data_source=self.data_source, trading_pairs=[self.trading_pair])
+        self.tracker._sleep = AsyncMock()
+        self.tracking_task = None
+
+        order_book = OrderBook()
+        order_book.apply_snapshot_message(self._snapshot(update_id=10, bids=[["10", "1"]], asks=[["11", "1"]]))
+        self.tracker._order_books[self.trading_pair] = order_book
+        self.tracker._tracking_message_queues[self.trading_pair] = asyncio.Queue()
+
+    def tearDown(self) -> None:
+        self.tracking_task and self.tracking_task.cancel()
+        super().tearDown()
+
+    def async_run_with_timeout(self, coroutine: Awaitable, timeout: float = 1):
+        ret = self.ev_loop.run_until_complete(asyncio.wait_for(coroutine, timeout))
+        return ret
+
+    def _snapshot(self, update_id: int, bids: List[List[str]], asks: List[List[str]]) -> OrderBookMessage:
+        return OrderBookMessage(
+            OrderBookMessageType.SNAPSHOT,
+            {"trading_pair": self.trading_pair, "update_id": update_id, "bids": bids, "asks": asks},
+            timestamp=float(update_id))
+
+    def _diff(self, first_update_id: int, update_id: int, bids: List[List[str]], asks: List[List[str]]):
+        return OrderBookMessage(
+            OrderBookMessageType.DIFF,
+            {"trading_pair": self.trading_pair,
+             "first_update_id": first_update_id,
+             "update_id": update_id,
+             "bids": bids,
+             "asks": asks},
+            timestamp=float(update_id))
+
+    def _process_messages(self, messages: List[OrderBookMessage]):
+        queue = self.tracker._tracking_message_queues[self.trading_pair]
+        for message in messages:
+            queue.put_nowait(self.tracker._compact_message(message))
+        self.tracking_task = self.ev_loop.create_task(self.tracker._track_single_book(self.trading_pair))
+        self.async_run_with_timeout(self._wait_for_empty_queue(queue))
+
+    @staticmethod
+    async def _wait_for_empty_queue(queue: asyncio.Queue):
+        while not queue.empty():
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    def test_contiguous_diffs_are_applied_without_resync(self):
+        self._process_messages([
+            self._diff(first_update_id=8, update_id=9, bids=[["10", "5"]], asks=[]),
+            self._diff(first_update_id=9, update_id=12, bids=[["10", "2"]], asks=[]),
+            self._diff(first_update_id=13, update_id=13, bids=[], asks=[["11", "3"]]),
+        ])
+
+        order_book = self.tracker.order_books[self.trading_pair]
+        bids, asks = order_book.snapshot
+        self.assertEqual([[10., 2., 12.]], bids.values.tolist())
+        self.assertEqual([[11., 3., 13.]], asks.values.tolist())
+        self.assertEqual({}, self.tracker.sequence_gaps)
+        self.data_source.get_order_book_snapshot_message.assert_not_called()
+
+    def test_gap_in_diffs_resyncs_only_affected_order_book(self):
+        self.data_source.get_order_book_snapshot_message.side_effect = [
+            self._snapshot(update_id=13, bids=[["9", "1"]], asks=[["12", "1"]]),
+            self._snapshot(update_id=20, bids=[["9.5", "1"]], asks=[["12", "2"]]),
+        ]
+
+        self._process_messages([
+            self._diff(first_update_id=11, update_id=11, bids=[["10", "5"]], asks=[]),
+            self._diff(first_update_id=15, update_id=21, bids=[["9.5", "4"]], asks=[]),
+            self._diff(first_update_id=18, update_id=19, bids=[["8", "1"]], asks=[]),
+            self._diff(first_update_id=22, update_id=22, bids=[], asks=[["11.5", "1"]]),
+        ])
+
+        order_book = self.tracker.order_books[self.trading_pair]
+        bids, asks = order_book.snapshot
+        self.assertEqual([[9.5, 4., 21.]], bids.values.tolist())
+        self.assertEqual([[11.5, 1., 22.], [12., 2., 20.]], asks.values.tolist())
+        # The first snapshot was older than the gap, so a second one was requested
+        self.assertEqual(2, self.data_source.get_order_book_snapshot_message.await_count)
+        self.data_source.get_order_book_snapshot_message.assert_awaited_with(self.trading_pair)
+        self.assertEqual({self.trading_pair: 1}, self.tracker.sequence_gaps)
+        self.assertEqual(1, len(self.tracker.resync_latencies[self.trading_pair]))
+        self.assertEqual(2, len(self.tracker._past_diffs_windows[self.trading_pair]))
+
+    def test_diffs_without_first_update_id_are_not_checked(self):
+        diff = OrderBookMessage(
+            OrderBookMessageType.DIFF,
+            {"trading_pair": self.trading_pair, "update_id": 50, "bids": [["10", "3"]], "asks": []},
+            timestamp=50.)
+
+        self._process_messages([diff])
+
+        order_book = self.tracker.order_books[self.trading_pair]
+        self.assertEqual([[10., 3., 50.]], order_book.snapshot[0].values.tolist())
+        self.assertEqual({}, self.tracker.sequence_gaps)
+
+    def test_init_order_books_concurrently_with_bounded_requests(self):
+        trading_pairs = [f"COIN{index}-HBOT" for index in range(5)]
+        self.tracker = OrderBookTracker(data_source=self.data_source, trading_pairs=trading_pairs)
+        self.tracker.ORDER_BOOK_INIT_CONCURRENCY = 2
+        self.tracker._sleep = AsyncMock()
+        requests_in_progress = []
+        max_requests_in_progress = []
+        first_snapshot_released = asyncio.Event()
+
+        async def get_new_order_book(trading_pair: str) -> OrderBook:
+            requests_in_progress.append(trading_pair)
+            max_requests_in_progress.append(len(requests_in_progress))
+            if trading_pair == trading_pairs[0]:
+                await first_snapshot_released.wait()
+            else:
+                await asyncio.sleep(0)
+            requests_in_progress.remove(trading_pair)
+            return OrderBook()
+
+        self.data_source.get_new_order_book = get_new_order_book
+
+        init_task = self.ev_loop.create_task(self.tracker._init_order_books())
+        self.async_run_with_timeout(self.tracker.wait_for_order_book(trading_pairs[4]))
+
+        self.assertFalse(self.tracker.ready)
+        self.assertFalse(self.tracker.is_order_book_ready(trading_pairs[0]))
+        self.assertEqual(trading_pairs[1:], self.tracker.ready_trading_pairs)
+        self.assertIn(trading_pairs[1], self.tracker._tracking_message_queues)
+
+        first_snapshot_released.set()
+        self.async_run_with_timeout(init_task)
+
+        self.assertTrue(self.tracker.ready)
+        self.assertEqual(trading_pairs, self.tracker.ready_trading_pairs)
+        self.assertEqual(2, max(max_requests_in_progress))
+        for task in self.tracker._tracking_tasks.values():
+            task.cancel()
+
+    def test_init_order_books_retries_failed_snapshot(self):
+        self.tracker._order_books.clear()
+        self.tracker._tracking_message_queues.clear()
+        self.data_source.get_new_order_book = AsyncMock(side_effect=[IOError("Test error"), OrderBook()])
+
+        self.async_run_with_timeout(self.tracker._init_order_books())
+
+        self.assertTrue(self.tracker.ready)
+        self.assertTrue(self.tracker.is_order_book_ready(self.trading_pair))
+        self.assertEqual(2, self.data_source.get_new_order_book.await_count)
+        self.tracker._sleep.assert_awaited_with(self.tracker.ORDER_BOOK_INIT_RETRY_INTERVAL)
+        self.tracker._tracking_tasks[self.trading_pair].cancel()
+
+    def test_max_depth_levels_per_trading_pair(self):
+        other_trading_pair = "COINBETA-HBOT"
+        self.tracker._trading_pairs.append(other_trading_pair)
+        self.tracker._order_books.clear()
+        self.tracker._tracking_message_queues.clear()
+        self.data_source.get_new_order_book = AsyncMock(side_effect=lambda trading_pair: OrderBook())
+        self.tracker.set_max_depth_levels(100)
+        self.tracker.set_max_depth_levels(20, trading_pair=other_trading_pair)
+
+        self.async_run_with_timeout(self.tracker._init_order_books())
+
+        self.assertEqual(100, self.tracker.order_books[self.trading_pair].max_depth_levels)
+        self.assertEqual(20, self.tracker.order_books[other_trading_pair].max_depth_levels)
+
+        self.tracker.set_max_depth_levels(50)
+
+        self.assertEqual(50, self.tracker.order_books[self.trading_pair].max_depth_levels)
+        self.assertEqual(20, self.tracker.order_books[other_trading_pair].max_depth_levels)
+        for task in self.tracker._tracking_tasks.values():
+            task.cancel()
+
+    def test_trimmed_order_book_resynced_when_market_moves_through_trim_price(self):
+        order_book = self.tracker.order_books[self.trading_pair]
+        order_book.max_depth_levels = 2
+        order_book.apply_snapshot_message(self._snapshot(
+            update_id=10,
+            bids=[["100", "1"], ["99", "1"]],
+            asks=[["101", "1"], ["102", "1"], ["103", "1"], ["104", "1"], ["105", "1"]]))
+        self.data_source.get_order_book_snapshot_message.return_value = self._snapshot(
+            update_id=11, bids=[["100", "1"], ["99", "1"]], asks=[["104", "1"], ["105", "1"], ["105.5", "2"]])
+
+        self._process_messages([
+            self._diff(first_update_id=11, update_id=11, bids=[],
+                       asks=[["101", "0"], ["102", "0"], ["103", "0"], ["105.5", "2"]]),
+            self._diff(first_update_id=12, update_id=12, bids=[], asks=[["105", "3"]]),
+        ])
+
+        self.assertEqual([[104., 1., 11.], [105., 3., 12.]], order_book.snapshot[1].values.tolist())
+        self.assertFalse(order_book.trimmed_depth_exhausted)
+        self.data_source.get_order_book_snapshot_message.assert_awaited_once_with(self.trading_pair)
+        # Running out of levels is not a gap in the diffs
+        self.assertEqual({}, self.tracker.sequence_gaps)
+
+    def test_trimmed_order_book_not_resynced_when_hidden_levels_remain(self):
+        order_book = self.tracker.order_books[self.trading_pair]
+        order_book.max_depth_levels = 3
+        order_book.apply_snapshot_message(self._snapshot(
+            update_id=10,
+            bids=[[str(100 - level), "1"] for level in range(8)],
+            asks=[[str(101 + level), "1"] for level in range(8)]))
+
+        self._process_messages([
+            self._diff(first_update_id=11, update_id=11, bids=[["99", "0"]], asks=[]),
+        ])
+
+        self.assertEqual([100., 98., 97.], order_book.snapshot[0]["price"].tolist())
+        self.assertFalse(order_book.trimmed_depth_exhausted)
+        self.data_source.get_order_book_snapshot_message.assert_not_called()
+
+    def test_queued_diffs_are_coalesced_above_threshold(self):
+        self.tracker.coalesce_diffs_threshold = 2
+        self.data_source.get_order_book_snapshot_message.return_value = self._snapshot(
+            update_id=30, bids=[["9", "1"]], asks=[["12", "1"]])
+
+        self._process_messages([
+            self._diff(first_update_id=11, update_id=11, bids=[["10", "5"]], asks=[]),
+            self._diff(first_update_id=12, update_id=12, bids=[["10", "0"], ["9", "1"]], asks=[]),
+            self._diff(first_update_id=13, update_id=13, bids=[["9", "2"]], asks=[["11", "2"]]),
+            self._diff(first_update_id=15, update_id=31, bids=[], asks=[["11.5", "1"]]),
+            self._diff(first_update_id=32, update_id=32, bids=[["9.5", "1"]], asks=[]),
+        ])
+
+        order_book = self.tracker.order_books[self.trading_pair]
+        self.assertEqual([[9.5, 1., 32.], [9., 1., 30.]], order_book.snapshot[0].values.tolist())
+        self.assertEqual([[11.5, 1., 31.], [12., 1., 30.]], order_book.snapshot[1].values.tolist())
+        # The first three diffs were merged, the one after the gap triggered a resync
+        self.assertEqual({self.trading_pair: 1}, self.tracker.sequence_gaps)
+        stats = self.tracker.diff_queue_stats[self.trading_pair]
+        self.assertEqual(0, stats["queue_depth"])
+        self.assertEqual(4, stats["max_queue_depth"])
+        self.assertEqual(4, stats["diffs_applied"])
+        self.assertEqual(2., stats["coalescing_ratio"])
+
+    def test_direct_dispatch_resyncs_and_applies_pending_messages_in_order(self):
+        self.tracker.direct_dispatch = True
+        self.data_source.get_order_book_snapshot_message.side_effect = [
+            self._snapshot(update_id=13, bids=[["9", "1"]], asks=[["12", "1"]]),
+            self._snapshot(update_id=20, bids=[["9.5", "1"]], asks=[["12", "2"]]),
+        ]
+
+        self.tracker._dispatch_diff_message(self._diff(first_update_id=11, update_id=11, bids=[["10", "5"]], asks=[]))
+        order_book = self.tracker.order_books[self.trading_pair]
+        # Applied without waiting for any task
+        self.assertEqual([[10., 5., 11.]], order_book.snapshot[0].values.tolist())
+
+        self.tracker._dispatch_diff_message(self._diff(first_update_id=15, update_id=21, bids=[["9.5", "4"]], asks=[]))
+        self.tracker._dispatch_diff_message(self._diff(first_update_id=18, update_id=19, bids=[["8", "1"]], asks=[]))
+        self.tracker._dispatch_diff_message(self._diff(first_update_id=22, update_id=22, bids=[], asks=[["11.5", "1"]]))
+        self.assertEqual(2, len(self.tracker._direct_pending_messages[self.trading_pair]))
+        self.async_run_with_timeout(self.tracker._resync_tasks[self.trading_pair])
+
+        bids, asks = order_book.snapshot
+        self.assertEqual([[9.5, 4., 21.]], bids.values.tolist())
+        self.assertEqual([[11.5, 1., 22.], [12., 2., 20.]], asks.values.tolist())
+        self.assertEqual({self.trading_pair: 1}, self.tracker.sequence_gaps)
+        self.assertEqual({}, self.tracker._direct_pending_messages)
+        self.assertEqual({}, self.tracker._resync_tasks)
+
+    def test_direct_dispatch_applies_saved_messages_once_order_book_initialized(self):
+        self.tracker._order_books.clear()
+        self.tracker._tracking_message_queues.clear()
+        self.tracker.direct_dispatch = True
+        order_book = OrderBook()
+        order_book.apply_snapshot_message(self._snapshot(update_id=10, bids=[["10", "1"]], asks=[["11", "1"]]))
+        self.data_source.get_new_order_book = AsyncMock(return_value=order_book)
+
+        self.tracker._dispatch_diff_message(self._diff(first_update_id=9, update_id=10, bids=[["10", "7"]], asks=[]))
+        self.tracker._dispatch_diff_message(self._diff(first_update_id=11, update_id=11, bids=[["10", "2"]], asks=[]))
+        self.tracker._dispatch_snapshot_message(self._snapshot(update_id=12, bids=[["9", "1"]], asks=[["11", "1"]]))
+        self.tracker._dispatch_snapshot_message(OrderBookMessage(
+            OrderBookMessageType.SNAPSHOT, {"trading_pair": "OTHER-HBOT", "update_id": 1, "bids": [], "asks": []},
+            timestamp=1.))
+        self.assertEqual(3, len(self.tracker._saved_message_queues[self.trading_pair]))
+        self.assertNotIn("OTHER-HBOT", self.tracker._saved_message_queues)
+
+        self.async_run_with_timeout(self.tracker._init_order_books())
+
+        self.assertTrue(self.tracker.ready)
+        # The diff already in the initial snapshot is skipped, then the snapshot is restored with the past diffs
+        self.assertEqual([[10., 2., 11.], [9., 1., 12.]], order_book.snapshot[0].values.tolist())
+        self.assertEqual(1, len(self.tracker._past_diffs_windows[self.trading_pair]))
+        self.assertEqual(0, len(self.tracker._saved_message_queues[self.trading_pair]))
+        self.assertEqual({}, self.tracker._tracking_tasks)
+
+    def test_direct_dispatch_from_data_source_websocket_messages(self):
+        data_source = DirectDispatchDataSource(trading_pairs=[self.trading_pair])
+        self.tracker = OrderBookTracker(data_source=data_source, trading_pairs=[self.trading_pair])
+        self.tracker.direct_dispatch = True
+        order_book = OrderBook()
+        order_book.apply_snapshot_message(self._snapshot(update_id=10, bids=[["10", "1"]], asks=[["11", "1"]]))
+        self.tracker._order_books[self.trading_pair] = order_book
+        self.tracker._start_direct_dispatch()
+        self.tracker._order_book_stream_listener_task.cancel()
+        self.tracker._order_book_snapshot_listener_task.cancel()
+        self.tracker._update_last_trade_prices_task.cancel()
+        websocket_assistant = MagicMock()
+        websocket_assistant.last_recv_time = time.time()
+        websocket_assistant.iter_messages.return_value = self._ws_responses([
+            {"channel": "diff", "update_id": 11, "price": "10", "amount": "3"},
+            {"channel": "trade", "update_id": 12, "price": "11", "amount": "1"},
+            {"channel": "unknown"},
+        ])
+
+        self.async_run_with_timeout(data_source._process_websocket_messages(websocket_assistant=websocket_assistant))
+
+        self.assertEqual([[10., 3., 11.]], order_book.snapshot[0].values.tolist())
+        self.assertEqual(11., order_book.last_trade_price)
+        self.assertEqual(0, data_source._message_queue["order_book_diff"].qsize())
+        self.assertEqual(0, data_source._message_queue["trade"].qsize())
+        latency = self.tracker.market_data_latencies[self.trading_pair]
+        self.assertEqual(2, latency.receive_to_apply.count)
+        self.assertEqual(0, latency.exchange_to_receive.count)
+
+        self.tracker.stop()
+        self.assertEqual({}, data_source._message_dispatchers)
+
+    def test_queued_messages_stamped_with_receive_time(self):
+        data_source = DirectDispatchDataSource(trading_pairs=[self.trading_pair])
+        websocket_assistant = MagicMock()
+        websocket_assistant.last_recv_time = 1000.5
+        websocket_assistant.iter_messages.return_value = self._ws_responses([
+            {"channel": "diff", "update_id": 11, "price": "10", "amount": "3", "event_time": 999.9},
+            {"channel": "diff", "update_id": 12, "price": "10", "amount": "4", "event_time": 999.9},
+        ])
+        self.async_run_with_timeout(data_source._process_websocket_messages(websocket_assistant=websocket_assistant))
+        # A frame queued by other means than the websocket processing has no reception time
+        data_source._message_queue["order_book_diff"].put_nowait(
+            {"channel": "diff", "update_id": 13, "price": "10", "amount": "5", "event_time": 999.9})
+        output = asyncio.Queue()
+        listen_task = self.ev_loop.create_task(data_source.listen_for_order_book_diffs(self.ev_loop, output))
+        try:
+            messages = [self.async_run_with_timeout(output.get()) for _ in range(3)]
+        finally:
+            listen_task.cancel()
+
+        self.assertEqual([11, 12, 13], [message.update_id for message in messages])
+        self.assertEqual([1000.5, 1000.5, None], [message.receive_timestamp for message in messages])
+        self.assertEqual([999.9, 999.9, 999.9], [message.exchange_timestamp for message in messages])
+
+        self.tracker._apply_diffs(self.trading_pair,
+                                  self.tracker._order_books[self.trading_pair],
+                                  [self.tracker._compact_message(message) for message in messages])
+
+        latency = self.tracker.market_data_latencies[self.trading_pair]
+        self.assertEqual(2, latency.receive_to_apply.count)
+        self.assertEqual(2, latency.exchange_to_receive.count)
+        self.assertAlmostEqual(0.6, latency.exchange_to_receive.max)
+        self.tracker.reset_market_data_latencies()
+        self.assertEqual(0, latency.receive_to_apply.count)
+
+    def test_reconnected_streams_resync_only_their_order_books(self):
+        self.tracker._order_books["OTHER-HBOT"] = OrderBook()
+        self.data_source.get_order_book_snapshot_message.side_effect = [
+            self._snapshot(update_id=20, bids=[["9", "1"]], asks=[["11", "1"]])]
+
+        self.tracker._on_streams_reconnected([self.trading_pair, "UNKNOWN-HBOT"])
+        self.tracker._on_streams_reconnected([self.trading_pair])
+        self.async_run_with_timeout(self.tracker._reconnect_resync_tasks[self.trading_pair])
+
+        self.data_source.get_order_book_snapshot_message.assert_called_once_with(self.trading_pair)
+        self.assertEqual(20, self.tracker._order_book_snapshot_stream.get_nowait().update_id)
+        self.assertEqual({}, self.tracker._reconnect_resync_tasks)
+
+    def test_data_source_notifies_reconnected_streams_of_connection(self):
+        data_source = DirectDispatchDataSource(trading_pairs=["A-HBOT", "B-HBOT", "C-HBOT"])
+        notifications = []
+        data_source.set_streams_reconnected_callback(notifications.append)
+
+        self.async_run_with_timeout(data_source._streams_reconnected_listener(["B-HBOT"])(MagicMock()))
+        self.async_run_with_timeout(data_source._streams_reconnected_listener(None)(MagicMock()))
+        data_source.set_streams_reconnected_callback(None)
+        self.async_run_with_timeout(data_source._streams_reconnected_listener(None)(MagicMock()))
+
+        self.assertEqual([["B-HBOT"], ["A-HBOT", "B-HBOT", "C-HBOT"]], notifications)
+
+    def test_standby_connection_reconnection_does_not_resync_covered_streams(self):
+        data_source = DirectDispatchDataSource(trading_pairs=["A-HBOT", "B-HBOT"])
+        notifications = []
+        data_source.set_streams_reconnected_callback(notifications.append)
+        primary_ws = MagicMock(disconnection_time=None, connected_since=100.)
+        standby_ws = MagicMock(disconnection_time=150., connected_since=160.)
+        data_source._shard_websockets[("B-HBOT",)] = {0: primary_ws, 1: standby_ws}
+
+        # The primary connection was up during the whole interruption of the standby one
+        self.async_run_with_timeout(data_source._streams_reconnected_listener(["B-HBOT"])(standby_ws))
+        self.assertEqual([], notifications)
+
+        # The primary connection was reestablished after the standby one was lost, some messages may be missing
+        primary_ws.connected_since = 155.
+        self.async_run_with_timeout(data_source._streams_reconnected_listener(["B-HBOT"])(standby_ws))
+        primary_ws.connected_since = None
+        self.async_run_with_timeout(data_source._streams_reconnected_listener(["B-HBOT"])(standby_ws))
+        self.assertEqual([["B-HBOT"], ["B-HBOT"]], notifications)
+
+    @patch.object(WSAssistant, "_sleep", new_callable=AsyncMock)
+    @patch("aiohttp.client.ClientSession.ws_connect", new_callable=AsyncMock)
+    def test_websocket_reconnection_resyncs_order_books_end_to_end(self, ws_connect_mock, _):
+        mocking_assistant = NetworkMockingAssistant()
+        ws_connect_mock.return_value = mocking_assistant.create_websocket_mock()
+        data_source = ReconnectingDataSource(trading_pairs=[self.trading_pair], client_session=aiohttp.ClientSession())
+        tracker = OrderBookTracker(data_source=data_source, trading_pairs=[self.trading_pair])
+        tracker._order_books[self.trading_pair] = OrderBook()
+        data_source.set_streams_reconnected_callback(tracker._on_streams_reconnected)
+        mocking_assistant.add_websocket_aiohttp_message(
+            ws_connect_mock.return_value, message="", message_type=aiohttp.WSMsgType.CLOSE)
+
+        self.tracking_task = self.ev_loop.create_task(data_source.listen_for_subscriptions())
+        snapshot = self.async_run_with_timeout(tracker._order_book_snapshot_stream.get())
+
+        self.assertEqual(30, snapshot.update_id)
+        self.assertEqual(self.trading_pair, snapshot.trading_pair)
+        # The same assistant reconnected and replayed its subscription instead of a new connection being created
+        self.assertEqual(1, data_source.connections_created)
+        self.assertEqual(2, ws_connect_mock.await_count)
+        self.assertEqual([{"subscribe": "diff"}, {"subscribe": "diff"}],
+                         mocking_assistant.json_messages_sent_through_websocket(ws_connect_mock.return_value))
+
+    @staticmethod
+    async def _ws_responses(messages: List[Dict[str, Any]]):
+        for message in messages:
+            yield WSResponse(data=message)
+
+
+class DirectDispatchDataSource(OrderBookTrackerDataSource):
+
+    async def get_last_traded_prices(self, trading_pairs: List[str], domain: Optional[str] = None):
+        return {}
+
+    def _channel_originating_message(self, event_message: Dict[str, Any]) -> str:
+        return {"diff": self._diff_messages_queue_key,
+                "trade": self._trade_messages_queue_key}.get(event_message["channel"], "")
+
+    async def _parse_order_book_diff_message(self, raw_message: Dict[str, Any], message_queue: asyncio.Queue):
+        message = OrderBookMessage(
+            OrderBookMessageType.DIFF,
+            {"trading_pair": self._trading_pairs[0],
+             "update_id": raw_message["update_id"],
+             "bids": [[raw_message["price"], raw_message["amount"]]],
+             "asks": []},
+            timestamp=1.)
+        if "event_time" in raw_message:
+            message.exchange_timestamp = raw_message["event_time"]
+        message_queue.put_nowait(message)
+
+    async def _parse_trade_message(self, raw_message: Dict[str, Any], message_queue: asyncio.Queue):
+        message_queue.put_nowait(OrderBookMessage(
+            OrderBookMessageType.TRADE,
+            {"trading_pair": self._trading_pairs[0],
+             "trade_id": raw_message["update_id"],
+             "price": raw_message["price"],
+             "amount": raw_message["amount"],
+             "trade_type": float(TradeType.BUY.value)},
+            timestamp=1.))
+
+
+class ReconnectingDataSource(DirectDispatchDataSource):
+    AUTO_RECONNECT_WEBSOCKETS = True
+
+    def __init__(self, trading_pairs: List[str], client_session: aiohttp.ClientSession):
+        super().__init__(trading_pairs=trading_pairs)
+        self._client_session = client_session
+        self.connections_created = 0
+
+    async def _connected_websocket_assistant(self) -> WSAssistant:
+        self.connections_created += 1
+        ws = WSAssistant(connection=WSConnection(self._client_session))
+        await ws.connect(ws_url="ws://some/url")
+        return ws
+
+    async def _subscribe_channels(self, ws: WSAssistant):
+        await ws.subscribe(WSJSONRequest(payload={"subscribe": "diff"}))
+
+    async def _order_book_snapshot(self, trading_pair: str) -> OrderBookMessage:
+        return OrderBookMessage(
+            OrderBookMessageType.SNAPSHOT,
+            {"trading_pair": trading_pair, "update_id": 30, "bids": [["9", "1"]], "asks": [["11", "1"]]},
+            timestamp=30.)
@@ -0,0 +1,222 @@
+import asyncio
+import unittest
+from typing import Any, Awaitable, Dict, List, Optional
+
+from hummingbot.core.data_type.order_book_message import OrderBookMessage, OrderBookMessageType
+from hummingbot.core.data_type.order_book_tracker_data_source import OrderBookTrackerDataSource
+from hummingbot.core.web_assistant.connections.data_types import WSResponse
+
+
+class ShardWebsocket:
+    def __init__(self, fail_after_messages: bool):
+        self.fail_after_messages = fail_after_messages
+        self.trading_pairs: List[str] = []
+        self.last_recv_time: float = 0.
+        self.disconnected = False
+
+    async def iter_messages(self):
+        for trading_pair in self.trading_pairs:
+            yield WSResponse(data={"channel": "diff", "trading_pair": trading_pair})
+        if self.fail_after_messages:
+            raise ConnectionError("Closed by the test")
+        await asyncio.Event().wait()
+
+    async def disconnect(self):
+        self.disconnected = True
+
+
+class ShardedDataSource(OrderBookTrackerDataSource):
+    MAX_STREAMS_PER_CONNECTION = 4
+    STREAMS_PER_TRADING_PAIR = 2
+
+    def __init__(self, trading_pairs: List[str]):
+        super().__init__(trading_pairs=trading_pairs)
+        self.websockets: List[ShardWebsocket] = []
+
+    async def get_last_traded_prices(self, trading_pairs: List[str], domain: Optional[str] = None):
+        return {}
+
+    async def _order_book_snapshot(self, trading_pair: str) -> OrderBookMessage:
+        raise NotImplementedError
+
+    async def _connected_websocket_assistant(self):
+        # Only the first connection fails, once all its messages are received
+        websocket = ShardWebsocket(fail_after_messages=len(self.websockets) == 0)
+        self.websockets.append(websocket)
+        return websocket
+
+    async def _subscribe_trading_pairs_channels(self, ws: ShardWebsocket, trading_pairs: List[str]):
+        ws.trading_pairs = trading_pairs
+
+    def _channel_originating_message(self, event_message: Dict[str, Any]) -> str:
+        return self._diff_messages_queue_key
+
+
+class RedundantWebsocket:
+    def __init__(self, update_ids: List[int], last_recv_time: float):
+        self.update_ids = update_ids
+        self.last_recv_time = last_recv_time
+
+    async def iter_messages(self):
+        for update_id in self.update_ids:
+            yield WSResponse(data={"channel": "diff", "update_id": update_id})
+        await asyncio.Event().wait()
+
+    async def disconnect(self):
+        pass
+
+
+class RedundantDataSource(OrderBookTrackerDataSource):
+
+    def __init__(self, trading_pairs: List[str]):
+        super().__init__(trading_pairs=trading_pairs)
+        self.redundant_connection_indexes: List[int] = []
+
+    async def get_last_traded_prices(self, trading_pairs: List[str], domain: Optional[str] = None):
+        return {}
+
+    async def _order_book_snapshot(self, trading_pair: str) -> OrderBookMessage:
+        raise NotImplementedError
+
+    async def _connected_websocket_assistant(self):
+        return RedundantWebsocket(update_ids=[1, 2], last_recv_time=100.)
+
+    async def _connected_redundant_websocket_assistant(self, connection_index: int):
+        self.redundant_connection_indexes.append(connection_index)
+        # The redundant connection receives every update 2 milliseconds later, besides one update never received
+        # through the main connection
+        return RedundantWebsocket(update_ids=[1, 2, 3], last_recv_time=100.002)
+
+    async def _subscribe_channels(self, ws: RedundantWebsocket):
+        pass
+
+    def _channel_originating_message(self, event_message: Dict[str, Any]) -> str:
+        return self._diff_messages_queue_key
+
+    async def _parse_order_book_diff_message(self, raw_message: Dict[str, Any], message_queue: asyncio.Queue):
+        message_queue.put_nowait(OrderBookMessage(
+            OrderBookMessageType.DIFF,
+            {"trading_pair": self._trading_pairs[0], "update_id": raw_message["update_id"], "bids": [], "asks": []},
+            timestamp=1.))
+
+
+class BatchWebsocket:
+    def __init__(self, batches: List[List[WSResponse]]):
+        self.batches = batches
+        self.last_recv_time: float = 100.
+
+    async def iter_batches(self):
+        for batch in self.batches:
+            yield batch
+            self.last_recv_time += 1
+        await asyncio.Event().wait()
+
+    async def disconnect(self):
+        pass
+
+
+class BatchDataSource(RedundantDataSource):
+    BATCH_WEBSOCKET_MESSAGES = True
+
+    async def _connected_websocket_assistant(self):
+        return BatchWebsocket(batches=[
+            [WSResponse(data={"update_id": 1}), WSResponse(data={"update_id": 2}), WSResponse(data=None)],
+            [WSResponse(data={"update_id": 3})],
+        ])
+
+
+class OrderBookTrackerDataSourceTests(unittest.TestCase):
+    level = 0
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.log_records = []
+        self.trading_pairs = ["A-HBOT", "B-HBOT", "C-HBOT", "D-HBOT", "E-HBOT"]
+        self.data_source = ShardedDataSource(trading_pairs=self.trading_pairs)
+        self.data_source.logger().setLevel(1)
+        self.data_source.logger().addHandler(self)
+        self.listening_task = None
+
+    def tearDown(self) -> None:
+        self.listening_task and self.listening_task.cancel()
+        super().tearDown()
+
+    def handle(self, record):
+        self.log_records.append(record)
+
+    def async_run_with_timeout(self, coroutine: Awaitable, timeout: float = 1):
+        ret = asyncio.get_event_loop().run_until_complete(asyncio.wait_for(coroutine, timeout))
+        return ret
+
+    def test_trading_pair_shards(self):
+        self.assertEqual([["A-HBOT", "B-HBOT"], ["C-HBOT", "D-HBOT"], ["E-HBOT"]],
+                         self.data_source._trading_pair_shards())
+
+        self.data_source.MAX_STREAMS_PER_CONNECTION = 0
+        self.assertEqual([self.trading_pairs], self.data_source._trading_pair_shards())
+
+    def test_shards_listen_and_reconnect_independently(self):
+        diffs_queue: asyncio.Queue = self.data_source._message_queue[self.data_source._diff_messages_queue_key]
+        self.listening_task = asyncio.get_event_loop().create_task(self.data_source.listen_for_subscriptions())
+
+        diffs = [self.async_run_with_timeout(diffs_queue.get()) for _ in range(7)]
+
+        websockets = self.data_source.websockets
+        failed_websocket = websockets[0]
+        self.assertEqual(4, len(websockets))
+        self.assertEqual(sorted([["A-HBOT", "B-HBOT"], ["C-HBOT", "D-HBOT"], ["E-HBOT"]]),
+                         sorted(websocket.trading_pairs for websocket in websockets[1:]))
+        # Only the failed connection is replaced, the other shards keep their connection
+        self.assertTrue(failed_websocket.disconnected)
+        self.assertFalse(any(websocket.disconnected for websocket in websockets[1:]))
+        self.assertEqual(sorted(self.trading_pairs + failed_websocket.trading_pairs),
+                         sorted(diff["trading_pair"] for diff in diffs))
+        self.assertTrue(any(record.getMessage() == "The websocket connection was closed (Closed by the test)"
+                            for record in self.log_records))
+
+    def test_redundant_connections_deliver_first_copy_of_each_message(self):
+        data_source = RedundantDataSource(trading_pairs=["A-HBOT"])
+        self.assertEqual(1, data_source.redundant_connections)
+        self.assertIsNone(data_source.redundant_connection_stats)
+        data_source.set_redundant_connections(2)
+        output: asyncio.Queue = asyncio.Queue()
+        self.listening_task = asyncio.gather(
+            data_source.listen_for_subscriptions(),
+            data_source.listen_for_order_book_diffs(asyncio.get_event_loop(), output))
+
+        diffs = [self.async_run_with_timeout(output.get()) for _ in range(3)]
+        self.async_run_with_timeout(asyncio.sleep(0.01))
+
+        self.assertEqual([1, 2, 3], [diff.update_id for diff in diffs])
+        self.assertEqual([100., 100., 100.002], [diff.receive_timestamp for diff in diffs])
+        self.assertEqual(0, output.qsize())
+        self.assertEqual([1], data_source.redundant_connection_indexes)
+        stats = data_source.redundant_connection_stats
+        self.assertEqual(2, stats["connections"])
+        self.assertEqual([2, 1], stats["wins"])
+        self.assertEqual(2, stats["duplicates_dropped"])
+        self.assertAlmostEqual(2., stats["lead_time"]["p50"], delta=0.1)
+
+    def test_websocket_messages_processed_in_batches(self):
+        data_source = BatchDataSource(trading_pairs=["A-HBOT"])
+        output: asyncio.Queue = asyncio.Queue()
+        self.listening_task = asyncio.gather(
+            data_source.listen_for_subscriptions(),
+            data_source.listen_for_order_book_diffs(asyncio.get_event_loop(), output))
+
+        diffs = [self.async_run_with_timeout(output.get()) for _ in range(3)]
+
+        self.assertEqual([1, 2, 3], [diff.update_id for diff in diffs])
+        # The messages of a batch share the reception time of the batch
+        self.assertEqual([100., 100., 101.], [diff.receive_timestamp for diff in diffs])
+
+    def test_frame_reception_unknown_once_evicted(self):
+        self.data_source.RECEIVE_TIMESTAMPS_WINDOW_SIZE = 2
+        channel = self.data_source._diff_messages_queue_key
+        frames = [{"update_id": update_id} for update_id in range(3)]
+        for index, frame in enumerate(frames):
+            self.data_source._frame_receptions[channel].append((frame, 100. + index, 1))
+
+        # The reception of the first frame was evicted, so neither its time nor its connection are known
+        self.assertEqual((None, None), self.data_source._frame_reception(channel, frames[0]))
+        self.assertEqual((101., 1), self.data_source._frame_reception(channel, frames[1]))
@@ -0,0 +1,73 @@
+import unittest
+
+from hummingbot.core.data_type.common import TradeType
+from hummingbot.core.data_type.order_book_message import OrderBookMessage, OrderBookMessageType
+from hummingbot.core.data_type.redundant_message_filter import RedundantMessageFilter
+
+
+class RedundantMessageFilterTests(unittest.TestCase):
+
+    @staticmethod
+    def _diff(update_id: int, receive_timestamp: float, trading_pair: str = "COINALPHA-HBOT") -> OrderBookMessage:
+        message = OrderBookMessage(
+            OrderBookMessageType.DIFF,
+            {"trading_pair": trading_pair, "update_id": update_id, "bids": [], "asks": []},
+            timestamp=1.)
+        message.receive_timestamp = receive_timestamp
+        return message
+
+    @staticmethod
+    def _trade(trade_id: str) -> OrderBookMessage:
+        return OrderBookMessage(
+            OrderBookMessageType.TRADE,
+            {"trading_pair": "COINALPHA-HBOT", "trade_id": trade_id, "price": "10", "amount": "1",
+             "trade_type": float(TradeType.BUY.value)},
+            timestamp=1.)
+
+    def test_first_copy_accepted_and_duplicates_dropped(self):
+        message_filter = RedundantMessageFilter(connections=2)
+
+        self.assertTrue(message_filter.accept(self._diff(1, receive_timestamp=100.0), connection_index=0))
+        self.assertTrue(message_filter.accept(self._diff(2, receive_timestamp=100.5), connection_index=1))
+        self.assertFalse(message_filter.accept(self._diff(1, receive_timestamp=100.002), connection_index=1))
+        self.assertFalse(message_filter.accept(self._diff(2, receive_timestamp=100.504), connection_index=0))
+        self.assertTrue(message_filter.accept(self._diff(3, receive_timestamp=101.0), connection_index=0))
+        # Same update id for another trading pair
+        self.assertTrue(message_filter.accept(self._diff(1, receive_timestamp=101.0, trading_pair="OTHER-HBOT"),
+                                              connection_index=1))
+
+        stats = message_filter.to_dict()
+        self.assertEqual(2, stats["connections"])
+        self.assertEqual([2, 2], stats["wins"])
+        self.assertEqual([0.5, 0.5], stats["win_ratios"])
+        self.assertEqual(2, stats["duplicates_dropped"])
+        self.assertEqual(2, stats["lead_time"]["count"])
+        self.assertAlmostEqual(4., stats["lead_time"]["max"], places=3)
+
+    def test_trades_identified_by_trade_id(self):
+        message_filter = RedundantMessageFilter(connections=2)
+
+        self.assertTrue(message_filter.accept(self._trade("abc"), connection_index=1))
+        self.assertFalse(message_filter.accept(self._trade("abc"), connection_index=0))
+        self.assertTrue(message_filter.accept(self._trade("abd"), connection_index=0))
+
+        stats = message_filter.to_dict()
+        self.assertEqual([1, 1], stats["wins"])
+        # Without reception times the lead over the duplicates is not measured
+        self.assertEqual(0, stats["lead_time"]["count"])
+
+    def test_only_recent_ids_remembered(self):
+        message_filter = RedundantMessageFilter(connections=2, window_size=2)
+        for update_id in range(1, 4):
+            message_filter.accept(self._diff(update_id, receive_timestamp=100.0), connection_index=0)
+
+        self.assertFalse(message_filter.accept(self._diff(3, receive_timestamp=100.0), connection_index=1))
+        self.assertTrue(message_filter.accept(self._diff(1, receive_timestamp=100.0), connection_index=1))
+
+    def test_messages_from_unknown_connection_not_counted_as_wins(self):
+        message_filter = RedundantMessageFilter(connections=2)
+
+        self.assertTrue(message_filter.accept(self._diff(1, receive_timestamp=100.0), connection_index=None))
+        self.assertFalse(message_filter.accept(self._diff(1, receive_timestamp=100.1), connection_index=0))
+
+        self.assertEqual([0, 0], message_filter.to_dict()["wins"])
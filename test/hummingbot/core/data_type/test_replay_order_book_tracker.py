@@ -0,0 +1,126 @@
+import asyncio
+import unittest
+from decimal import Decimal
+from typing import List
+
+from hummingbot.client.config.client_config_map import ClientConfigMap
+from hummingbot.client.config.config_helpers import ClientConfigAdapter
+from hummingbot.connector.exchange.paper_trade.paper_trade_exchange import PaperTradeExchange
+from hummingbot.core.clock import Clock
+from hummingbot.core.clock_mode import ClockMode
+from hummingbot.core.data_type.common import OrderType, TradeType
+from hummingbot.core.data_type.market_data_replayer import MarketDataReplayer
+from hummingbot.core.data_type.order_book_message import OrderBookMessage, OrderBookMessageType
+from hummingbot.core.data_type.replay_order_book_tracker import ReplayOrderBookTracker
+from hummingbot.core.data_type.replay_order_book_tracker_data_source import ReplayOrderBookTrackerDataSource
+from hummingbot.core.event.event_logger import EventLogger
+from hummingbot.core.event.events import MarketEvent
+
+
+class TargetMarket:
+
+    @staticmethod
+    def split_trading_pair(trading_pair: str):
+        return tuple(trading_pair.split("-"))
+
+    @staticmethod
+    def convert_from_exchange_trading_pair(trading_pair: str) -> str:
+        return trading_pair
+
+
+class ReplayOrderBookTrackerTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.trading_pair = "COINALPHA-HBOT"
+
+    @staticmethod
+    def _run(coroutine):
+        return asyncio.get_event_loop().run_until_complete(coroutine)
+
+    def _messages(self) -> List[OrderBookMessage]:
+        return [
+            OrderBookMessage(OrderBookMessageType.DIFF,
+                             {"trading_pair": self.trading_pair, "update_id": 1, "bids": [["9", "1"]], "asks": []},
+                             timestamp=0.5),
+            OrderBookMessage(OrderBookMessageType.SNAPSHOT,
+                             {"trading_pair": self.trading_pair,
+                              "update_id": 2,
+                              "bids": [["10", "1"], ["9", "1"]],
+                              "asks": [["11", "1"], ["12", "1"]]},
+                             timestamp=1.5),
+            OrderBookMessage(OrderBookMessageType.SNAPSHOT,
+                             {"trading_pair": "OTHER-HBOT", "update_id": 2, "bids": [["1", "1"]], "asks": []},
+                             timestamp=1.5),
+            OrderBookMessage(OrderBookMessageType.DIFF,
+                             {"trading_pair": self.trading_pair,
+                              "update_id": 3,
+                              "bids": [["10.5", "2"]],
+                              "asks": [["11", "0"]]},
+                             timestamp=2.5),
+            OrderBookMessage(OrderBookMessageType.TRADE,
+                             {"trading_pair": self.trading_pair,
+                              "trade_id": 1,
+                              "price": "10",
+                              "amount": "1",
+                              "trade_type": float(TradeType.SELL.value)},
+                             timestamp=4.2),
+        ]
+
+    def test_replay_in_step_with_backtest_clock(self):
+        data_source = ReplayOrderBookTrackerDataSource(trading_pairs=[self.trading_pair], messages=self._messages())
+        tracker = ReplayOrderBookTracker(data_source=data_source, trading_pairs=[self.trading_pair])
+        replayer = MarketDataReplayer([tracker])
+        clock = Clock(ClockMode.BACKTEST, tick_size=1.0, start_time=0.0, end_time=10.0)
+        clock.add_iterator(replayer)
+
+        clock.backtest_til(1)
+        self.assertFalse(tracker.ready)
+        self.assertEqual(1, replayer.replayed_events)
+
+        clock.backtest_til(2)
+        self.assertTrue(tracker.ready)
+        order_book = tracker.order_books[self.trading_pair]
+        self.assertEqual(10., order_book.get_price(False))
+        self.assertEqual(11., order_book.get_price(True))
+
+        clock.backtest_til(3)
+        self.assertEqual(10.5, order_book.get_price(False))
+        self.assertEqual(12., order_book.get_price(True))
+        self.assertEqual(3, replayer.replayed_events)
+
+        clock.backtest()
+        # The backtest stops as soon as all the data is replayed
+        self.assertEqual(5, clock.current_timestamp)
+        self.assertTrue(replayer.finished)
+        self.assertEqual(10., order_book.last_trade_price)
+        self.assertEqual(4, replayer.replay_stats["replayed_events"])
+        self.assertGreater(replayer.events_per_second, 0)
+        self.assertEqual({self.trading_pair: 10.},
+                         self._run(data_source.get_last_traded_prices([self.trading_pair, "OTHER-HBOT"])))
+
+    def test_replay_with_paper_trade_exchange(self):
+        data_source = ReplayOrderBookTrackerDataSource(trading_pairs=[self.trading_pair], messages=self._messages())
+        tracker = ReplayOrderBookTracker(data_source=data_source, trading_pairs=[self.trading_pair])
+        market = PaperTradeExchange(client_config_map=ClientConfigAdapter(ClientConfigMap()),
+                                    order_book_tracker=tracker,
+                                    target_market=TargetMarket,
+                                    exchange_name="binance")
+        market.set_balance("COINALPHA", 10)
+        market.set_balance("HBOT", 100)
+        fill_logger = EventLogger()
+        market.add_listener(MarketEvent.OrderFilled, fill_logger)
+        replayer = MarketDataReplayer([tracker])
+        clock = Clock(ClockMode.BACKTEST, tick_size=1.0, start_time=0.0, end_time=10.0)
+        clock.add_iterator(replayer)
+        clock.add_iterator(market)
+
+        clock.backtest_til(3)
+        self.assertTrue(market.ready)
+        market.buy(self.trading_pair, Decimal("1"), OrderType.LIMIT, Decimal("10.2"))
+
+        clock.backtest()
+
+        self.assertEqual(1, len(fill_logger.event_log))
+        self.assertEqual(Decimal("10.2"), fill_logger.event_log[0].price)
@@ -7,9 +7,36 @@ from hummingbot.core.clock import (
     Clock,
     ClockMode
 )
+from hummingbot.core.clock_tick_stats import ClockTickStats
+from hummingbot.core.data_type.market_data_replayer import MarketDataReplayer
+from hummingbot.core.data_type.order_book import OrderBook
+from hummingbot.core.data_type.order_book_message import OrderBookMessage, OrderBookMessageType
+from hummingbot.core.data_type.replay_order_book_tracker import ReplayOrderBookTracker
+from hummingbot.core.data_type.replay_order_book_tracker_data_source import ReplayOrderBookTrackerDataSource
+from hummingbot.core.event.events import OrderBookEvent
+from hummingbot.core.py_time_iterator import PyTimeIterator
 from hummingbot.core.time_iterator import TimeIterator
 
 
+class TickRecorder(PyTimeIterator):
+    def __init__(self, ticks: list, name: str):
+        super().__init__()
+        self._ticks = ticks
+        self._name = name
+
+    def tick(self, timestamp: float):
+        self._ticks.append((self._name, timestamp))
+
+
+class SlowTicker(PyTimeIterator):
+    def __init__(self, tick_duration: float):
+        super().__init__()
+        self._tick_duration = tick_duration
+
+    def tick(self, timestamp: float):
+        time.sleep(self._tick_duration)
+
+
 class ClockUnitTest(unittest.TestCase):
 
     backtest_start_timestamp: float = pd.Timestamp("2021-01-01", tz="UTC").timestamp()
@@ -112,6 +139,165 @@ class ClockUnitTest(unittest.TestCase):
 
         self.assertGreaterEqual(self.clock_realtime.current_timestamp, self.realtime_end_timestamp)
 
+    def test_run_til_runs_requested_out_of_band_ticks(self):
+        clock = Clock(ClockMode.REALTIME, tick_size=1.0, min_tick_interval=0.2)
+        iterator = TimeIterator()
+        other_iterator = TimeIterator()
+        clock.add_iterator(iterator)
+        clock.add_iterator(other_iterator)
+
+        async def request_ticks():
+            await asyncio.sleep(0.1)
+            # Requests in a burst are grouped in a single tick
+            for _ in range(10):
+                iterator.request_tick()
+            await asyncio.sleep(0.05)
+            return iterator.current_timestamp, other_iterator.current_timestamp
+
+        # Starts early in a second so that the out of band tick happens before the next regular tick
+        if time.time() % 1 > 0.5:
+            time.sleep(1.05 - time.time() % 1)
+        with clock:
+            start_tick = time.time() // 1
+            (iterator_timestamp, other_timestamp), _ = self.ev_loop.run_until_complete(
+                asyncio.gather(request_ticks(), clock.run_til(start_tick + 1.5)))
+
+        self.assertEqual(1, clock.out_of_band_ticks)
+        self.assertGreater(iterator_timestamp, start_tick)
+        self.assertLess(iterator_timestamp, start_tick + 1)
+        # Only the iterator which requested the tick is ticked out of band
+        self.assertEqual(start_tick, other_timestamp)
+        self.assertEqual(start_tick + 2, clock.current_timestamp)
+
+    def test_request_tick_outside_of_run_is_ignored(self):
+        iterator = TimeIterator()
+        self.clock_realtime.add_iterator(iterator)
+        with self.clock_realtime:
+            iterator.request_tick()
+            self.clock_realtime.request_tick(iterator)
+        self.assertEqual(0, self.clock_realtime.out_of_band_ticks)
+
+    def test_order_book_trigger_rate_limited_by_min_tick_interval(self):
+        clock = Clock(ClockMode.REALTIME, tick_size=1.0, min_tick_interval=0.3)
+        iterator = TimeIterator()
+        order_book = OrderBook()
+        clock.add_iterator(iterator)
+        clock.add_order_book_trigger(iterator, order_book)
+
+        async def update_order_book():
+            for price in range(1, 11):
+                await asyncio.sleep(0.05)
+                order_book.apply_raw_snapshot(bids=[[str(price), "1"]], asks=[[str(price + 1), "1"]], update_id=price)
+            await asyncio.sleep(0.05)
+
+        with clock:
+            end_timestamp = time.time() + 0.6
+            self.ev_loop.run_until_complete(asyncio.gather(update_order_book(), clock.run_til(end_timestamp)))
+
+        # 10 best price changes in 0.6 seconds, at most one out of band tick every 0.3 seconds
+        self.assertGreaterEqual(clock.out_of_band_ticks, 1)
+        self.assertLessEqual(clock.out_of_band_ticks, 3)
+
+        clock.remove_iterator(iterator)
+        self.assertEqual(0, len(order_book.get_listeners(OrderBookEvent.BBOChangedEvent)))
+
+    def test_run_til_collects_tick_stats_when_enabled(self):
+        clock = Clock(ClockMode.REALTIME, tick_size=0.1)
+        clock.add_iterator(TimeIterator())
+        clock.add_iterator(MarketDataReplayer([], stop_at_end_of_data=False))
+        self.assertIsNone(clock.tick_stats)
+
+        with clock:
+            self.ev_loop.run_until_complete(clock.run_til(time.time() + 0.25))
+            self.assertIsNone(clock.tick_stats)
+            clock.enable_tick_stats(window_size=10)
+            self.ev_loop.run_until_complete(clock.run_til(time.time() + 0.35))
+
+        stats = clock.tick_stats.to_dict()
+        self.assertEqual(0.1, stats["tick_size"])
+        self.assertGreaterEqual(stats["ticks"]["count"], 3)
+        self.assertEqual(0, stats["overruns"])
+        self.assertEqual(stats["ticks"]["count"], stats["loop_lag"]["count"])
+        self.assertGreaterEqual(stats["loop_lag"]["p50"], 0)
+        self.assertEqual({"TimeIterator", "MarketDataReplayer"}, set(stats["iterators"].keys()))
+        self.assertEqual(stats["ticks"]["count"], stats["iterators"]["TimeIterator"]["count"])
+        self.assertLessEqual(stats["iterators"]["TimeIterator"]["p50"], stats["ticks"]["p50"])
+
+        df = clock.tick_stats.to_dataframe()
+        self.assertEqual(["Tick (total)", "Loop lag", "TimeIterator", "MarketDataReplayer"], df["name"].tolist())
+
+        clock.disable_tick_stats()
+        self.assertIsNone(clock.tick_stats)
+
+    def test_tick_stats_detect_overruns(self):
+        stats = ClockTickStats(tick_size=1.0, window_size=3)
+        for duration in (0.1, 0.2, 1.5, 0.3):
+            stats.record_tick(duration)
+        stats.record_iterator_tick(TimeIterator(), 0.01)
+        stats.record_iterator_tick(MarketDataReplayer([]), 0.5)
+
+        self.assertEqual(4, stats.ticks)
+        self.assertEqual(1, stats.overruns)
+        self.assertEqual("MarketDataReplayer", stats.slowest_iterator())
+        summary = stats.to_dict()["ticks"]
+        # The percentiles are computed over the last window_size ticks
+        self.assertAlmostEqual(300., summary["p50"])
+        self.assertAlmostEqual(1500., summary["max"])
+
+    def test_tick_overrun_warning_names_slowest_iterator_of_the_tick(self):
+        clock = Clock(ClockMode.REALTIME, tick_size=0.1)
+        clock.add_iterator(TimeIterator())
+        clock.add_iterator(SlowTicker(tick_duration=0.15))
+        clock.enable_tick_stats(window_size=10)
+        # The other iterator has the highest median tick duration, but did not make this tick overrun
+        for _ in range(3):
+            clock.tick_stats.record_iterator_tick(TimeIterator(), 10.)
+
+        with clock, self.assertLogs(clock.logger(), level="WARNING") as logs:
+            self.ev_loop.run_until_complete(clock.run_til(time.time() + 0.1))
+
+        self.assertIn("Slowest iterator in the tick: SlowTicker", logs.output[0])
+
+    def test_iterators_ticked_at_their_tick_interval(self):
+        ticks = []
+        clock = Clock(ClockMode.BACKTEST, 0.5, self.backtest_start_timestamp, self.backtest_end_timestamp)
+        clock.add_iterator(TickRecorder(ticks, "connector"), tick_interval=1.0)
+        clock.add_iterator(TickRecorder(ticks, "strategy"))
+        metrics = TickRecorder(ticks, "metrics")
+        clock.add_iterator(metrics, tick_interval=2.0)
+        self.assertEqual(2, len(clock.tick_intervals))
+
+        clock.backtest_til(self.backtest_start_timestamp + 4)
+
+        start = self.backtest_start_timestamp
+        self.assertEqual([("connector", start + 0.5), ("strategy", start + 0.5), ("metrics", start + 0.5),
+                          ("connector", start + 1), ("strategy", start + 1),
+                          ("strategy", start + 1.5),
+                          ("connector", start + 2), ("strategy", start + 2), ("metrics", start + 2),
+                          ("strategy", start + 2.5),
+                          ("connector", start + 3), ("strategy", start + 3),
+                          ("strategy", start + 3.5),
+                          ("connector", start + 4), ("strategy", start + 4), ("metrics", start + 4)],
+                         ticks)
+
+        clock.remove_iterator(metrics)
+        clock.backtest_til(self.backtest_start_timestamp + 6)
+        self.assertNotIn("metrics", [name for name, _ in ticks[16:]])
+        self.assertEqual(6, len(ticks[16:]))
+
+    def test_fast_forward_skips_to_the_next_tick_interval(self):
+        ticks = []
+        clock = Clock(ClockMode.BACKTEST, 0.1, self.backtest_start_timestamp, self.backtest_end_timestamp,
+                      fast_forward=True)
+        clock.add_iterator(TickRecorder(ticks, "metrics"), tick_interval=60.0)
+
+        clock.backtest_til(self.backtest_start_timestamp + 180)
+
+        self.assertEqual(4, len(ticks))
+        self.assertEqual([self.backtest_start_timestamp + offset for offset in (60, 120, 180)],
+                         [round(timestamp, 3) for _, timestamp in ticks[1:]])
+        self.assertGreater(clock.skipped_ticks, 1700)
+
     def test_backtest(self):
         # Note: Technically you do not execute `backtest()` when in REALTIME mode
 
@@ -124,3 +310,53 @@ class ClockUnitTest(unittest.TestCase):
         self.clock_backtest.backtest_til(self.backtest_start_timestamp + self.tick_size)
         self.assertGreater(self.clock_backtest.current_timestamp, self.clock_backtest.start_time)
         self.assertLess(self.clock_backtest.current_timestamp, self.backtest_end_timestamp)
+
+    def _replay_tracker(self, timestamps) -> ReplayOrderBookTracker:
+        messages = [OrderBookMessage(OrderBookMessageType.SNAPSHOT,
+                                     {"trading_pair": "COINALPHA-HBOT",
+                                      "update_id": update_id,
+                                      "bids": [[str(update_id), "1"]],
+                                      "asks": [[str(update_id + 1), "1"]]},
+                                     timestamp=timestamp)
+                    for update_id, timestamp in enumerate(timestamps, start=1)]
+        data_source = ReplayOrderBookTrackerDataSource(trading_pairs=["COINALPHA-HBOT"], messages=messages)
+        return ReplayOrderBookTracker(data_source=data_source, trading_pairs=["COINALPHA-HBOT"])
+
+    def test_fast_forward_backtest_skips_to_next_event(self):
+        clock = Clock(ClockMode.BACKTEST, 0.1, self.backtest_start_timestamp, self.backtest_end_timestamp,
+                      fast_forward=True)
+        tracker = self._replay_tracker([self.backtest_start_timestamp + 10.05, self.backtest_start_timestamp + 20.])
+        replayer = MarketDataReplayer([tracker], stop_at_end_of_data=False)
+        clock.add_iterator(replayer)
+        self.assertTrue(clock.fast_forward)
+
+        fixed_step_clock = Clock(ClockMode.BACKTEST, 0.1, self.backtest_start_timestamp, self.backtest_end_timestamp)
+        fixed_step_clock.backtest_til(self.backtest_start_timestamp + 15)
+        clock.backtest_til(self.backtest_start_timestamp + 15)
+
+        # Only the ticks at the first message and at the end timestamp are run, at the fixed step mode timestamps
+        self.assertGreaterEqual(clock.skipped_ticks, 147)
+        self.assertEqual(1, replayer.replayed_events)
+        self.assertEqual(1., tracker.order_books["COINALPHA-HBOT"].get_price(False))
+        self.assertEqual(fixed_step_clock.current_timestamp, clock.current_timestamp)
+
+        fixed_step_clock.backtest()
+        clock.backtest()
+
+        self.assertEqual(2, replayer.replayed_events)
+        self.assertEqual(2., tracker.order_books["COINALPHA-HBOT"].get_price(False))
+        self.assertEqual(fixed_step_clock.current_timestamp, clock.current_timestamp)
+
+    def test_fast_forward_ticks_every_step_with_iterators_without_next_event(self):
+        fixed_step_clock = Clock(ClockMode.BACKTEST, 0.1, self.backtest_start_timestamp, self.backtest_end_timestamp)
+        clock = Clock(ClockMode.BACKTEST, 0.1, self.backtest_start_timestamp, self.backtest_end_timestamp,
+                      fast_forward=True)
+        clock.add_iterator(MarketDataReplayer([self._replay_tracker([self.backtest_start_timestamp + 10.05])],
+                                              stop_at_end_of_data=False))
+        clock.add_iterator(TimeIterator())
+
+        fixed_step_clock.backtest_til(self.backtest_start_timestamp + 15)
+        clock.backtest_til(self.backtest_start_timestamp + 15)
+
+        self.assertEqual(0, clock.skipped_ticks)
+        self.assertEqual(fixed_step_clock.current_timestamp, clock.current_timestamp)
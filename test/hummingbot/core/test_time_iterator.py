@@ -58,3 +58,22 @@ class TimeIteratorUnitTest(unittest.TestCase):
         # c_tick is called within Clock
         self.clock.backtest_til(self.start_timestamp + self.tick_size)
         self.assertEqual(self.start_timestamp + self.tick_size, self.time_iterator.current_timestamp)
+
+    def test_next_event_timestamp_defaults_to_every_tick(self):
+        self.assertTrue(math.isnan(self.time_iterator.next_event_timestamp))
+
+    def test_wake_up_timestamps(self):
+        self.time_iterator.start(self.clock)
+        self.assertEqual(float("inf"), self.time_iterator.next_wake_up_timestamp)
+
+        self.time_iterator.schedule_wake_up(self.start_timestamp + 3 * self.tick_size)
+        self.time_iterator.schedule_wake_up(self.start_timestamp + self.tick_size)
+        self.time_iterator.schedule_wake_up(self.start_timestamp - self.tick_size)
+        self.assertEqual(self.start_timestamp + self.tick_size, self.time_iterator.next_wake_up_timestamp)
+
+        # The wake up times reached are dropped
+        self.clock.backtest_til(self.start_timestamp + self.tick_size)
+        self.assertEqual(self.start_timestamp + 3 * self.tick_size, self.time_iterator.next_wake_up_timestamp)
+
+        self.time_iterator.stop(self.clock)
+        self.assertEqual(float("inf"), self.time_iterator.next_wake_up_timestamp)
@@ -0,0 +1,65 @@
+import math
+import unittest
+
+from hummingbot.core.utils.latency_histogram import LatencyHistogram, MarketDataLatency
+
+
+class LatencyHistogramTests(unittest.TestCase):
+
+    def test_bucket_bounds_are_contiguous(self):
+        previous_upper_bound = 0
+        for index in range(1000):
+            lower_bound = previous_upper_bound
+            previous_upper_bound = LatencyHistogram.bucket_upper_bound(index)
+            self.assertEqual(index, LatencyHistogram.bucket_index(lower_bound))
+            self.assertEqual(index, LatencyHistogram.bucket_index(previous_upper_bound - 1))
+            # The width of the buckets stays within ~3% of their values
+            self.assertLessEqual(previous_upper_bound - lower_bound, max(1, lower_bound / 32))
+
+    def test_percentiles_within_relative_precision(self):
+        histogram = LatencyHistogram()
+        for microseconds in range(1, 100001):
+            histogram.record(microseconds * 1e-6)
+
+        self.assertEqual(100000, histogram.count)
+        self.assertAlmostEqual(0.05, histogram.percentile(50), delta=0.05 * 0.035)
+        self.assertAlmostEqual(0.099, histogram.percentile(99), delta=0.099 * 0.035)
+        self.assertAlmostEqual(0.1, histogram.percentile(100))
+        self.assertAlmostEqual(0.0500005, histogram.mean)
+
+        summary = histogram.summary()
+        self.assertEqual(100000, summary["count"])
+        self.assertAlmostEqual(100., summary["max"])
+        self.assertAlmostEqual(50., summary["p50"], delta=50 * 0.035)
+
+    def test_negative_latencies_counted_in_lowest_bucket(self):
+        histogram = LatencyHistogram()
+        histogram.record(-0.002)
+        histogram.record(0.001)
+
+        self.assertEqual(2, histogram.count)
+        self.assertEqual(-0.002, histogram.min)
+        self.assertEqual(1e-6, histogram.percentile(50))
+        self.assertEqual(0.001, histogram.percentile(100))
+
+    def test_empty_and_reset_histogram(self):
+        histogram = LatencyHistogram()
+        self.assertTrue(math.isnan(histogram.percentile(50)))
+        self.assertTrue(math.isnan(histogram.summary()["max"]))
+
+        histogram.record(1.0)
+        histogram.reset()
+
+        self.assertEqual(0, histogram.count)
+        self.assertTrue(math.isnan(histogram.mean))
+
+    def test_market_data_latency(self):
+        latency = MarketDataLatency()
+        latency.record(receive_timestamp=None, exchange_timestamp=999.9, apply_timestamp=1000.2)
+        latency.record(receive_timestamp=1000.0, exchange_timestamp=None, apply_timestamp=1000.002)
+        latency.record(receive_timestamp=1000.0, exchange_timestamp=999.99, apply_timestamp=1000.001)
+
+        self.assertEqual(2, latency.receive_to_apply.count)
+        self.assertEqual(1, latency.exchange_to_receive.count)
+        self.assertAlmostEqual(0.01, latency.exchange_to_receive.max, places=6)
+        self.assertAlmostEqual(2., latency.to_dict()["receive_to_apply"]["max"], places=3)
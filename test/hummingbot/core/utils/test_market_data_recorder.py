@@ -0,0 +1,89 @@
+import os
+import tempfile
+import time
+import unittest
+
+from hummingbot.core.utils.market_data_recorder import (
+    BINARY_FRAME,
+    TEXT_FRAME,
+    MarketDataReader,
+    MarketDataRecorder,
+)
+
+
+class MarketDataRecorderTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.temp_dir.name
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def _wait_for_file_size(self, path: str, size: int, timeout: float = 5):
+        deadline = time.time() + timeout
+        while not (os.path.exists(path) and os.path.getsize(path) >= size):
+            if time.time() > deadline:
+                self.fail(f"{path} did not reach {size} bytes.")
+            time.sleep(0.01)
+
+    def test_record_and_read(self):
+        recorder = MarketDataRecorder(self.directory)
+        recorder.start()
+        recorder.record("binance", '{"e": "depthUpdate"}', timestamp=1.0)
+        recorder.record("kucoin", b"\x00\x01binary", timestamp=2.0)
+        recorder.record("binance", '{"e": "trade"}', timestamp=3.0)
+        recorder.stop()
+
+        reader = MarketDataReader(self.directory)
+        records = list(reader.iter_records())
+
+        self.assertEqual(3, recorder.recorded_records)
+        self.assertEqual(["binance", "kucoin"], reader.sources)
+        self.assertEqual(1, len(reader.segments))
+        self.assertEqual(3, reader.segments[0].records)
+        self.assertEqual((1.0, 3.0), (reader.segments[0].first_timestamp, reader.segments[0].last_timestamp))
+        self.assertEqual([1.0, 2.0, 3.0], [record.timestamp for record in records])
+        self.assertEqual(["binance", "kucoin", "binance"], [record.source for record in records])
+        self.assertEqual([TEXT_FRAME, BINARY_FRAME, TEXT_FRAME], [record.frame_type for record in records])
+        self.assertEqual('{"e": "depthUpdate"}', records[0].text)
+        self.assertEqual(b"\x00\x01binary", records[1].data)
+
+    def test_segments_rotation_and_time_range(self):
+        recorder = MarketDataRecorder(self.directory, name="test", max_segment_size=100, flush_size=1)
+        recorder.start()
+        for index in range(10):
+            recorder.record("binance", f"message {index}", timestamp=float(index))
+        recorder.stop()
+
+        reader = MarketDataReader(self.directory, name="test")
+
+        self.assertGreater(len(reader.segments), 1)
+        self.assertEqual(10, sum(segment.records for segment in reader.segments))
+        self.assertEqual([f"message {index}" for index in range(10)],
+                         [record.text for record in reader.iter_records()])
+        self.assertEqual([3., 4., 5.],
+                         [record.timestamp for record in reader.iter_records(start_timestamp=3, end_timestamp=5)])
+
+    def test_read_segment_not_indexed_yet(self):
+        recorder = MarketDataRecorder(self.directory, flush_size=1)
+        recorder.start()
+        recorder.record("binance", "first", timestamp=1.0)
+        recorder.record("binance", "second", timestamp=2.0)
+        # The segment is still open, so it is not indexed yet
+        self._wait_for_file_size(os.path.join(self.directory, "market_data-000000.seg"), 8 + (16 + 5) + (16 + 6))
+
+        reader = MarketDataReader(self.directory)
+        self.assertEqual(["first", "second"], [record.text for record in reader.iter_records()])
+        self.assertEqual(["0", "0"], [record.source for record in reader.iter_records()])
+
+        recorder.stop()
+
+    def test_record_ignored_when_not_started(self):
+        recorder = MarketDataRecorder(self.directory)
+        recorder.record("binance", "message")
+
+        self.assertEqual(0, recorder.recorded_records)
+        self.assertEqual([], os.listdir(self.directory))
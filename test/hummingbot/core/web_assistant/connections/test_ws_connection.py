@@ -2,13 +2,18 @@ import asyncio
 import json
 import unittest
 from typing import Awaitable, List
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import aiohttp
 
 from hummingbot.connector.test_support.network_mocking_assistant import NetworkMockingAssistant
 from hummingbot.core.web_assistant.connections.data_types import WSJSONRequest, WSResponse
 from hummingbot.core.web_assistant.connections.ws_connection import WSConnection
+from hummingbot.core.web_assistant.connections.ws_frame_decoders import (
+    ChannelRoutingDecoder,
+    WSFrameDecoder,
+    json_fields_router,
+)
 
 
 class WSConnectionTest(unittest.TestCase):
@@ -121,6 +126,20 @@ class WSConnectionTest(unittest.TestCase):
         self.assertEqual(data, response.data)
         self.assertNotEqual(0, self.ws_connection.last_recv_time)
 
+    @patch("aiohttp.client.ClientSession.ws_connect", new_callable=AsyncMock)
+    def test_receive_records_raw_frames(self, ws_connect_mock):
+        ws_connect_mock.return_value = self.mocking_assistant.create_websocket_mock()
+        self.async_run_with_timeout(self.ws_connection.connect(self.ws_url))
+        recorder = MagicMock()
+        self.ws_connection.set_recorder(recorder, source="test_exchange")
+        self.mocking_assistant.add_websocket_aiohttp_message(
+            ws_connect_mock.return_value, message=json.dumps({"one": 1})
+        )
+
+        self.async_run_with_timeout(self.ws_connection.receive())
+
+        recorder.record.assert_called_once_with("test_exchange", '{"one": 1}')
+
     @patch("aiohttp.client.ClientSession.ws_connect", new_callable=AsyncMock)
     def test_receive_disconnects_and_raises_on_aiohttp_closed(self, ws_connect_mock):
         ws_connect_mock.return_value = self.mocking_assistant.create_websocket_mock()
@@ -248,3 +267,119 @@ class WSConnectionTest(unittest.TestCase):
         self.mocking_assistant.run_until_all_aiohttp_messages_delivered(ws_connect_mock.return_value)
 
         self.assertNotEqual(0, self.ws_connection.last_recv_time)
+
+    def _expose_buffered_frames(self, ws_mock):
+        # Exposes the messages waiting in the mocked connection as the frames buffered in the aiohttp reader
+        queue = self.mocking_assistant._incoming_websocket_aiohttp_queues[ws_mock]
+        ws_mock._reader = MagicMock()
+        ws_mock._reader.__len__.side_effect = queue.qsize
+
+    @patch("aiohttp.client.ClientSession.ws_connect", new_callable=AsyncMock)
+    def test_receive_batch_drains_buffered_frames(self, ws_connect_mock):
+        ws_connect_mock.return_value = self.mocking_assistant.create_websocket_mock()
+        self._expose_buffered_frames(ws_connect_mock.return_value)
+        self.async_run_with_timeout(self.ws_connection.connect(self.ws_url))
+        recorder = MagicMock()
+        self.ws_connection.set_recorder(recorder, source="test_exchange")
+        for message, message_type in [(json.dumps({"one": 1}), aiohttp.WSMsgType.TEXT),
+                                      ("", aiohttp.WSMsgType.PING),
+                                      ("not json", aiohttp.WSMsgType.TEXT),
+                                      ("", aiohttp.WSMsgType.PONG),
+                                      (json.dumps({"two": 2}), aiohttp.WSMsgType.TEXT)]:
+            self.mocking_assistant.add_websocket_aiohttp_message(
+                ws_connect_mock.return_value, message=message, message_type=message_type
+            )
+
+        batch = self.async_run_with_timeout(self.ws_connection.receive_batch())
+
+        self.assertEqual([{"one": 1}, "not json", {"two": 2}], [response.data for response in batch])
+        self.assertEqual(3, recorder.record.call_count)
+        ws_connect_mock.return_value.pong.assert_called_once()
+        self.assertNotEqual(0, self.ws_connection.last_recv_time)
+
+    @patch("hummingbot.core.web_assistant.connections.ws_connection.time.time")
+    @patch("aiohttp.client.ClientSession.ws_connect", new_callable=AsyncMock)
+    def test_receive_batch_stamped_when_first_frame_read(self, ws_connect_mock, time_mock):
+        ws_connect_mock.return_value = self.mocking_assistant.create_websocket_mock()
+        self._expose_buffered_frames(ws_connect_mock.return_value)
+        self.async_run_with_timeout(self.ws_connection.connect(self.ws_url))
+        now = [100.]
+        time_mock.side_effect = lambda: now[0]
+        decoder = WSFrameDecoder()
+
+        def slow_decode(msg: aiohttp.WSMessage):
+            # Time passes while the batch is drained
+            now[0] += 1
+            return WSFrameDecoder.decode(decoder, msg)
+
+        decoder.decode = slow_decode
+        self.ws_connection.set_decoder(decoder)
+        for index in range(3):
+            self.mocking_assistant.add_websocket_aiohttp_message(
+                ws_connect_mock.return_value, message=json.dumps({"index": index})
+            )
+
+        batch = self.async_run_with_timeout(self.ws_connection.receive_batch())
+
+        self.assertEqual(3, len(batch))
+        self.assertEqual(100., self.ws_connection.last_recv_time)
+
+    @patch("aiohttp.client.ClientSession.ws_connect", new_callable=AsyncMock)
+    def test_receive_batch_limited_to_max_batch_size(self, ws_connect_mock):
+        ws_connect_mock.return_value = self.mocking_assistant.create_websocket_mock()
+        self._expose_buffered_frames(ws_connect_mock.return_value)
+        self.async_run_with_timeout(self.ws_connection.connect(self.ws_url))
+        self.ws_connection.MAX_BATCH_SIZE = 2
+        for index in range(3):
+            self.mocking_assistant.add_websocket_aiohttp_message(
+                ws_connect_mock.return_value, message=json.dumps({"index": index})
+            )
+
+        first_batch = self.async_run_with_timeout(self.ws_connection.receive_batch())
+        second_batch = self.async_run_with_timeout(self.ws_connection.receive_batch())
+
+        self.assertEqual([{"index": 0}, {"index": 1}], [response.data for response in first_batch])
+        self.assertEqual([{"index": 2}], [response.data for response in second_batch])
+
+    @patch("aiohttp.client.ClientSession.ws_connect", new_callable=AsyncMock)
+    def test_receive_batch_returns_frames_preceding_close_before_raising(self, ws_connect_mock):
+        ws_connect_mock.return_value = self.mocking_assistant.create_websocket_mock()
+        ws_connect_mock.return_value.close_code = 1111
+        self._expose_buffered_frames(ws_connect_mock.return_value)
+        self.async_run_with_timeout(self.ws_connection.connect(self.ws_url))
+        self.mocking_assistant.add_websocket_aiohttp_message(
+            ws_connect_mock.return_value, message=json.dumps({"one": 1})
+        )
+        self.mocking_assistant.add_websocket_aiohttp_message(
+            ws_connect_mock.return_value, message="", message_type=aiohttp.WSMsgType.CLOSE
+        )
+
+        batch = self.async_run_with_timeout(self.ws_connection.receive_batch())
+
+        self.assertEqual([{"one": 1}], [response.data for response in batch])
+        self.assertTrue(self.ws_connection.connected)
+
+        with self.assertRaises(ConnectionError) as e:
+            self.async_run_with_timeout(self.ws_connection.receive_batch())
+
+        self.assertEqual("The WS connection was closed unexpectedly. Close code = 1111 msg data: ", str(e.exception))
+        self.assertFalse(self.ws_connection.connected)
+
+    @patch("aiohttp.client.ClientSession.ws_connect", new_callable=AsyncMock)
+    def test_receive_skips_frames_dropped_by_decoder(self, ws_connect_mock):
+        ws_connect_mock.return_value = self.mocking_assistant.create_websocket_mock()
+        self.async_run_with_timeout(self.ws_connection.connect(self.ws_url))
+        self.ws_connection.set_decoder(ChannelRoutingDecoder(router=json_fields_router("channel"),
+                                                             consumed_channels=["trades"]))
+        recorder = MagicMock()
+        self.ws_connection.set_recorder(recorder, source="test_exchange")
+        for channel in ["heartbeat", "trades"]:
+            self.mocking_assistant.add_websocket_aiohttp_message(
+                ws_connect_mock.return_value, message=json.dumps({"channel": channel})
+            )
+
+        response = self.async_run_with_timeout(self.ws_connection.receive())
+
+        self.assertEqual({"channel": "trades"}, response.data)
+        # The dropped frames are recorded all the same
+        self.assertEqual(2, recorder.record.call_count)
@@ -0,0 +1,63 @@
+import json
+import unittest
+
+import aiohttp
+
+from hummingbot.core.web_assistant.connections.ws_frame_decoders import (
+    ChannelRoutingDecoder,
+    WSFrameDecoder,
+    json_fields_router,
+)
+
+
+class WSFrameDecodersTest(unittest.TestCase):
+
+    @staticmethod
+    def _text_frame(data: str) -> aiohttp.WSMessage:
+        return aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, data, extra=None)
+
+    def test_default_decoder(self):
+        decoder = WSFrameDecoder()
+
+        self.assertEqual({"one": 1}, decoder.decode(self._text_frame('{"one": 1}')).data)
+        self.assertEqual("pong", decoder.decode(self._text_frame("pong")).data)
+        self.assertEqual(b"\x01", decoder.decode(aiohttp.WSMessage(aiohttp.WSMsgType.BINARY, b"\x01", extra=None)).data)
+
+    def test_json_fields_router(self):
+        binance_router = json_fields_router("e", "s")
+        kucoin_router = json_fields_router("topic")
+
+        self.assertEqual(("depthUpdate", "BTCUSDT"),
+                         binance_router('{"e":"depthUpdate","E":1,"s":"BTCUSDT","U":1,"u":2,"b":[],"a":[]}'))
+        self.assertEqual(("trade", "ETHUSDT"), binance_router(json.dumps({"e": "trade", "E": 1, "s": "ETHUSDT"})))
+        self.assertIsNone(binance_router('{"result":null,"id":1}'))
+        self.assertEqual("/market/level2:BTC-USDT",
+                         kucoin_router('{"type":"message","topic":"/market/level2:BTC-USDT","data":{}}'))
+        self.assertIsNone(kucoin_router('{"id":"1","type":"pong"}'))
+        self.assertEqual("12", json_fields_router("id")('{"id": 12 , "type":"pong"}'))
+
+    def test_channel_routing_decoder_only_decodes_consumed_channels(self):
+        decoder = ChannelRoutingDecoder(router=json_fields_router("e", "s"), consumed_channels=[("trade", "BTCUSDT")])
+
+        self.assertEqual({"e": "trade", "s": "BTCUSDT"},
+                         decoder.decode(self._text_frame('{"e":"trade","s":"BTCUSDT"}')).data)
+        self.assertIsNone(decoder.decode(self._text_frame('{"e":"trade","s":"ETHUSDT"}')))
+        self.assertEqual({"result": None, "id": 1}, decoder.decode(self._text_frame('{"result":null,"id":1}')).data)
+
+        decoder.add_consumed_channels([("trade", "ETHUSDT")])
+        decoder.remove_consumed_channels([("trade", "BTCUSDT")])
+
+        self.assertIsNotNone(decoder.decode(self._text_frame('{"e":"trade","s":"ETHUSDT"}')))
+        self.assertIsNone(decoder.decode(self._text_frame('{"e":"trade","s":"BTCUSDT"}')))
+        self.assertEqual({("trade", "ETHUSDT")}, decoder.consumed_channels)
+        self.assertEqual(3, decoder.decoded_frames)
+        self.assertEqual(2, decoder.dropped_frames)
+
+    def test_channel_routing_decoder_drops_unrouted_frames(self):
+        decoder = ChannelRoutingDecoder(router=json_fields_router("topic"),
+                                        consumed_channels=["/market/match:BTC-USDT"],
+                                        decode_unrouted_frames=False)
+
+        self.assertIsNone(decoder.decode(self._text_frame('{"id":"1","type":"pong"}')))
+        # Binary frames are not routed
+        self.assertEqual(b"\x01", decoder.decode(aiohttp.WSMessage(aiohttp.WSMsgType.BINARY, b"\x01", extra=None)).data)
@@ -200,3 +200,101 @@ class WSAssistantTest(unittest.TestCase):
 
         with self.assertRaises(StopAsyncIteration):
             self.async_run_with_timeout(iter_messages_iterator.__anext__())
+
+    @patch(
+        "hummingbot.core.web_assistant.connections.ws_connection.WSConnection.connected",
+        new_callable=PropertyMock,
+    )
+    @patch("hummingbot.core.web_assistant.connections.ws_connection.WSConnection.receive_batch")
+    def test_iter_batches_post_processes(self, receive_batch_mock, connected_mock):
+        class SomePostProcessor(WSPostProcessorBase):
+            async def post_process(self, response_: WSResponse) -> WSResponse:
+                response_.data["two"] = 2
+                return response_
+
+        ws_assistant = WSAssistant(
+            connection=self.ws_connection, ws_post_processors=[SomePostProcessor()]
+        )
+        connected_mock.return_value = True
+        receive_batch_mock.side_effect = [[WSResponse({"one": 1}), WSResponse({"one": 2})], []]
+        iter_batches_iterator = ws_assistant.iter_batches()
+
+        responses = self.async_run_with_timeout(iter_batches_iterator.__anext__())
+
+        self.assertEqual([{"one": 1, "two": 2}, {"one": 2, "two": 2}], [response.data for response in responses])
+
+        connected_mock.return_value = False
+
+        with self.assertRaises(StopAsyncIteration):
+            self.async_run_with_timeout(iter_batches_iterator.__anext__())
+
+    @patch("hummingbot.core.web_assistant.ws_assistant.WSAssistant._sleep", new_callable=AsyncMock)
+    @patch("aiohttp.ClientSession.ws_connect", new_callable=AsyncMock)
+    def test_auto_reconnect_replays_subscriptions(self, ws_connect_mock, sleep_mock):
+        first_websocket = self.mocking_assistant.create_websocket_mock()
+        second_websocket = self.mocking_assistant.create_websocket_mock()
+        ws_connect_mock.side_effect = [first_websocket, second_websocket]
+        reconnections = []
+
+        async def on_reconnect(ws_assistant: WSAssistant):
+            reconnections.append((ws_assistant, ws_assistant.disconnection_time, ws_assistant.connected_since))
+
+        self.async_run_with_timeout(self.ws_assistant.connect(ws_url="test.url"))
+        first_connection_time = self.ws_assistant.connected_since
+        self.ws_assistant.enable_auto_reconnect()
+        self.ws_assistant.add_reconnect_listener(on_reconnect)
+        self.async_run_with_timeout(self.ws_assistant.subscribe(WSJSONRequest({"subscribe": "trades"})))
+        self.async_run_with_timeout(self.ws_assistant.send(WSJSONRequest({"ping": 1})))
+        self.mocking_assistant.add_websocket_aiohttp_message(
+            websocket_mock=first_websocket, message="", message_type=aiohttp.WSMsgType.CLOSED)
+        self.mocking_assistant.add_websocket_aiohttp_message(websocket_mock=second_websocket, message="pong")
+
+        response = self.async_run_with_timeout(self.ws_assistant.iter_messages().__anext__())
+
+        self.assertEqual("pong", response.data)
+        self.assertEqual(2, ws_connect_mock.call_count)
+        self.assertEqual(2, len(self.mocking_assistant.json_messages_sent_through_websocket(first_websocket)))
+        # Only the subscription is sent again through the new connection
+        self.assertEqual([{"subscribe": "trades"}],
+                         self.mocking_assistant.json_messages_sent_through_websocket(second_websocket))
+        (reconnected_assistant, disconnection_time, connected_since), = reconnections
+        self.assertIs(self.ws_assistant, reconnected_assistant)
+        self.assertLessEqual(first_connection_time, disconnection_time)
+        self.assertLessEqual(disconnection_time, connected_since)
+        # Only known until the first message is received after reconnecting
+        self.assertIsNone(self.ws_assistant.disconnection_time)
+        sleep_mock.assert_called_once()
+        self.assertLessEqual(sleep_mock.call_args[0][0], WSAssistant.RECONNECT_BASE_DELAY)
+        stats = self.ws_assistant.reconnect_stats
+        self.assertEqual(1, stats["reconnects"])
+        self.assertEqual(1, stats["time_to_first_message"]["count"])
+
+    @patch("hummingbot.core.web_assistant.ws_assistant.WSAssistant._sleep", new_callable=AsyncMock)
+    @patch("aiohttp.ClientSession.ws_connect", new_callable=AsyncMock)
+    def test_auto_reconnect_backs_off_until_max_attempts(self, ws_connect_mock, sleep_mock):
+        first_websocket = self.mocking_assistant.create_websocket_mock()
+        ws_connect_mock.side_effect = [first_websocket, ConnectionError("Refused"), ConnectionError("Refused again")]
+        self.async_run_with_timeout(self.ws_assistant.connect(ws_url="test.url"))
+        self.ws_assistant.enable_auto_reconnect(max_attempts=2)
+        self.mocking_assistant.add_websocket_aiohttp_message(
+            websocket_mock=first_websocket, message="", message_type=aiohttp.WSMsgType.CLOSED)
+
+        with self.assertRaises(ConnectionError):
+            self.async_run_with_timeout(self.ws_assistant.receive())
+
+        self.assertEqual(2, sleep_mock.call_count)
+        self.assertLessEqual(sleep_mock.call_args_list[1][0][0], 2 * WSAssistant.RECONNECT_BASE_DELAY)
+        self.assertEqual(0, self.ws_assistant.reconnect_stats["reconnects"])
+
+    @patch("aiohttp.ClientSession.ws_connect", new_callable=AsyncMock)
+    def test_connection_lost_raised_without_auto_reconnect(self, ws_connect_mock):
+        ws_connect_mock.return_value = self.mocking_assistant.create_websocket_mock()
+        self.async_run_with_timeout(self.ws_assistant.connect(ws_url="test.url"))
+        self.mocking_assistant.add_websocket_aiohttp_message(
+            websocket_mock=ws_connect_mock.return_value, message="", message_type=aiohttp.WSMsgType.CLOSED)
+
+        with self.assertRaises(ConnectionError):
+            self.async_run_with_timeout(self.ws_assistant.receive())
+
+        self.assertIsNone(self.ws_assistant.connected_since)
+        self.assertEqual(1, ws_connect_mock.call_count)
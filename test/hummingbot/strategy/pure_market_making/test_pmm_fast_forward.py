@@ -0,0 +1,115 @@
+import logging
+import unittest
+from decimal import Decimal
+from typing import List, Tuple
+
+from hummingbot.client.config.client_config_map import ClientConfigMap
+from hummingbot.client.config.config_helpers import ClientConfigAdapter
+from hummingbot.connector.exchange.paper_trade.paper_trade_exchange import PaperTradeExchange
+from hummingbot.core.clock import Clock, ClockMode
+from hummingbot.core.data_type.common import TradeType
+from hummingbot.core.data_type.market_data_replayer import MarketDataReplayer
+from hummingbot.core.data_type.order_book_message import OrderBookMessage, OrderBookMessageType
+from hummingbot.core.data_type.replay_order_book_tracker import ReplayOrderBookTracker
+from hummingbot.core.data_type.replay_order_book_tracker_data_source import ReplayOrderBookTrackerDataSource
+from hummingbot.core.event.event_logger import EventLogger
+from hummingbot.core.event.events import MarketEvent
+from hummingbot.strategy.market_trading_pair_tuple import MarketTradingPairTuple
+from hummingbot.strategy.pure_market_making.pure_market_making import PureMarketMakingStrategy
+
+logging.basicConfig(level=logging.ERROR)
+
+
+class TargetMarket:
+
+    @staticmethod
+    def split_trading_pair(trading_pair: str):
+        return tuple(trading_pair.split("-"))
+
+    @staticmethod
+    def convert_from_exchange_trading_pair(trading_pair: str) -> str:
+        return trading_pair
+
+    @staticmethod
+    def convert_to_exchange_trading_pair(trading_pair: str) -> str:
+        return trading_pair
+
+
+class PMMFastForwardUnitTest(unittest.TestCase):
+    start_timestamp: float = 1000.
+    end_timestamp: float = 1600.
+    trading_pair = "HBOT-ETH"
+
+    def _messages(self) -> List[OrderBookMessage]:
+        messages = [OrderBookMessage(OrderBookMessageType.SNAPSHOT,
+                                     {"trading_pair": self.trading_pair,
+                                      "update_id": 1,
+                                      "bids": [["99.5", "10"]],
+                                      "asks": [["100.5", "10"]]},
+                                     timestamp=1000.35)]
+        update_id = 1
+        for index, timestamp in enumerate(range(1007, 1600, 23)):
+            update_id += 1
+            bid = 99.5 + (index % 5) * 0.2
+            messages.append(OrderBookMessage(OrderBookMessageType.SNAPSHOT,
+                                             {"trading_pair": self.trading_pair,
+                                              "update_id": update_id,
+                                              "bids": [[str(bid), "10"]],
+                                              "asks": [[str(bid + 1), "10"]]},
+                                             timestamp=timestamp + 0.05))
+            if index % 3 == 0:
+                messages.append(OrderBookMessage(OrderBookMessageType.TRADE,
+                                                 {"trading_pair": self.trading_pair,
+                                                  "trade_id": update_id,
+                                                  "price": str(bid - 1) if index % 2 == 0 else str(bid + 2),
+                                                  "amount": "0.5",
+                                                  "trade_type": float(TradeType.SELL.value if index % 2 == 0
+                                                                      else TradeType.BUY.value)},
+                                                 timestamp=timestamp + 0.15))
+        return messages
+
+    def _run_backtest(self, fast_forward: bool) -> Tuple[Clock, List[tuple], List[float], Tuple[Decimal, Decimal]]:
+        data_source = ReplayOrderBookTrackerDataSource(trading_pairs=[self.trading_pair], messages=self._messages())
+        tracker = ReplayOrderBookTracker(data_source=data_source, trading_pairs=[self.trading_pair])
+        market = PaperTradeExchange(client_config_map=ClientConfigAdapter(ClientConfigMap()),
+                                    order_book_tracker=tracker,
+                                    target_market=TargetMarket,
+                                    exchange_name="binance")
+        market.set_balance("HBOT", 50)
+        market.set_balance("ETH", 5000)
+        fill_logger = EventLogger()
+        cancel_logger = EventLogger()
+        market.add_listener(MarketEvent.OrderFilled, fill_logger)
+        market.add_listener(MarketEvent.OrderCancelled, cancel_logger)
+        strategy = PureMarketMakingStrategy()
+        strategy.init_params(MarketTradingPairTuple(market, self.trading_pair, "HBOT", "ETH"),
+                             bid_spread=Decimal("0.005"),
+                             ask_spread=Decimal("0.005"),
+                             order_amount=Decimal("1"),
+                             order_refresh_time=30,
+                             max_order_age=50,
+                             filled_order_delay=20)
+        clock = Clock(ClockMode.BACKTEST, 0.1, self.start_timestamp, self.end_timestamp, fast_forward=fast_forward)
+        clock.add_iterator(MarketDataReplayer([tracker], stop_at_end_of_data=False))
+        clock.add_iterator(market)
+        clock.add_iterator(strategy)
+
+        clock.backtest()
+
+        fills = [(fill.timestamp, fill.trade_type, fill.price, fill.amount) for fill in fill_logger.event_log]
+        cancels = [cancel.timestamp for cancel in cancel_logger.event_log]
+        return clock, fills, cancels, (market.get_balance("HBOT"), market.get_balance("ETH"))
+
+    def test_fast_forward_matches_fixed_step(self):
+        fixed_clock, fixed_fills, fixed_cancels, fixed_balances = self._run_backtest(fast_forward=False)
+        clock, fills, cancels, balances = self._run_backtest(fast_forward=True)
+
+        self.assertGreater(len(fixed_fills), 0)
+        self.assertGreater(len(fixed_cancels), 0)
+        self.assertEqual(fixed_fills, fills)
+        self.assertEqual(fixed_cancels, cancels)
+        self.assertEqual(fixed_balances, balances)
+        self.assertEqual(fixed_clock.current_timestamp, clock.current_timestamp)
+        self.assertEqual(0, fixed_clock.skipped_ticks)
+        # Most of the 6000 ticks have nothing to do
+        self.assertGreater(clock.skipped_ticks, 5000)
@@ -0,0 +1,110 @@
+import json
+import tempfile
+import unittest
+from decimal import Decimal
+from typing import List
+
+from hummingbot.core.data_type.common import TradeType
+from hummingbot.core.data_type.order_book_message import OrderBookMessage, OrderBookMessageType
+from hummingbot.core.utils.market_data_recorder import MarketDataRecord, MarketDataRecorder
+from hummingbot.strategy.backtest_sweep import BacktestSweepRunner, SweepMarketData, pure_market_making_strategy
+
+TRADING_PAIR = "COINALPHA-HBOT"
+
+
+def parse_frame(record: MarketDataRecord) -> List[OrderBookMessage]:
+    frame = json.loads(record.text)
+    if frame["type"] == "snapshot":
+        return [OrderBookMessage(OrderBookMessageType.SNAPSHOT,
+                                 {"trading_pair": frame["pair"],
+                                  "update_id": frame["id"],
+                                  "bids": frame["bids"],
+                                  "asks": frame["asks"]},
+                                 timestamp=record.timestamp)]
+    return [OrderBookMessage(OrderBookMessageType.TRADE,
+                             {"trading_pair": frame["pair"],
+                              "trade_id": frame["id"],
+                              "price": frame["price"],
+                              "amount": frame["amount"],
+                              "trade_type": float(TradeType.SELL.value)},
+                             timestamp=record.timestamp)]
+
+
+class BacktestSweepRunnerTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.temp_directory = tempfile.TemporaryDirectory()
+        recorder = MarketDataRecorder(self.temp_directory.name)
+        recorder.start()
+        frames = [
+            (1000.2, {"type": "snapshot", "pair": TRADING_PAIR, "id": 1,
+                      "bids": [["99.5", "10"]], "asks": [["100.5", "10"]]}),
+            (1002.5, {"type": "snapshot", "pair": "OTHER-HBOT", "id": 1, "bids": [["1", "1"]], "asks": []}),
+            (1010.5, {"type": "trade", "pair": TRADING_PAIR, "id": 1, "price": "98.5", "amount": "1"}),
+            (1025.5, {"type": "snapshot", "pair": TRADING_PAIR, "id": 2,
+                      "bids": [["99.5", "10"]], "asks": [["100.5", "10"]]}),
+        ]
+        for timestamp, frame in frames:
+            recorder.record("test", json.dumps(frame), timestamp=timestamp)
+        recorder.stop()
+        self.market_data = SweepMarketData(directory=self.temp_directory.name,
+                                           trading_pair=TRADING_PAIR,
+                                           parser=parse_frame)
+
+    def tearDown(self) -> None:
+        self.temp_directory.cleanup()
+        super().tearDown()
+
+    def test_parameter_sets_cover_the_grid(self):
+        runner = BacktestSweepRunner(market_data=self.market_data,
+                                     strategy_factory=pure_market_making_strategy,
+                                     config_template={"order_levels_mode": {"order_levels": 1}},
+                                     parameter_grid={"a": [1, 2], "order_levels_mode.order_levels": [1, 2, 3]},
+                                     initial_balances={})
+
+        self.assertEqual(6, len(runner.parameter_sets))
+        self.assertEqual({"a": 2, "order_levels_mode.order_levels": 1}, runner.parameter_sets[3])
+        config = runner._strategy_config(runner.parameter_sets[5])
+        self.assertEqual(3, config["order_levels_mode"]["order_levels"])
+        self.assertEqual(2, config["a"])
+
+    def test_sweep_runs_backtests_in_worker_processes(self):
+        runner = BacktestSweepRunner(market_data=self.market_data,
+                                     strategy_factory=pure_market_making_strategy,
+                                     config_template={"bid_spread": Decimal("0.01"),
+                                                      "ask_spread": Decimal("0.05"),
+                                                      "order_amount": Decimal("1")},
+                                     parameter_grid={"bid_spread": [Decimal("0.01"), Decimal("0.05")]},
+                                     initial_balances={"COINALPHA": Decimal("10"), "HBOT": Decimal("1000")},
+                                     inventory_sample_interval=10.0,
+                                     max_workers=2)
+
+        results = runner.run()
+
+        self.assertEqual([Decimal("0.01"), Decimal("0.05")], results["bid_spread"].tolist())
+        self.assertEqual([None, None], results["error"].tolist())
+        # Only the tighter bid is filled by the trade at 98.5
+        self.assertEqual([1, 0], results["fills"].tolist())
+        self.assertEqual([1, 0], results["buy_fills"].tolist())
+        # The trading fee is paid in the base asset
+        self.assertEqual([10.999, 10.], results["final_base_balance"].tolist())
+        self.assertGreater(results["pnl"][0], 0)
+        self.assertEqual(0., results["pnl"][1])
+        self.assertEqual([10., 10.999, 10.999], results["inventory_path"][0].tolist())
+        self.assertEqual([1010., 1020., 1026.], results["inventory_path"][0].index.tolist())
+        self.assertEqual([3, 3], results["replayed_events"].tolist())
+
+    def test_failed_backtest_is_reported_in_its_row(self):
+        runner = BacktestSweepRunner(market_data=self.market_data,
+                                     strategy_factory=pure_market_making_strategy,
+                                     config_template={"ask_spread": Decimal("0.05"), "order_amount": Decimal("1")},
+                                     parameter_grid={"bid_spread": [Decimal("0.01")], "unknown_parameter": [1]},
+                                     initial_balances={"COINALPHA": Decimal("10"), "HBOT": Decimal("1000")},
+                                     max_workers=1)
+
+        results = runner.run()
+
+        self.assertEqual(1, len(results))
+        self.assertIn("unknown_parameter", results["error"][0])
+        self.assertIsNone(results["pnl"][0])